@@ -0,0 +1,62 @@
+"""Benchmark the eBay search path against the local mock server.
+
+Compares sequential searches, the concurrent executor, and the cached client.
+
+    python benchmarks/bench_ebay_search.py [--queries 200] [--latency 0.05]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from services.ebay_api import EbayApiClient
+from services.ebay_cache import CachedEbayApiClient, ResponseCache
+from services.ebay_search import ConcurrentSearchExecutor
+from services.rate_limiter import TokenBucket
+from tests.mock_ebay_server import MockEbayServer
+
+
+def _timed(label, fn, queries):
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  {queries / elapsed:8.1f} queries/s  ({count} items)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=100.0)
+    args = parser.parse_args()
+
+    queries = [f"player {i}" for i in range(args.queries)]
+    with MockEbayServer(total_items=50, latency=args.latency) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        _timed("sequential", lambda: sum(len(client.search_items(q, limit=50)) for q in queries),
+               len(queries))
+
+        limited = EbayApiClient("id", "secret", environment=server.url,
+                                rate_limiter=TokenBucket(args.rate, capacity=args.workers))
+        executor = ConcurrentSearchExecutor(limited, max_workers=args.workers)
+        _timed(f"concurrent ({args.workers} workers)",
+               lambda: sum(len(r["items"]) for r in executor.search_many(queries, limit=50)),
+               len(queries))
+
+        cached = CachedEbayApiClient("id", "secret", environment=server.url,
+                                     cache=ResponseCache(":memory:"))
+        cached_executor = ConcurrentSearchExecutor(cached, max_workers=args.workers)
+        for label in ("cached (cold)", "cached (warm)"):
+            _timed(label,
+                   lambda: sum(len(r["items"]) for r in cached_executor.search_many(queries, limit=50)),
+                   len(queries))
+        print(f"cache stats: {cached.cache_stats()}")
+        print(f"server stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the export formats on a throwaway comps table.
+
+Every available format (see services.export_formats) exports the same rows
+through the same chunked cursor pipeline; the table shows wall time, rows per
+second, and file size relative to plain CSV.
+
+    python benchmarks/bench_export_formats.py [--rows 200000] [--chunk-size 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.connection import ConnectionManager
+from database.schema import initialize_database
+from services.csv_export import export_comps
+from services.export_formats import available_formats
+
+
+def _seed(conn, rows: int):
+    rng = random.Random(7)
+    players = [f"Player {i}" for i in range(400)]
+    conn.executemany(
+        """
+        INSERT INTO comps (search_query, title, sold_price, shipping_price, sold_date,
+                           condition, item_url, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'ebay_api')
+        """,
+        [
+            (
+                f"{player} prizm".lower(),
+                f"2023 Panini Prizm {player} #{rng.randint(1, 300)} Silver",
+                round(rng.lognormvariate(3, 1), 2),
+                rng.choice((0.0, 1.05, 4.99)),
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                rng.choice(("Ungraded", "PSA 10", "PSA 9", "BGS 9.5")),
+                f"https://www.ebay.com/itm/{rng.randint(10 ** 11, 10 ** 12)}",
+            )
+            for player in (rng.choice(players) for _ in range(rows))
+        ],
+    )
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "bench.db"))
+        initialize_database(db.writer)
+        _seed(db.writer, args.rows)
+
+        print(f"{'format':<10} {'seconds':>8} {'rows/s':>10} {'size (MB)':>10} {'vs csv':>7}")
+        csv_size = None
+        for fmt in available_formats():
+            path = os.path.join(tmp, f"comps.{fmt}")
+            with db.read() as conn:
+                start = time.perf_counter()
+                export_comps(conn, path, chunk_size=args.chunk_size, fmt=fmt)
+                elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            csv_size = csv_size or size
+            print(f"{fmt:<10} {elapsed:8.2f} {args.rows / elapsed:10,.0f} "
+                  f"{size / 1024 ** 2:10.1f} {size / csv_size:6.0%}")
+            os.remove(path)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark loading cards as dict(row) versus slotted models.
+
+    python benchmarks/bench_row_models.py [--cards 50000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.repository import CardRepository
+from database.schema import initialize_database
+from services.roi_tracker import ROITracker
+
+
+def _measure(label, fn, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} {elapsed:7.3f}s  {current / count:7.0f} bytes/row  ({len(rows)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    initialize_database(conn)
+    CardRepository(conn).add_many([
+        {"description": f"2003 Topps Chrome #{i}", "player_name": f"Player {i % 500}", "year": 2003}
+        for i in range(args.cards)
+    ])
+
+    _measure("cards as dict(row)",
+             lambda: [dict(r) for r in conn.execute("SELECT * FROM cards ORDER BY created_at DESC")],
+             args.cards)
+    _measure("cards as Card models", CardRepository(conn).get_all, args.cards)
+    _measure("inventory as dict(row)",
+             lambda: [dict(r) for r in conn.execute(
+                 """
+                 SELECT c.card_id, c.description, c.sport, c.is_graded, c.grading_company,
+                        c.grade, c.status, p.purchase_price, p.total_cost_basis, p.purchase_date,
+                        p.source, s.sale_price, s.net_proceeds, s.sale_date, s.total_fees
+                 FROM cards c
+                 LEFT JOIN purchases p ON c.card_id = p.card_id
+                 LEFT JOIN sales s ON c.card_id = s.card_id
+                 ORDER BY c.created_at DESC
+                 """)],
+             args.cards)
+    _measure("inventory as InventoryRow", ROITracker(conn).get_inventory_with_details, args.cards)
+
+
+if __name__ == "__main__":
+    main()
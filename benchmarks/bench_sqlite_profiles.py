@@ -0,0 +1,86 @@
+"""Benchmark the SQLite storage profiles on a throwaway database file.
+
+For each profile: many small committed writes (GUI-style), one bulk import, and a
+portfolio-style aggregate query, plus the -wal file size before and after a
+TRUNCATE checkpoint.
+
+    python benchmarks/bench_sqlite_profiles.py [--cards 20000] [--small-writes 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.connection import ConnectionManager
+from database.profiles import PROFILES, checkpoint
+from database.repository import CardRepository, PurchaseRepository
+from database.schema import initialize_database
+
+
+def _wal_size(path: str) -> int:
+    wal = path + "-wal"
+    return os.path.getsize(wal) if os.path.exists(wal) else 0
+
+
+def _run(profile: str, cards: int, small_writes: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db = ConnectionManager(path, profile=profile, read_profile=profile)
+        conn = db.writer
+        initialize_database(conn)
+        card_repo = CardRepository(conn)
+
+        start = time.perf_counter()
+        for i in range(small_writes):
+            card_repo.add({"description": f"Single {i}"})
+        small = time.perf_counter() - start
+
+        rows = [{"description": f"Bulk {i}", "player_name": f"Player {i % 500}"} for i in range(cards)]
+        start = time.perf_counter()
+        with db.write() as writer:
+            card_ids = CardRepository(writer).add_many(rows)
+            PurchaseRepository(writer).add_many([
+                {"card_id": card_id, "purchase_date": "2026-01-01", "purchase_price": 10.0 + i % 90}
+                for i, card_id in enumerate(card_ids)
+            ])
+        bulk = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with db.read() as reader:
+            reader.execute(
+                """
+                SELECT c.player_name, COUNT(*), SUM(p.total_cost_basis)
+                FROM cards c JOIN purchases p ON p.card_id = c.card_id
+                GROUP BY c.player_name ORDER BY 3 DESC
+                """
+            ).fetchall()
+        query = time.perf_counter() - start
+
+        wal_before = _wal_size(path)
+        checkpoint(conn, "TRUNCATE")
+        wal_after = _wal_size(path)
+        db.close()
+        return {"small": small, "bulk": bulk, "query": query,
+                "wal_before": wal_before, "wal_after": wal_after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--small-writes", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'small writes':>13} {'bulk import':>12} {'aggregate':>10} "
+          f"{'wal (MB)':>9} {'after trunc':>12}")
+    for profile in PROFILES:
+        r = _run(profile, args.cards, args.small_writes)
+        print(f"{profile:<12} {r['small']:12.2f}s {r['bulk']:11.2f}s {r['query']:9.3f}s "
+              f"{r['wal_before'] / 1024 ** 2:9.1f} {r['wal_after'] / 1024 ** 2:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,38 @@ DEFAULT_PER_ORDER_FEE_HIGH = 0.40     # Orders > $10
 DEFAULT_PER_ORDER_THRESHOLD = 10.00   # Threshold between low/high per-order fee
 DEFAULT_INTL_FEE_RATE = 0.0165        # 1.65% international fee
 
+# eBay API Call Pacing
+DEFAULT_EBAY_RATE_LIMIT_PER_SEC = 5.0  # Sustained Browse API calls per second
+DEFAULT_EBAY_RATE_LIMIT_BURST = 10     # Calls allowed back-to-back before pacing kicks in
+DEFAULT_EBAY_DAILY_CALL_LIMIT = 5000   # Browse API default application quota
+DEFAULT_EBAY_SEARCH_WORKERS = 8        # Concurrent searches in flight
+
+# Background Market Data Refresh
+DEFAULT_REFRESH_WORKERS = 2            # Worker threads fetching comps/listings
+DEFAULT_REFRESH_MAX_AGE_HOURS = 24     # Market data older than this is re-queued
+DEFAULT_REFRESH_MAX_ATTEMPTS = 3       # Failed jobs retry with backoff up to this many times
+
+# eBay Response Cache (seconds) - keyed by Browse API path prefix
+DEFAULT_EBAY_CACHE_TTLS = {
+    "/item_summary/search": 600,       # Active listings move quickly
+    "/item/": 3600,                    # Item details rarely change
+}
+DEFAULT_EBAY_CACHE_TTL = 600           # Any other endpoint
+DEFAULT_EBAY_CACHE_STALE_SECONDS = 86400  # Serve stale while revalidating up to a day
+DEFAULT_ITEM_DETAIL_TTL = 7 * 86400    # Parsed item specifics kept for a week
+
+# SQLite Connections
+DEFAULT_DB_READ_POOL_SIZE = 4          # Read-only connections for analytics and exports
+DEFAULT_DB_BUSY_TIMEOUT = 30.0         # Seconds to wait on another connection's write lock
+DEFAULT_DB_PROFILE = "desktop"         # Storage profile for the writer and worker connections
+DEFAULT_DB_READ_PROFILE = "analytics"  # Storage profile for pooled read-only connections
+DEFAULT_WAL_CHECKPOINT_INTERVAL = 60   # Seconds between PASSIVE checkpoints while idle
+DEFAULT_PAGE_SIZE = 500                # Rows per keyset page for tables and streaming reads
+
+# Exports
+DEFAULT_EXPORT_CHUNK_SIZE = 5000       # Rows per fetchmany() and progress report
+DEFAULT_EXPORT_BUFFER_BYTES = 1 << 20  # Write buffer for export files
+
 # Tax Defaults
 DEFAULT_SALES_TAX_RATE = 0.0625       # Illinois state rate 6.25%
 
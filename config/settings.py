@@ -1,6 +1,11 @@
 """Runtime settings manager backed by SQLite settings table."""
 
 from config.defaults import (
+    DEFAULT_DB_PROFILE,
+    DEFAULT_EBAY_DAILY_CALL_LIMIT,
+    DEFAULT_EBAY_RATE_LIMIT_BURST,
+    DEFAULT_EBAY_RATE_LIMIT_PER_SEC,
+    DEFAULT_EBAY_SEARCH_WORKERS,
     DEFAULT_FVF_RATE,
     DEFAULT_SALES_TAX_RATE,
     DEFAULT_INTL_FEE_RATE,
@@ -8,6 +13,7 @@ from config.defaults import (
     DEFAULT_PER_ORDER_FEE_LOW,
     DEFAULT_PER_ORDER_THRESHOLD,
 )
+from database.unit_of_work import commit
 
 _DEFAULTS = {
     "fvf_rate": str(DEFAULT_FVF_RATE),
@@ -19,6 +25,12 @@ _DEFAULTS = {
     "ebay_client_id": "",
     "ebay_client_secret": "",
     "ebay_environment": "PRODUCTION",
+    "ebay_rate_limit_per_sec": str(DEFAULT_EBAY_RATE_LIMIT_PER_SEC),
+    "ebay_rate_limit_burst": str(DEFAULT_EBAY_RATE_LIMIT_BURST),
+    "ebay_daily_call_limit": str(DEFAULT_EBAY_DAILY_CALL_LIMIT),
+    "ebay_search_workers": str(DEFAULT_EBAY_SEARCH_WORKERS),
+    "db_profile": DEFAULT_DB_PROFILE,
+    "lot_method": "FIFO",
 }
 
 
@@ -41,11 +53,15 @@ class SettingsManager:
         return float(self.get(key, "0"))
 
     def set(self, key: str, value: str):
-        self._conn.execute(
+        self.set_many({key: value})
+
+    def set_many(self, values: dict):
+        """Write several settings in a single transaction."""
+        self._conn.executemany(
             "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-            (key, str(value)),
+            [(key, str(value)) for key, value in values.items()],
         )
-        self._conn.commit()
+        commit(self._conn)
 
     def seed_defaults(self):
         for key, value in _DEFAULTS.items():
@@ -56,4 +72,4 @@ class SettingsManager:
                 self._conn.execute(
                     "INSERT INTO settings (key, value) VALUES (?, ?)", (key, value)
                 )
-        self._conn.commit()
+        commit(self._conn)
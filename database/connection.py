@@ -1,27 +1,234 @@
-"""SQLite connection manager."""
+"""SQLite connection manager.
+
+One ConnectionManager per database file hands out three kinds of connection:
+
+- the writer, owned by the thread that opened it (the Tk main loop in the app);
+  other threads that need it go through write(), which serializes on a lock;
+- a per-thread read-write connection for background workers (thread_connection);
+- a small pool of read-only connections (read) for analytics and exports.
+
+The database runs in WAL mode, so pooled readers see the last committed state
+and never block, or get blocked by, the writer. Connections are tuned with the
+storage profiles in database.profiles, and the manager checkpoints the WAL on
+request and truncates it on close.
+"""
 
 import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config.defaults import (
+    DEFAULT_DB_BUSY_TIMEOUT,
+    DEFAULT_DB_PROFILE,
+    DEFAULT_DB_READ_POOL_SIZE,
+    DEFAULT_DB_READ_PROFILE,
+)
+from database.profiles import apply_profile, checkpoint, use_profile
+from database.unit_of_work import unit_of_work
 
 _DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 _DB_PATH = os.path.join(_DB_DIR, "sports_cards.db")
 
-_connection: sqlite3.Connection | None = None
+_manager: "ConnectionManager | None" = None
+
+
+def get_db_path() -> str:
+    return _DB_PATH
+
+
+def connect(path: str, read_only: bool = False, check_same_thread: bool = True,
+            timeout: float = DEFAULT_DB_BUSY_TIMEOUT,
+            profile: str | None = None) -> sqlite3.Connection:
+    """Open a connection with the app's standard row factory and pragmas."""
+    if read_only:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=timeout,
+                               check_same_thread=check_same_thread)
+        conn.execute("PRAGMA query_only=ON")
+    else:
+        conn = sqlite3.connect(path, timeout=timeout, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys=ON")
+    if profile:
+        apply_profile(conn, profile)
+    return conn
+
+
+class ConnectionManager:
+    def __init__(self, path: str, read_pool_size: int = DEFAULT_DB_READ_POOL_SIZE,
+                 timeout: float = DEFAULT_DB_BUSY_TIMEOUT, profile: str = DEFAULT_DB_PROFILE,
+                 read_profile: str = DEFAULT_DB_READ_PROFILE):
+        self.path = path
+        self.read_pool_size = read_pool_size
+        self.timeout = timeout
+        self.profile = profile
+        self.read_profile = read_profile
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._local = threading.local()
+        self._thread_conns: list[sqlite3.Connection] = []
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_count = 0
+        self._pid = os.getpid()
+
+    def _check_process(self):
+        # Connections must not cross a fork; a child process starts with fresh ones
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._writer = None
+            self._local = threading.local()
+            self._thread_conns = []
+            self._readers = queue.LifoQueue()
+            self._reader_count = 0
+
+    # ── Writer ──────────────────────────────────────────────────────
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        self._check_process()
+        with self._lock:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._writer = connect(self.path, check_same_thread=False, timeout=self.timeout,
+                                       profile=self.profile)
+            return self._writer
+
+    @contextmanager
+    def write(self, profile: str | None = None):
+        """Run a block on the writer as one transaction, excluding other threads.
+
+        Pass profile="bulk-import" for large writes; the writer's profile is
+        restored afterwards and the WAL is checkpointed.
+        """
+        with self._write_lock:
+            writer = self.writer
+            if profile is None:
+                with unit_of_work(writer) as conn:
+                    yield conn
+                return
+            with use_profile(writer, profile):
+                with unit_of_work(writer) as conn:
+                    yield conn
+            if not writer.in_transaction:
+                checkpoint(writer, "PASSIVE")
+
+    def set_profile(self, profile: str):
+        """Change the profile used by the writer and by new worker connections."""
+        self.profile = profile
+        with self._write_lock:
+            if self._writer is not None:
+                apply_profile(self._writer, profile)
+
+    def checkpoint(self, mode: str = "PASSIVE") -> dict | None:
+        """Checkpoint the WAL from the writer. Skipped while a write is open."""
+        with self._write_lock:
+            if self._writer is None or self._writer.in_transaction:
+                return None
+            return checkpoint(self._writer, mode)
+
+    # ── Worker threads ──────────────────────────────────────────────
+
+    def thread_connection(self) -> sqlite3.Connection:
+        """Return this thread's own read-write connection, opening it on first use."""
+        self._check_process()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path, check_same_thread=False, timeout=self.timeout,
+                           profile=self.profile)
+            self._local.conn = conn
+            with self._lock:
+                self._thread_conns.append(conn)
+        return conn
+
+    def release_thread_connection(self):
+        """Close this thread's connection, e.g. before a worker thread exits."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._thread_conns:
+                self._thread_conns.remove(conn)
+        conn.close()
+
+    # ── Read pool ───────────────────────────────────────────────────
+
+    @contextmanager
+    def read(self, timeout: float | None = None):
+        """Borrow a read-only connection. Blocks if the whole pool is checked out."""
+        self._check_process()
+        readers = self._readers
+        try:
+            conn = readers.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._reader_count < self.read_pool_size
+                if can_open:
+                    self._reader_count += 1
+            if can_open:
+                try:
+                    conn = connect(self.path, read_only=True, check_same_thread=False,
+                                   timeout=self.timeout, profile=self.read_profile)
+                except Exception:
+                    with self._lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                conn = readers.get(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            readers.put(conn)
+
+    # ── Shutdown ────────────────────────────────────────────────────
+
+    def close(self):
+        """Close every connection, truncating the WAL once the readers are gone."""
+        with self._lock:
+            conns = self._thread_conns
+            self._thread_conns = []
+            writer, self._writer = self._writer, None
+            while True:
+                try:
+                    conns.append(self._readers.get_nowait())
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+        self._local = threading.local()
+        for conn in conns:
+            conn.close()
+        if writer is not None:
+            if writer.in_transaction:
+                writer.rollback()
+            try:
+                checkpoint(writer, "TRUNCATE")
+            except sqlite3.Error:
+                pass  # Another process still has the database open
+            writer.close()
+
+
+def get_manager() -> ConnectionManager:
+    global _manager
+    if _manager is None:
+        _manager = ConnectionManager(_DB_PATH)
+    return _manager
 
 
 def get_connection() -> sqlite3.Connection:
-    global _connection
-    if _connection is None:
-        os.makedirs(_DB_DIR, exist_ok=True)
-        _connection = sqlite3.connect(_DB_PATH)
-        _connection.row_factory = sqlite3.Row
-        _connection.execute("PRAGMA journal_mode=WAL")
-        _connection.execute("PRAGMA foreign_keys=ON")
-    return _connection
+    """The application's writer connection."""
+    return get_manager().writer
 
 
 def close_connection():
-    global _connection
-    if _connection is not None:
-        _connection.close()
-        _connection = None
+    global _manager
+    if _manager is not None:
+        _manager.close()
+        _manager = None
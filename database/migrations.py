@@ -0,0 +1,153 @@
+"""Versioned schema migrations keyed on PRAGMA user_version.
+
+Each migration is (version, description, steps). A step is either a SQL string or
+a callable taking the connection, for data migrations. Migrations run in order,
+each inside its own transaction together with the user_version bump, so a failed
+step leaves the database at the previous version.
+"""
+
+import sqlite3
+
+from database.pnl_rollups import ROLLUP_DDL, ROLLUP_TABLE_DDL, rebuild as rebuild_pnl_rollups
+from database.portfolio_ledger import LEDGER_DDL, rebuild as rebuild_portfolio_ledger
+from database.sequences import seed_card_sequence
+from database.tax_lots import (
+    LOT_DDL, add_match_snapshot_columns, add_sale_lot_column, rebuild as rebuild_lot_matches,
+    rematch_backdated,
+)
+
+MIGRATIONS = [
+    (1, "Hot-path indexes for ROI joins, exports and job queue", [
+        "CREATE INDEX IF NOT EXISTS idx_purchases_card_id ON purchases(card_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sales_card_id ON sales(card_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales(sale_date)",
+        "CREATE INDEX IF NOT EXISTS idx_comps_query_fetched ON comps(search_query, fetched_at)",
+        "CREATE INDEX IF NOT EXISTS idx_comps_card_id ON comps(card_id)",
+        "CREATE INDEX IF NOT EXISTS idx_cards_status_created ON cards(status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_priority ON jobs(status, priority)",
+        "CREATE INDEX IF NOT EXISTS idx_listing_events_watch ON listing_events(watch_id, event)",
+    ]),
+    (2, "Sequence table for atomic card_id allocation", [
+        """
+        CREATE TABLE IF NOT EXISTS id_sequences (
+            name TEXT PRIMARY KEY,
+            last_value INTEGER NOT NULL
+        )
+        """,
+        seed_card_sequence,
+    ]),
+    (3, "Keyset pagination indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_cards_created ON cards(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_purchases_date ON purchases(purchase_date)",
+        "CREATE INDEX IF NOT EXISTS idx_comps_fetched ON comps(fetched_at)",
+    ]),
+    (4, "Trigger-maintained portfolio totals and card status counts", [
+        *LEDGER_DDL,
+        rebuild_portfolio_ledger,
+    ]),
+    (5, "Per-card position and P&L views", [
+        # Scalar subqueries seek idx_purchases_card_id / idx_sales_card_id per card, so
+        # a keyset page over the view costs only its own rows and never fans out
+        """
+        CREATE VIEW IF NOT EXISTS card_positions AS
+        SELECT
+            c.id, c.card_id, c.description, c.player_name, c.sport, c.is_graded,
+            c.grading_company, c.grade, c.status, c.created_at,
+            (SELECT SUM(purchase_price) FROM purchases WHERE card_id = c.card_id) AS purchase_price,
+            (SELECT SUM(total_cost_basis) FROM purchases WHERE card_id = c.card_id) AS total_cost_basis,
+            (SELECT MIN(purchase_date) FROM purchases WHERE card_id = c.card_id) AS purchase_date,
+            (SELECT source FROM purchases WHERE card_id = c.card_id
+             ORDER BY purchase_date LIMIT 1) AS source,
+            (SELECT SUM(sale_price) FROM sales WHERE card_id = c.card_id) AS sale_price,
+            (SELECT SUM(net_proceeds) FROM sales WHERE card_id = c.card_id) AS net_proceeds,
+            (SELECT MAX(sale_date) FROM sales WHERE card_id = c.card_id) AS sale_date,
+            (SELECT SUM(total_fees) FROM sales WHERE card_id = c.card_id) AS total_fees
+        FROM cards c
+        """,
+        """
+        CREATE VIEW IF NOT EXISTS card_pnl AS
+        SELECT *,
+            CASE WHEN net_proceeds IS NOT NULL AND total_cost_basis > 0
+                 THEN ROUND(net_proceeds - total_cost_basis, 2) END AS profit,
+            CASE WHEN net_proceeds IS NOT NULL AND total_cost_basis > 0
+                 THEN ROUND((net_proceeds - total_cost_basis) / total_cost_basis * 100, 2) END AS roi_pct
+        FROM card_positions
+        """,
+    ]),
+    # The rollup triggers and backfill moved to version 8, once lot_matches exists
+    (6, "Realized P&L rollups table by day, week and month", [
+        ROLLUP_TABLE_DDL,
+    ]),
+    (7, "Tax lots: specific-ID column on sales and trigger-matched lot_matches", [
+        add_sale_lot_column,
+        *LOT_DDL,
+        rebuild_lot_matches,
+        # Realized profit per card now comes from its matched lots, not all purchases
+        "DROP VIEW IF EXISTS card_pnl",
+        """
+        CREATE VIEW card_pnl AS
+        SELECT *,
+            CASE WHEN net_proceeds IS NOT NULL AND total_cost_basis > 0
+                 THEN ROUND((SELECT SUM(gain) FROM lot_matches lm
+                             WHERE lm.card_id = card_positions.card_id), 2) END AS profit,
+            CASE WHEN net_proceeds IS NOT NULL AND total_cost_basis > 0
+                 THEN ROUND((SELECT SUM(gain) / SUM(cost_basis) * 100 FROM lot_matches lm
+                             WHERE lm.card_id = card_positions.card_id), 2) END AS roi_pct
+        FROM card_positions
+        """,
+    ]),
+    (8, "P&L rollups maintained from lot_matches with the matched lot's cost basis", [
+        "DROP TRIGGER IF EXISTS trg_sales_rollup_insert",
+        "DROP TRIGGER IF EXISTS trg_sales_rollup_delete",
+        "DROP TRIGGER IF EXISTS trg_sales_rollup_update",
+        # Matches now copy the sale's platform, price and fees
+        "DROP TRIGGER IF EXISTS trg_sales_lot_insert",
+        "DROP TRIGGER IF EXISTS trg_sales_lot_update",
+        add_match_snapshot_columns,
+        *LOT_DDL,
+        *ROLLUP_DDL,
+        rebuild_pnl_rollups,
+    ]),
+    (9, "Lot matching only considers lots acquired on or before the sale date", [
+        "DROP TRIGGER IF EXISTS trg_sales_lot_insert",
+        "DROP TRIGGER IF EXISTS trg_sales_lot_update",
+        *LOT_DDL,
+        rematch_backdated,
+    ]),
+]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations=MIGRATIONS) -> list[int]:
+    """Apply pending migrations. Returns the versions applied."""
+    if conn.in_transaction:
+        conn.commit()
+
+    applied = []
+    current = get_version(conn)
+    for version, _description, steps in sorted(migrations, key=lambda m: m[0]):
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+        current = version
+
+    if applied:
+        # Refresh planner statistics so the new indexes are picked up immediately
+        conn.execute("ANALYZE")
+        conn.commit()
+    return applied
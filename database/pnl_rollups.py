@@ -0,0 +1,236 @@
+"""Trigger-maintained realized P&L rollups by day, week and month.
+
+Every sale matched to a tax lot (see database.tax_lots) adds its revenue, fees,
+net proceeds, cost basis and profit to one pnl_rollups row per granularity,
+keyed by period, platform and sport, so a multi-year profit chart reads a few
+hundred rows instead of every sale. Weeks start on Monday and are labelled by
+that date; months are labelled YYYY-MM.
+
+The triggers sit on lot_matches, so the cost basis is the matched lot's, the
+same figure card_pnl and the P&L cube report, and a re-match moves it with the
+sale. A sale without a matched lot is not counted until it gets one.
+
+    python -m database.pnl_rollups [--db PATH] [--backfill]
+"""
+
+import argparse
+import sqlite3
+import sys
+
+GRANULARITIES = ("day", "week", "month")
+DIMENSIONS = ("platform", "sport")
+
+# Amounts are summed incrementally as REAL, so allow sub-cent float drift
+_TOLERANCE = 0.005
+
+_AMOUNTS = ("revenue", "fees", "net_proceeds", "cost_basis", "profit")
+
+_GRANULARITY_ROWS = "(VALUES ('day'), ('week'), ('month'))"
+
+
+def _period(granularity: str, date_expr: str) -> str:
+    # Unparseable dates fall back to the raw text rather than a NULL key
+    return f"""
+        COALESCE(CASE {granularity}
+            WHEN 'day' THEN date({date_expr})
+            WHEN 'week' THEN date({date_expr}, 'weekday 0', '-6 days')
+            ELSE strftime('%Y-%m', {date_expr})
+        END, {date_expr})
+    """
+
+
+def _apply_match(row: str, sign: str) -> str:
+    """Upsert statement adding (sign '+') or removing (sign '-') one lot match from every granularity."""
+    return f"""
+        INSERT INTO pnl_rollups
+            (granularity, period, platform, sport, sales_count,
+             revenue, fees, net_proceeds, cost_basis, profit)
+        SELECT g.column1, {_period("g.column1", f"{row}.disposed_date")},
+               COALESCE({row}.platform, ''),
+               COALESCE((SELECT sport FROM cards WHERE card_id = {row}.card_id), ''),
+               {sign}1,
+               {sign}{row}.sale_price,
+               {sign}{row}.fees,
+               {sign}{row}.proceeds,
+               {sign}{row}.cost_basis,
+               {sign}({row}.proceeds - {row}.cost_basis)
+        FROM {_GRANULARITY_ROWS} g
+        WHERE true
+        ON CONFLICT(granularity, period, platform, sport) DO UPDATE SET
+            sales_count = sales_count + excluded.sales_count,
+            revenue = revenue + excluded.revenue,
+            fees = fees + excluded.fees,
+            net_proceeds = net_proceeds + excluded.net_proceeds,
+            cost_basis = cost_basis + excluded.cost_basis,
+            profit = profit + excluded.profit;
+    """
+
+
+ROLLUP_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS pnl_rollups (
+        granularity  TEXT NOT NULL,
+        period       TEXT NOT NULL,
+        platform     TEXT NOT NULL,
+        sport        TEXT NOT NULL,
+        sales_count  INTEGER NOT NULL DEFAULT 0,
+        revenue      REAL NOT NULL DEFAULT 0,
+        fees         REAL NOT NULL DEFAULT 0,
+        net_proceeds REAL NOT NULL DEFAULT 0,
+        cost_basis   REAL NOT NULL DEFAULT 0,
+        profit       REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (granularity, period, platform, sport)
+    ) WITHOUT ROWID
+"""
+
+# The lot_matches row carries the sale's fields, so a delete cascading from a
+# removed sale can still be subtracted after the sales row is gone
+ROLLUP_DDL = [
+    ROLLUP_TABLE_DDL,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lot_matches_rollup_insert AFTER INSERT ON lot_matches BEGIN
+        {_apply_match("NEW", "+")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lot_matches_rollup_delete AFTER DELETE ON lot_matches BEGIN
+        {_apply_match("OLD", "-")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_lot_matches_rollup_update AFTER UPDATE ON lot_matches BEGIN
+        {_apply_match("OLD", "-")}
+        {_apply_match("NEW", "+")}
+    END
+    """,
+]
+
+_COMPUTE_SQL = f"""
+    SELECT g.column1 AS granularity, {_period("g.column1", "s.sale_date")} AS period,
+           COALESCE(s.platform, '') AS platform, COALESCE(c.sport, '') AS sport,
+           COUNT(*) AS sales_count,
+           SUM(s.sale_price) AS revenue,
+           SUM(COALESCE(s.total_fees, 0)) AS fees,
+           SUM(COALESCE(s.net_proceeds, 0)) AS net_proceeds,
+           SUM(lm.cost_basis) AS cost_basis,
+           SUM(COALESCE(s.net_proceeds, 0) - lm.cost_basis) AS profit
+    FROM sales s
+    JOIN lot_matches lm ON lm.sale_id = s.id
+    CROSS JOIN {_GRANULARITY_ROWS} g
+    LEFT JOIN cards c ON c.card_id = s.card_id
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def compute(conn: sqlite3.Connection) -> dict[tuple, tuple]:
+    """Recompute every rollup from sales and their lot matches, keyed (granularity, period, platform, sport)."""
+    return {tuple(row[:4]): tuple(row[4:]) for row in conn.execute(_COMPUTE_SQL)}
+
+
+def read(conn: sqlite3.Connection) -> dict[tuple, tuple]:
+    """The maintained rollups in the same shape as compute(), without emptied rows."""
+    rows = conn.execute(
+        f"""
+        SELECT granularity, period, platform, sport, sales_count, {", ".join(_AMOUNTS)}
+        FROM pnl_rollups WHERE sales_count != 0
+        """
+    )
+    return {tuple(row[:4]): tuple(row[4:]) for row in rows}
+
+
+def rebuild(conn: sqlite3.Connection):
+    """Backfill the rollups from the base tables. Run inside the caller's transaction."""
+    conn.execute("DELETE FROM pnl_rollups")
+    conn.execute(
+        f"""
+        INSERT INTO pnl_rollups
+            (granularity, period, platform, sport, sales_count, {", ".join(_AMOUNTS)})
+        {_COMPUTE_SQL}
+        """
+    )
+
+
+def verify(conn: sqlite3.Connection) -> list[str]:
+    """Compare the rollups with a full recompute. Returns a description of each mismatch."""
+    expected, actual = compute(conn), read(conn)
+    problems = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want = expected.get(key, (0,) + (0.0,) * len(_AMOUNTS))
+        have = actual.get(key, (0,) + (0.0,) * len(_AMOUNTS))
+        label = "/".join(key)
+        if want[0] != have[0]:
+            problems.append(f"{label} sales_count: rollup {have[0]}, recomputed {want[0]}")
+        for name, w, h in zip(_AMOUNTS, want[1:], have[1:]):
+            if abs(w - h) > _TOLERANCE:
+                problems.append(f"{label} {name}: rollup {h:.2f}, recomputed {w:.2f}")
+    return problems
+
+
+def series(conn: sqlite3.Connection, granularity: str = "month", start: str | None = None,
+           end: str | None = None, by: str | None = None) -> list[dict]:
+    """Realized P&L per period with a running profit total, oldest first.
+
+    start and end are inclusive period labels in the granularity's format (for
+    example '2025-01' for months). With by='platform' or by='sport' each value
+    gets its own rows and running total.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity {granularity!r}; expected one of {GRANULARITIES}")
+    if by is not None and by not in DIMENSIONS:
+        raise ValueError(f"Cannot split rollups by {by!r}; expected one of {DIMENSIONS}")
+
+    where, params = ["granularity = ?"], [granularity]
+    if start is not None:
+        where.append("period >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("period <= ?")
+        params.append(end)
+    group = f"period, {by}" if by else "period"
+    window = f"PARTITION BY {by} ORDER BY period" if by else "ORDER BY period"
+    sums = ", ".join(f"ROUND(SUM({name}), 2) AS {name}" for name in _AMOUNTS)
+    cursor = conn.execute(
+        f"""
+        SELECT {group}, SUM(sales_count) AS sales_count, {sums},
+               ROUND(SUM(SUM(profit)) OVER ({window}), 2) AS cumulative_profit
+        FROM pnl_rollups
+        WHERE {" AND ".join(where)}
+        GROUP BY {group}
+        HAVING SUM(sales_count) != 0
+        ORDER BY {group}
+        """,
+        params,
+    )
+    return [dict(zip((d[0] for d in cursor.description), row)) for row in cursor]
+
+
+def main(argv=None) -> int:
+    from database.connection import connect, get_db_path
+    from database.unit_of_work import unit_of_work
+
+    parser = argparse.ArgumentParser(description="Check the P&L rollups against a full recompute.")
+    parser.add_argument("--db", default=get_db_path())
+    parser.add_argument("--backfill", action="store_true",
+                        help="rebuild the rollups from every matched sale")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.backfill:
+            with unit_of_work(conn):
+                rebuild(conn)
+            matched = conn.execute("SELECT COUNT(*) FROM lot_matches").fetchone()[0]
+            print(f"Rollups backfilled from {matched} matched sales.")
+            return 0
+        problems = verify(conn)
+        if not problems:
+            print("P&L rollups are consistent.")
+            return 0
+        for problem in problems:
+            print(f"MISMATCH {problem}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Trigger-maintained portfolio totals and per-status card counts.
+
+Triggers on purchases, sales and cards keep a single portfolio_totals row and
+one card_status_counts row per status current, so the ROI summary is a one-row
+read however long the history gets. verify() recomputes everything from the
+base tables and reports any drift; rebuild() resets the ledger from them.
+
+    python -m database.portfolio_ledger [--db PATH] [--rebuild]
+"""
+
+import argparse
+import sqlite3
+import sys
+
+# Amounts are summed incrementally as REAL, so allow sub-cent float drift
+_TOLERANCE = 0.005
+
+LEDGER_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS portfolio_totals (
+        id              INTEGER PRIMARY KEY CHECK (id = 1),
+        total_invested  REAL NOT NULL DEFAULT 0,
+        cards_purchased INTEGER NOT NULL DEFAULT 0,
+        total_revenue   REAL NOT NULL DEFAULT 0,
+        cards_sold      INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS card_status_counts (
+        status     TEXT PRIMARY KEY NOT NULL,
+        card_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_purchases_ledger_insert AFTER INSERT ON purchases BEGIN
+        UPDATE portfolio_totals SET
+            total_invested = total_invested + NEW.total_cost_basis,
+            cards_purchased = cards_purchased + 1
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_purchases_ledger_delete AFTER DELETE ON purchases BEGIN
+        UPDATE portfolio_totals SET
+            total_invested = total_invested - OLD.total_cost_basis,
+            cards_purchased = cards_purchased - 1
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_purchases_ledger_update AFTER UPDATE ON purchases BEGIN
+        UPDATE portfolio_totals SET
+            total_invested = total_invested - OLD.total_cost_basis + NEW.total_cost_basis
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sales_ledger_insert AFTER INSERT ON sales BEGIN
+        UPDATE portfolio_totals SET
+            total_revenue = total_revenue + COALESCE(NEW.net_proceeds, 0),
+            cards_sold = cards_sold + 1
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sales_ledger_delete AFTER DELETE ON sales BEGIN
+        UPDATE portfolio_totals SET
+            total_revenue = total_revenue - COALESCE(OLD.net_proceeds, 0),
+            cards_sold = cards_sold - 1
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sales_ledger_update AFTER UPDATE OF net_proceeds ON sales BEGIN
+        UPDATE portfolio_totals SET
+            total_revenue = total_revenue - COALESCE(OLD.net_proceeds, 0)
+                                          + COALESCE(NEW.net_proceeds, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cards_status_insert AFTER INSERT ON cards BEGIN
+        INSERT INTO card_status_counts (status, card_count) VALUES (COALESCE(NEW.status, ''), 1)
+        ON CONFLICT(status) DO UPDATE SET card_count = card_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cards_status_delete AFTER DELETE ON cards BEGIN
+        UPDATE card_status_counts SET card_count = card_count - 1
+        WHERE status = COALESCE(OLD.status, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cards_status_update AFTER UPDATE OF status ON cards
+    WHEN OLD.status IS NOT NEW.status BEGIN
+        UPDATE card_status_counts SET card_count = card_count - 1
+        WHERE status = COALESCE(OLD.status, '');
+        INSERT INTO card_status_counts (status, card_count) VALUES (COALESCE(NEW.status, ''), 1)
+        ON CONFLICT(status) DO UPDATE SET card_count = card_count + 1;
+    END
+    """,
+]
+
+
+def compute(conn: sqlite3.Connection) -> dict:
+    """Recompute the ledger from the base tables with full scans."""
+    invested, purchased = conn.execute(
+        "SELECT COALESCE(SUM(total_cost_basis), 0), COUNT(*) FROM purchases"
+    ).fetchone()
+    revenue, sold = conn.execute(
+        "SELECT COALESCE(SUM(net_proceeds), 0), COUNT(*) FROM sales"
+    ).fetchone()
+    statuses = dict(conn.execute(
+        "SELECT COALESCE(status, ''), COUNT(*) FROM cards GROUP BY COALESCE(status, '')"
+    ).fetchall())
+    return {
+        "total_invested": invested,
+        "cards_purchased": purchased,
+        "total_revenue": revenue,
+        "cards_sold": sold,
+        "status_counts": statuses,
+    }
+
+
+def read(conn: sqlite3.Connection) -> dict:
+    """The maintained ledger: one row plus the per-status counts."""
+    row = conn.execute(
+        """
+        SELECT total_invested, cards_purchased, total_revenue, cards_sold
+        FROM portfolio_totals WHERE id = 1
+        """
+    ).fetchone()
+    invested, purchased, revenue, sold = row if row else (0.0, 0, 0.0, 0)
+    statuses = dict(conn.execute(
+        "SELECT status, card_count FROM card_status_counts WHERE card_count != 0"
+    ).fetchall())
+    return {
+        "total_invested": invested,
+        "cards_purchased": purchased,
+        "total_revenue": revenue,
+        "cards_sold": sold,
+        "status_counts": statuses,
+    }
+
+
+def rebuild(conn: sqlite3.Connection):
+    """Reset the ledger from the base tables. Run inside the caller's transaction."""
+    totals = compute(conn)
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO portfolio_totals
+            (id, total_invested, cards_purchased, total_revenue, cards_sold)
+        VALUES (1, ?, ?, ?, ?)
+        """,
+        (totals["total_invested"], totals["cards_purchased"],
+         totals["total_revenue"], totals["cards_sold"]),
+    )
+    conn.execute("DELETE FROM card_status_counts")
+    conn.executemany(
+        "INSERT INTO card_status_counts (status, card_count) VALUES (?, ?)",
+        totals["status_counts"].items(),
+    )
+
+
+def verify(conn: sqlite3.Connection) -> list[str]:
+    """Compare the ledger with a full recompute. Returns a description of each mismatch."""
+    expected, actual = compute(conn), read(conn)
+    problems = []
+    for key in ("total_invested", "total_revenue"):
+        if abs(expected[key] - actual[key]) > _TOLERANCE:
+            problems.append(f"{key}: ledger {actual[key]:.2f}, recomputed {expected[key]:.2f}")
+    for key in ("cards_purchased", "cards_sold"):
+        if expected[key] != actual[key]:
+            problems.append(f"{key}: ledger {actual[key]}, recomputed {expected[key]}")
+    for status in sorted(expected["status_counts"].keys() | actual["status_counts"].keys()):
+        want = expected["status_counts"].get(status, 0)
+        have = actual["status_counts"].get(status, 0)
+        if want != have:
+            problems.append(f"status {status!r}: ledger {have}, recomputed {want}")
+    return problems
+
+
+def main(argv=None) -> int:
+    from database.connection import connect, get_db_path
+    from database.unit_of_work import unit_of_work
+
+    parser = argparse.ArgumentParser(description="Check the portfolio ledger against a full recompute.")
+    parser.add_argument("--db", default=get_db_path())
+    parser.add_argument("--rebuild", action="store_true", help="reset the ledger if it has drifted")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        problems = verify(conn)
+        if not problems:
+            print("Portfolio ledger is consistent.")
+            return 0
+        for problem in problems:
+            print(f"MISMATCH {problem}")
+        if args.rebuild:
+            with unit_of_work(conn):
+                rebuild(conn)
+            print("Ledger rebuilt from base tables.")
+            return 0
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,84 @@
 """CRUD operations for all database tables."""
 
 import sqlite3
+from collections.abc import Iterator
+
+from config.defaults import DEFAULT_PAGE_SIZE
+from database.rows import iter_keyset, keyset_page, model_columns, select_models
+from database.sequences import allocate_card_ids
+from database.unit_of_work import commit, unit_of_work
+from models.card import Card
+from models.comp import SoldComp
+from models.transaction import Purchase, Sale
+
+
+def _card_params(card_id: str, card: dict) -> tuple:
+    return (
+        card_id,
+        card["description"],
+        card.get("year"),
+        card.get("set_name"),
+        card.get("player_name"),
+        card.get("card_number"),
+        card.get("parallel"),
+        card.get("sport", "Basketball"),
+        int(card.get("is_graded", False)),
+        card.get("grading_company"),
+        card.get("grade"),
+        card.get("status", "Inventory"),
+        card.get("notes"),
+    )
+
+
+def _purchase_params(purchase: dict) -> tuple:
+    return (
+        purchase["card_id"],
+        purchase["purchase_date"],
+        purchase["purchase_price"],
+        purchase.get("sales_tax_paid", 0.0),
+        purchase.get("shipping_paid", 0.0),
+        purchase.get("grading_cost", 0.0),
+        purchase.get("grading_company"),
+        purchase.get("grading_tier"),
+        purchase.get("source"),
+        purchase.get("notes"),
+    )
+
+
+def _sale_params(sale: dict) -> tuple:
+    return (
+        sale["card_id"],
+        sale["sale_date"],
+        sale["sale_price"],
+        sale.get("shipping_charged", 0.0),
+        sale.get("shipping_cost", 0.0),
+        sale.get("shipping_method"),
+        sale.get("ebay_fvf_rate", 0.1325),
+        sale.get("ebay_fvf_amount"),
+        sale.get("ebay_per_order_fee", 0.30),
+        sale.get("ebay_intl_fee_rate", 0.0),
+        sale.get("ebay_intl_fee_amount", 0.0),
+        sale.get("total_fees"),
+        sale.get("net_proceeds"),
+        sale.get("platform", "eBay"),
+        sale.get("buyer_state"),
+        sale.get("notes"),
+        sale.get("lot_id"),
+    )
+
+
+def _comp_params(comp: dict) -> tuple:
+    return (
+        comp["search_query"],
+        comp.get("card_id"),
+        comp["title"],
+        comp["sold_price"],
+        comp.get("shipping_price", 0.0),
+        comp.get("sold_date"),
+        comp.get("condition"),
+        comp.get("item_url"),
+        comp.get("source", "manual"),
+    )
 
 
 class GradingRepository:
@@ -59,61 +137,53 @@ class CardRepository:
         self._conn = conn
 
     def add(self, card: dict) -> str:
-        # Auto-generate card_id
-        cursor = self._conn.execute("SELECT MAX(id) FROM cards")
-        max_id = cursor.fetchone()[0] or 0
-        card_id = f"CARD-{max_id + 1:06d}"
-
-        self._conn.execute(
-            """
-            INSERT INTO cards (card_id, description, year, set_name, player_name,
-                card_number, parallel, sport, is_graded, grading_company, grade, status, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                card_id,
-                card["description"],
-                card.get("year"),
-                card.get("set_name"),
-                card.get("player_name"),
-                card.get("card_number"),
-                card.get("parallel"),
-                card.get("sport", "Basketball"),
-                int(card.get("is_graded", False)),
-                card.get("grading_company"),
-                card.get("grade"),
-                card.get("status", "Inventory"),
-                card.get("notes"),
-            ),
-        )
-        self._conn.commit()
-        return card_id
-
-    def get_all(self, status: str | None = None) -> list[dict]:
-        if status:
-            cursor = self._conn.execute(
-                "SELECT * FROM cards WHERE status = ? ORDER BY created_at DESC",
-                (status,),
-            )
-        else:
-            cursor = self._conn.execute(
-                "SELECT * FROM cards ORDER BY created_at DESC"
+        return self.add_many([card])[0]
+
+    def add_many(self, cards: list[dict]) -> list[str]:
+        """Insert cards with one executemany. Returns the allocated card_ids in order."""
+        with unit_of_work(self._conn):
+            card_ids = allocate_card_ids(self._conn, len(cards))
+            self._conn.executemany(
+                """
+                INSERT INTO cards (card_id, description, year, set_name, player_name,
+                    card_number, parallel, sport, is_graded, grading_company, grade, status, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [_card_params(card_id, card) for card_id, card in zip(card_ids, cards)],
             )
-        return [dict(row) for row in cursor.fetchall()]
+        return card_ids
+
+    def get_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                 status: str | None = None) -> tuple[list[Card], tuple | None]:
+        """Newest cards first, one keyset page at a time. Returns (cards, next cursor)."""
+        return keyset_page(
+            self._conn, Card, f"SELECT {model_columns(Card)} FROM cards",
+            ("created_at", "id"), after, limit,
+            where="status = ?" if status else "", params=(status,) if status else (),
+        )
 
-    def get_by_id(self, card_id: str) -> dict | None:
-        cursor = self._conn.execute(
-            "SELECT * FROM cards WHERE card_id = ?", (card_id,)
+    def iter_all(self, status: str | None = None,
+                 page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Card]:
+        """Stream cards newest first without building the whole list."""
+        return iter_keyset(
+            lambda after, limit: self.get_page(after, limit, status), page_size
         )
-        row = cursor.fetchone()
-        return dict(row) if row else None
+
+    def get_all(self, status: str | None = None) -> list[Card]:
+        return list(self.iter_all(status))
+
+    def get_by_id(self, card_id: str) -> Card | None:
+        return select_models(
+            self._conn, Card, f"SELECT {model_columns(Card)} FROM cards WHERE card_id = ?",
+            (card_id,),
+        ).fetchone()
 
     def update_status(self, card_id: str, status: str):
         self._conn.execute(
             "UPDATE cards SET status = ?, updated_at = datetime('now') WHERE card_id = ?",
             (status, card_id),
         )
-        self._conn.commit()
+        commit(self._conn)
 
 
 class PurchaseRepository:
@@ -121,40 +191,52 @@ class PurchaseRepository:
         self._conn = conn
 
     def add(self, purchase: dict):
-        self._conn.execute(
+        self.add_many([purchase])
+
+    def add_many(self, purchases: list[dict]):
+        self._conn.executemany(
             """
             INSERT INTO purchases (card_id, purchase_date, purchase_price, sales_tax_paid,
                 shipping_paid, grading_cost, grading_company, grading_tier, source, notes)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                purchase["card_id"],
-                purchase["purchase_date"],
-                purchase["purchase_price"],
-                purchase.get("sales_tax_paid", 0.0),
-                purchase.get("shipping_paid", 0.0),
-                purchase.get("grading_cost", 0.0),
-                purchase.get("grading_company"),
-                purchase.get("grading_tier"),
-                purchase.get("source"),
-                purchase.get("notes"),
-            ),
+            [_purchase_params(p) for p in purchases],
         )
-        self._conn.commit()
+        commit(self._conn)
 
-    def get_all(self) -> list[dict]:
-        cursor = self._conn.execute(
-            "SELECT * FROM purchases ORDER BY purchase_date DESC"
+    def get_page(self, after: tuple | None = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Purchase], tuple | None]:
+        return keyset_page(
+            self._conn, Purchase, f"SELECT {model_columns(Purchase)} FROM purchases",
+            ("purchase_date", "id"), after, limit,
         )
-        return [dict(row) for row in cursor.fetchall()]
 
-    def get_by_card(self, card_id: str) -> dict | None:
-        cursor = self._conn.execute(
-            "SELECT * FROM purchases WHERE card_id = ? ORDER BY purchase_date DESC LIMIT 1",
+    def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Purchase]:
+        return iter_keyset(self.get_page, page_size)
+
+    def get_all(self) -> list[Purchase]:
+        return list(self.iter_all())
+
+    def get_by_card(self, card_id: str) -> Purchase | None:
+        return select_models(
+            self._conn, Purchase,
+            f"""
+            SELECT {model_columns(Purchase)} FROM purchases
+            WHERE card_id = ? ORDER BY purchase_date DESC LIMIT 1
+            """,
             (card_id,),
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        ).fetchone()
+
+    def get_all_by_card(self, card_id: str) -> list[Purchase]:
+        """Every purchase row of a card (lots and cost adjustments), oldest first."""
+        return list(select_models(
+            self._conn, Purchase,
+            f"""
+            SELECT {model_columns(Purchase)} FROM purchases
+            WHERE card_id = ? ORDER BY purchase_date, id
+            """,
+            (card_id,),
+        ))
 
 
 class SaleRepository:
@@ -162,46 +244,43 @@ class SaleRepository:
         self._conn = conn
 
     def add(self, sale: dict):
-        self._conn.execute(
+        self.add_many([sale])
+
+    def add_many(self, sales: list[dict]):
+        self._conn.executemany(
             """
             INSERT INTO sales (card_id, sale_date, sale_price, shipping_charged,
                 shipping_cost, shipping_method, ebay_fvf_rate, ebay_fvf_amount,
                 ebay_per_order_fee, ebay_intl_fee_rate, ebay_intl_fee_amount,
-                total_fees, net_proceeds, platform, buyer_state, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                total_fees, net_proceeds, platform, buyer_state, notes, lot_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                sale["card_id"],
-                sale["sale_date"],
-                sale["sale_price"],
-                sale.get("shipping_charged", 0.0),
-                sale.get("shipping_cost", 0.0),
-                sale.get("shipping_method"),
-                sale.get("ebay_fvf_rate", 0.1325),
-                sale.get("ebay_fvf_amount"),
-                sale.get("ebay_per_order_fee", 0.30),
-                sale.get("ebay_intl_fee_rate", 0.0),
-                sale.get("ebay_intl_fee_amount", 0.0),
-                sale.get("total_fees"),
-                sale.get("net_proceeds"),
-                sale.get("platform", "eBay"),
-                sale.get("buyer_state"),
-                sale.get("notes"),
-            ),
+            [_sale_params(sale) for sale in sales],
         )
-        self._conn.commit()
+        commit(self._conn)
 
-    def get_all(self) -> list[dict]:
-        cursor = self._conn.execute("SELECT * FROM sales ORDER BY sale_date DESC")
-        return [dict(row) for row in cursor.fetchall()]
+    def get_page(self, after: tuple | None = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Sale], tuple | None]:
+        return keyset_page(
+            self._conn, Sale, f"SELECT {model_columns(Sale)} FROM sales",
+            ("sale_date", "id"), after, limit,
+        )
 
-    def get_by_card(self, card_id: str) -> dict | None:
-        cursor = self._conn.execute(
-            "SELECT * FROM sales WHERE card_id = ? ORDER BY sale_date DESC LIMIT 1",
+    def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Sale]:
+        return iter_keyset(self.get_page, page_size)
+
+    def get_all(self) -> list[Sale]:
+        return list(self.iter_all())
+
+    def get_by_card(self, card_id: str) -> Sale | None:
+        return select_models(
+            self._conn, Sale,
+            f"""
+            SELECT {model_columns(Sale)} FROM sales
+            WHERE card_id = ? ORDER BY sale_date DESC LIMIT 1
+            """,
             (card_id,),
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        ).fetchone()
 
 
 class CompRepository:
@@ -209,38 +288,45 @@ class CompRepository:
         self._conn = conn
 
     def add(self, comp: dict):
-        self._conn.execute(
+        self.add_many([comp])
+
+    def add_many(self, comps: list[dict]):
+        self._conn.executemany(
             """
             INSERT INTO comps (search_query, card_id, title, sold_price, shipping_price,
                 sold_date, condition, item_url, source)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                comp["search_query"],
-                comp.get("card_id"),
-                comp["title"],
-                comp["sold_price"],
-                comp.get("shipping_price", 0.0),
-                comp.get("sold_date"),
-                comp.get("condition"),
-                comp.get("item_url"),
-                comp.get("source", "manual"),
-            ),
+            [_comp_params(comp) for comp in comps],
         )
-        self._conn.commit()
+        commit(self._conn)
 
-    def get_by_query(self, query: str, days: int = 90) -> list[dict]:
-        cursor = self._conn.execute(
-            """
-            SELECT * FROM comps
+    def iter_by_query(self, query: str, days: int = 90) -> Iterator[SoldComp]:
+        return select_models(
+            self._conn, SoldComp,
+            f"""
+            SELECT {model_columns(SoldComp)} FROM comps
             WHERE search_query LIKE ?
               AND fetched_at >= datetime('now', ?)
             ORDER BY sold_date DESC
             """,
             (f"%{query}%", f"-{days} days"),
         )
-        return [dict(row) for row in cursor.fetchall()]
 
-    def get_all(self) -> list[dict]:
-        cursor = self._conn.execute("SELECT * FROM comps ORDER BY fetched_at DESC")
-        return [dict(row) for row in cursor.fetchall()]
+    def get_by_query(self, query: str, days: int = 90) -> list[SoldComp]:
+        return list(self.iter_by_query(query, days))
+
+    def get_page(self, after: tuple | None = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[SoldComp], tuple | None]:
+        # fetched_at is nullable and NULLs never compare below a cursor, so page
+        # on the id alone; ids follow insertion, hence fetch, order
+        return keyset_page(
+            self._conn, SoldComp, f"SELECT {model_columns(SoldComp)} FROM comps",
+            ("id",), after, limit,
+        )
+
+    def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[SoldComp]:
+        return iter_keyset(self.get_page, page_size)
+
+    def get_all(self) -> list[SoldComp]:
+        return list(self.iter_all())
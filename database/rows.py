@@ -0,0 +1,68 @@
+"""Row factories that build slotted models straight from SQLite result tuples.
+
+Queries select exactly model_columns(Model), in field order, so each row maps
+positionally onto the model's constructor with no intermediate dict.
+"""
+
+import sqlite3
+from dataclasses import fields
+from functools import cache
+
+
+@cache
+def model_columns(model: type, alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + f.name for f in fields(model))
+
+
+@cache
+def model_factory(model: type):
+    def factory(cursor, row):
+        return model(*row)
+    return factory
+
+
+def select_models(conn: sqlite3.Connection, model: type, sql: str, params=()) -> sqlite3.Cursor:
+    """Execute a query whose columns are model_columns(model) and yield models lazily."""
+    cursor = conn.cursor()
+    cursor.row_factory = model_factory(model)
+    return cursor.execute(sql, params)
+
+
+def keyset_page(conn: sqlite3.Connection, model: type, sql: str, keys: tuple[str, ...],
+                after: tuple | None = None, limit: int = 500, where: str = "",
+                params=()) -> tuple[list, tuple | None]:
+    """Fetch one page in descending key order, seeking past `after` instead of using OFFSET.
+
+    `sql` is the SELECT ... FROM part; `keys` are the ordering columns, ending in a
+    unique one so the order is total. Each key's final name component must be a
+    model field. Returns (rows, cursor); pass the cursor back as `after` for the
+    next page. It is None once the last page has been read.
+    """
+    clauses = [f"({where})"] if where else []
+    args = list(params)
+    if after is not None:
+        clauses.append(f"({', '.join(keys)}) < ({', '.join('?' * len(keys))})")
+        args.extend(after)
+    query = sql
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY {', '.join(k + ' DESC' for k in keys)} LIMIT ?"
+    rows = select_models(conn, model, query, (*args, limit)).fetchall()
+    if len(rows) < limit:
+        return rows, None
+    last = rows[-1]
+    return rows, tuple(getattr(last, k.rsplit(".", 1)[-1]) for k in keys)
+
+
+def iter_keyset(fetch_page, page_size: int = 500):
+    """Stream every row by following a get_page-style method's cursors.
+
+    Each page is its own short query, so no read cursor stays open between pages.
+    """
+    after = None
+    while True:
+        rows, after = fetch_page(after=after, limit=page_size)
+        yield from rows
+        if after is None:
+            return
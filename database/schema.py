@@ -7,6 +7,7 @@ from config.defaults import (
     DEFAULT_GRADING_SERVICES,
     DEFAULT_SHIPPING_OPTIONS,
 )
+from database.migrations import migrate
 
 TABLES = [
     """
@@ -131,11 +132,104 @@ TABLES = [
         value   TEXT NOT NULL
     )
     """,
+    """
+    CREATE TABLE IF NOT EXISTS api_quota_ledger (
+        day     TEXT PRIMARY KEY,
+        calls   INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS item_details (
+        item_id         TEXT PRIMARY KEY,
+        title           TEXT,
+        grader          TEXT,
+        grade           TEXT,
+        serial_number   TEXT,
+        player_name     TEXT,
+        year            INTEGER,
+        set_name        TEXT,
+        card_number     TEXT,
+        parallel        TEXT,
+        shipping_cost   REAL,
+        aspects         TEXT,
+        fetched_at      REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS watch_queries (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_query    TEXT NOT NULL,
+        filters         TEXT NOT NULL DEFAULT '{}',
+        is_active       INTEGER DEFAULT 1,
+        last_polled_at  TEXT,
+        created_at      TEXT DEFAULT (datetime('now')),
+        UNIQUE(search_query, filters)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS listing_snapshots (
+        watch_id        INTEGER NOT NULL REFERENCES watch_queries(id),
+        item_id         TEXT NOT NULL,
+        price           REAL NOT NULL,
+        shipping_cost   REAL,
+        end_time        TEXT,
+        buying_options  TEXT,
+        title           TEXT,
+        condition       TEXT,
+        item_url        TEXT,
+        first_seen_at   TEXT NOT NULL,
+        PRIMARY KEY (watch_id, item_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS listing_events (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        watch_id        INTEGER NOT NULL REFERENCES watch_queries(id),
+        item_id         TEXT NOT NULL,
+        event           TEXT NOT NULL,
+        price           REAL,
+        previous_price  REAL,
+        confidence      REAL,
+        comp_id         INTEGER REFERENCES comps(id),
+        seen_at         TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind            TEXT NOT NULL,
+        card_id         TEXT NOT NULL REFERENCES cards(card_id),
+        priority        REAL NOT NULL DEFAULT 0,
+        status          TEXT NOT NULL DEFAULT 'queued',
+        attempts        INTEGER NOT NULL DEFAULT 0,
+        run_after       TEXT DEFAULT (datetime('now')),
+        last_error      TEXT,
+        created_at      TEXT DEFAULT (datetime('now')),
+        updated_at      TEXT DEFAULT (datetime('now')),
+        finished_at     TEXT,
+        UNIQUE(kind, card_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS market_values (
+        card_id         TEXT PRIMARY KEY REFERENCES cards(card_id),
+        search_query    TEXT,
+        comp_count      INTEGER,
+        comp_median     REAL,
+        comp_average    REAL,
+        volatility      REAL,
+        active_count    INTEGER,
+        active_low      REAL,
+        active_median   REAL,
+        market_value    REAL,
+        refreshed_at    TEXT
+    )
+    """,
 ]
 
 
 def initialize_database(conn: sqlite3.Connection):
-    """Create all tables and seed default data."""
+    """Create all tables, seed default data, and apply pending migrations."""
     cursor = conn.cursor()
 
     for table_sql in TABLES:
@@ -196,3 +290,5 @@ def initialize_database(conn: sqlite3.Connection):
         )
 
     conn.commit()
+
+    migrate(conn)
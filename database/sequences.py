@@ -0,0 +1,56 @@
+"""Named ID sequences for allocating human-readable keys such as CARD-000001.
+
+Each allocation is a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING upsert
+against id_sequences: it creates the sequence row on first use or advances it,
+and takes SQLite's write lock either way, so even the first allocation cannot
+hand the same number to two connections. Ranges are contiguous, which lets bulk
+inserts reserve every ID with one statement.
+"""
+
+import sqlite3
+
+from database.unit_of_work import commit
+
+CARD_SEQUENCE = "cards"
+
+
+def allocate(conn: sqlite3.Connection, name: str, count: int = 1) -> range:
+    """Reserve `count` consecutive values from a sequence and return them."""
+    if count < 1:
+        return range(0)
+    row = conn.execute(
+        """
+        INSERT INTO id_sequences (name, last_value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET last_value = last_value + excluded.last_value
+        RETURNING last_value
+        """,
+        (name, count),
+    ).fetchone()
+    commit(conn)
+    last = row[0]
+    return range(last - count + 1, last + 1)
+
+
+def format_card_id(value: int) -> str:
+    return f"CARD-{value:06d}"
+
+
+def allocate_card_ids(conn: sqlite3.Connection, count: int = 1) -> list[str]:
+    return [format_card_id(n) for n in allocate(conn, CARD_SEQUENCE, count)]
+
+
+def seed_card_sequence(conn: sqlite3.Connection):
+    """Start the card sequence after the highest existing row id or CARD-n suffix."""
+    conn.execute(
+        """
+        INSERT INTO id_sequences (name, last_value)
+        SELECT ?, MAX(
+            COALESCE((SELECT MAX(id) FROM cards), 0),
+            COALESCE((SELECT MAX(CAST(SUBSTR(card_id, 6) AS INTEGER)) FROM cards
+                      WHERE card_id LIKE 'CARD-%'), 0)
+        )
+        WHERE 1
+        ON CONFLICT(name) DO UPDATE SET last_value = MAX(last_value, excluded.last_value)
+        """,
+        (CARD_SEQUENCE,),
+    )
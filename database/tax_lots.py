@@ -0,0 +1,300 @@
+"""Tax-lot accounting: purchase lots matched to sales in a lot_matches table.
+
+Each card is a single unit, so every sale disposes of exactly one lot. A card's
+first purchase row always opens a lot, as does any later row with a purchase
+price (a re-buy). Later zero-price rows, such as a grading fee, are cost
+adjustments that attach to the lot held at that time. The purchase_lots view
+exposes each lot with its adjusted cost basis.
+
+A trigger matches every new sale to an open lot of the same card acquired on or
+before the sale date: the lot named in sales.lot_id (specific ID), otherwise the
+oldest (FIFO) or newest (LIFO) such lot per the lot_method setting. Cost, proceeds and dates are frozen into
+lot_matches, so a year-end realized-gains report is an indexed range read. Each
+match also keeps a copy of the sale's platform, price and fees, so the P&L
+rollups maintained from lot_matches can still remove a deleted sale.
+
+    python -m database.tax_lots [--db PATH] [--rebuild]
+"""
+
+import argparse
+import sqlite3
+import sys
+
+METHODS = ("FIFO", "LIFO")
+DEFAULT_METHOD = "FIFO"
+
+# Holding period beyond which a disposal counts as long-term
+LONG_TERM_DAYS = 365
+
+
+def _match_sale(row: str, by_id: bool = False) -> str:
+    """INSERT matching sale `row` to one open lot.
+
+    In a trigger row is NEW; with by_id the sale is read from the sales table,
+    aliased as row, for the id bound as the statement's parameter.
+    """
+    sales = f"sales {row}, " if by_id else ""
+    sale_filter = f"{row}.id = ? AND " if by_id else ""
+    return f"""
+        INSERT INTO lot_matches
+            (sale_id, lot_id, card_id, method, acquired_date, disposed_date, cost_basis, proceeds,
+             platform, sale_price, fees)
+        SELECT {row}.id, l.lot_id, {row}.card_id,
+               CASE WHEN {row}.lot_id IS NOT NULL THEN 'SPECIFIC' ELSE m.method END,
+               l.acquired_date, {row}.sale_date, l.cost_basis, COALESCE({row}.net_proceeds, 0),
+               {row}.platform, {row}.sale_price, COALESCE({row}.total_fees, 0)
+        FROM {sales}purchase_lots l,
+             (SELECT COALESCE((SELECT value FROM settings WHERE key = 'lot_method'),
+                              '{DEFAULT_METHOD}') AS method) m
+        WHERE {sale_filter}l.card_id = {row}.card_id
+          AND ({row}.lot_id IS NULL OR l.lot_id = {row}.lot_id)
+          AND l.acquired_date <= {row}.sale_date
+          AND NOT EXISTS (SELECT 1 FROM lot_matches lm WHERE lm.lot_id = l.lot_id)
+        ORDER BY
+            CASE WHEN m.method = 'LIFO' THEN l.acquired_date END DESC,
+            CASE WHEN m.method = 'LIFO' THEN l.lot_id END DESC,
+            l.acquired_date, l.lot_id
+        LIMIT 1;
+    """
+
+
+def add_sale_lot_column(conn: sqlite3.Connection):
+    """Add sales.lot_id, the specific lot a sale disposes of, unless it already exists."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sales)")}
+    if "lot_id" not in columns:
+        conn.execute("ALTER TABLE sales ADD COLUMN lot_id INTEGER REFERENCES purchases(id)")
+
+
+# Sale fields copied into each match; (column, definition, value from the sale row s)
+_SNAPSHOT_COLUMNS = (
+    ("platform", "TEXT", "s.platform"),
+    ("sale_price", "REAL NOT NULL DEFAULT 0", "s.sale_price"),
+    ("fees", "REAL NOT NULL DEFAULT 0", "COALESCE(s.total_fees, 0)"),
+)
+
+
+def add_match_snapshot_columns(conn: sqlite3.Connection):
+    """Add lot_matches' copies of the sale fields and fill them from sales."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(lot_matches)")}
+    for name, definition, _value in _SNAPSHOT_COLUMNS:
+        if name not in columns:
+            conn.execute(f"ALTER TABLE lot_matches ADD COLUMN {name} {definition}")
+    names = ", ".join(name for name, _definition, _value in _SNAPSHOT_COLUMNS)
+    values = ", ".join(value for _name, _definition, value in _SNAPSHOT_COLUMNS)
+    conn.execute(
+        f"""
+        UPDATE lot_matches SET ({names}) =
+            (SELECT {values} FROM sales s WHERE s.id = lot_matches.sale_id)
+        WHERE sale_id IN (SELECT id FROM sales)
+        """
+    )
+
+
+LOT_DDL = [
+    # A purchase row opens a lot if it has a price or is the card's first row
+    """
+    CREATE VIEW IF NOT EXISTS purchase_lot_rows AS
+    SELECT p.id, p.card_id, p.purchase_date, p.total_cost_basis,
+           (p.purchase_price > 0 OR NOT EXISTS (
+                SELECT 1 FROM purchases e
+                WHERE e.card_id = p.card_id
+                  AND (e.purchase_date, e.id) < (p.purchase_date, p.id))) AS is_lot
+    FROM purchases p
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS purchase_lots AS
+    SELECT l.id AS lot_id, l.card_id, l.purchase_date AS acquired_date,
+           l.total_cost_basis + COALESCE((
+               SELECT SUM(a.total_cost_basis) FROM purchase_lot_rows a
+               WHERE a.card_id = l.card_id AND NOT a.is_lot
+                 AND (SELECT x.id FROM purchase_lot_rows x
+                      WHERE x.card_id = a.card_id AND x.is_lot
+                        AND (x.purchase_date, x.id) <= (a.purchase_date, a.id)
+                      ORDER BY x.purchase_date DESC, x.id DESC LIMIT 1) = l.id
+           ), 0) AS cost_basis
+    FROM purchase_lot_rows l
+    WHERE l.is_lot
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS lot_matches (
+        sale_id       INTEGER PRIMARY KEY,
+        lot_id        INTEGER NOT NULL UNIQUE,
+        card_id       TEXT NOT NULL,
+        method        TEXT NOT NULL,
+        acquired_date TEXT NOT NULL,
+        disposed_date TEXT NOT NULL,
+        cost_basis    REAL NOT NULL,
+        proceeds      REAL NOT NULL,
+        platform      TEXT,
+        sale_price    REAL NOT NULL DEFAULT 0,
+        fees          REAL NOT NULL DEFAULT 0,
+        gain          REAL GENERATED ALWAYS AS (proceeds - cost_basis) STORED,
+        holding_days  INTEGER GENERATED ALWAYS AS (
+            CAST(julianday(disposed_date) - julianday(acquired_date) AS INTEGER)
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_lot_matches_disposed ON lot_matches(disposed_date)",
+    "CREATE INDEX IF NOT EXISTS idx_lot_matches_card ON lot_matches(card_id)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sales_lot_insert AFTER INSERT ON sales BEGIN
+        {_match_sale("NEW")}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sales_lot_delete AFTER DELETE ON sales BEGIN
+        DELETE FROM lot_matches WHERE sale_id = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sales_lot_update
+    AFTER UPDATE OF card_id, sale_date, net_proceeds, lot_id ON sales BEGIN
+        DELETE FROM lot_matches WHERE sale_id = OLD.id;
+        {_match_sale("NEW")}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sales_lot_snapshot
+    AFTER UPDATE OF sale_price, total_fees, platform ON sales BEGIN
+        UPDATE lot_matches
+        SET platform = NEW.platform, sale_price = NEW.sale_price, fees = COALESCE(NEW.total_fees, 0)
+        WHERE sale_id = NEW.id;
+    END
+    """,
+]
+
+
+def rebuild(conn: sqlite3.Connection):
+    """Re-match every sale in sale order. Run inside the caller's transaction."""
+    conn.execute("DELETE FROM lot_matches")
+    sale_ids = conn.execute("SELECT id FROM sales ORDER BY sale_date, id").fetchall()
+    conn.executemany(_match_sale("s", by_id=True), sale_ids)
+
+
+def rematch_backdated(conn: sqlite3.Connection):
+    """Re-match, in sale order, sales matched to a lot acquired after the sale."""
+    sale_ids = conn.execute(
+        "SELECT sale_id FROM lot_matches WHERE disposed_date < acquired_date "
+        "ORDER BY disposed_date, sale_id"
+    ).fetchall()
+    conn.executemany("DELETE FROM lot_matches WHERE sale_id = ?", sale_ids)
+    conn.executemany(_match_sale("s", by_id=True), sale_ids)
+
+
+def verify(conn: sqlite3.Connection) -> list[str]:
+    """Report sales without a lot, lots sold before they were bought, and drifted figures."""
+    problems = [
+        f"sale {sale_id} ({card_id}) has no matched lot"
+        for sale_id, card_id in conn.execute(
+            """
+            SELECT s.id, s.card_id FROM sales s
+            WHERE NOT EXISTS (SELECT 1 FROM lot_matches lm WHERE lm.sale_id = s.id)
+            """
+        )
+    ]
+    problems.extend(
+        f"sale {sale_id} on {disposed} matched lot {lot_id} acquired later, on {acquired}"
+        for sale_id, lot_id, acquired, disposed in conn.execute(
+            """
+            SELECT sale_id, lot_id, acquired_date, disposed_date FROM lot_matches
+            WHERE disposed_date < acquired_date OR holding_days < 0
+            ORDER BY sale_id
+            """
+        )
+    )
+    for sale_id, field, frozen, current in conn.execute(
+        """
+        SELECT lm.sale_id, 'cost_basis', lm.cost_basis, l.cost_basis
+        FROM lot_matches lm LEFT JOIN purchase_lots l ON l.lot_id = lm.lot_id
+        WHERE l.cost_basis IS NULL OR abs(lm.cost_basis - l.cost_basis) > 0.005
+        UNION ALL
+        SELECT lm.sale_id, 'proceeds', lm.proceeds, COALESCE(s.net_proceeds, 0)
+        FROM lot_matches lm JOIN sales s ON s.id = lm.sale_id
+        WHERE abs(lm.proceeds - COALESCE(s.net_proceeds, 0)) > 0.005
+        """
+    ):
+        now = "missing lot" if current is None else f"now {current:.2f}"
+        problems.append(f"sale {sale_id} {field}: matched {frozen:.2f}, {now}")
+    return problems
+
+
+def set_method(conn: sqlite3.Connection, method: str):
+    """Choose FIFO or LIFO for sales recorded from now on (existing matches are kept)."""
+    from config.settings import SettingsManager
+
+    method = method.upper()
+    if method not in METHODS:
+        raise ValueError(f"Unknown lot method {method!r}; expected one of {METHODS}")
+    SettingsManager(conn).set("lot_method", method)
+
+
+def open_lots(conn: sqlite3.Connection, card_id: str) -> list[dict]:
+    """Unsold lots of a card, oldest first, for specific-ID selection."""
+    cursor = conn.execute(
+        """
+        SELECT l.lot_id, l.acquired_date, l.cost_basis FROM purchase_lots l
+        WHERE l.card_id = ?
+          AND NOT EXISTS (SELECT 1 FROM lot_matches lm WHERE lm.lot_id = l.lot_id)
+        ORDER BY l.acquired_date, l.lot_id
+        """,
+        (card_id,),
+    )
+    return [dict(zip(("lot_id", "acquired_date", "cost_basis"), row)) for row in cursor]
+
+
+def realized_gains(conn: sqlite3.Connection, start: str, end: str) -> dict:
+    """Disposals with start <= disposed_date <= end, plus short- and long-term totals."""
+    cursor = conn.execute(
+        """
+        SELECT sale_id, lot_id, card_id, method, acquired_date, disposed_date,
+               cost_basis, proceeds, gain, holding_days
+        FROM lot_matches
+        WHERE disposed_date BETWEEN ? AND ?
+        ORDER BY disposed_date, sale_id
+        """,
+        (start, end),
+    )
+    columns = [d[0] for d in cursor.description]
+    disposals = [dict(zip(columns, row)) for row in cursor]
+    totals = {"short_term": 0.0, "long_term": 0.0}
+    for d in disposals:
+        d["term"] = "long_term" if d["holding_days"] > LONG_TERM_DAYS else "short_term"
+        totals[d["term"]] += d["gain"]
+    return {
+        "disposals": disposals,
+        "proceeds": round(sum(d["proceeds"] for d in disposals), 2),
+        "cost_basis": round(sum(d["cost_basis"] for d in disposals), 2),
+        "short_term_gain": round(totals["short_term"], 2),
+        "long_term_gain": round(totals["long_term"], 2),
+        "total_gain": round(totals["short_term"] + totals["long_term"], 2),
+    }
+
+
+def main(argv=None) -> int:
+    from database.connection import connect, get_db_path
+    from database.unit_of_work import unit_of_work
+
+    parser = argparse.ArgumentParser(description="Check sale-to-lot matches against current data.")
+    parser.add_argument("--db", default=get_db_path())
+    parser.add_argument("--rebuild", action="store_true", help="re-match every sale from scratch")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.rebuild:
+            with unit_of_work(conn):
+                rebuild(conn)
+            print("Lot matches rebuilt.")
+        problems = verify(conn)
+        if not problems:
+            print("Lot matches are consistent.")
+            return 0
+        for problem in problems:
+            print(f"MISMATCH {problem}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
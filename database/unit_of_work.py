@@ -0,0 +1,60 @@
+"""Unit-of-work transactions shared by the repositories.
+
+Repository writes call commit(), which commits immediately unless the connection
+is inside unit_of_work(); then the whole block commits once on exit, or rolls
+back if it raises. Nested units become savepoints, so an inner block that fails
+can be caught without discarding the outer work.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+_depths: dict[int, int] = {}
+_lock = threading.Lock()
+
+
+def in_unit_of_work(conn: sqlite3.Connection) -> bool:
+    with _lock:
+        return id(conn) in _depths
+
+
+def commit(conn: sqlite3.Connection):
+    """Commit now unless a surrounding unit of work will commit later."""
+    if not in_unit_of_work(conn):
+        conn.commit()
+
+
+@contextmanager
+def unit_of_work(conn: sqlite3.Connection):
+    key = id(conn)
+    with _lock:
+        depth = _depths.get(key, 0)
+        _depths[key] = depth + 1
+
+    savepoint = f"uow_{depth}"
+    try:
+        if depth == 0:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        if depth == 0:
+            conn.commit()
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+    finally:
+        with _lock:
+            if depth == 0:
+                del _depths[key]
+            else:
+                _depths[key] = depth
@@ -3,13 +3,16 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from ttkbootstrap.dialogs import Messagebox
 from tkinter import filedialog
 
-from database.connection import get_connection, close_connection
+from database.connection import get_connection, get_manager, close_connection
+from database.profiles import PROFILES
 from database.schema import initialize_database
+from config.defaults import DEFAULT_WAL_CHECKPOINT_INTERVAL
 from config.settings import SettingsManager
-from services.csv_export import export_inventory, export_sales, export_comps
+from services.export_formats import available_formats
+from services.export_jobs import ExportJobRunner
+from services.refresh_scheduler import RefreshScheduler
 
 from gui.tabs.profit_calculator import ProfitCalculatorTab
 from gui.tabs.deal_analyzer import DealAnalyzerTab
@@ -20,6 +23,16 @@ from gui.tabs.settings import SettingsTab
 
 
 class App(ttk.Window):
+    EXPORT_FORMAT_LABELS = {
+        "csv": "CSV files",
+        "csv.gz": "Gzipped CSV",
+        "csv.zst": "Zstandard CSV",
+        "jsonl": "JSON Lines",
+        "jsonl.gz": "Gzipped JSON Lines",
+        "parquet": "Parquet",
+        "arrow": "Arrow IPC",
+    }
+
     def __init__(self):
         super().__init__(
             title="Sports Card Profit Calculator & Deal Analyzer",
@@ -29,15 +42,28 @@ class App(ttk.Window):
         )
 
         # Initialize database
+        self.db = get_manager()
         self.conn = get_connection()
         initialize_database(self.conn)
         self.settings = SettingsManager(self.conn)
         self.settings.seed_defaults()
+        if self.settings.get("db_profile") in PROFILES:
+            self.db.set_profile(self.settings.get("db_profile"))
+
+        # Keep inventory market data fresh off the Tk main loop
+        self.scheduler = RefreshScheduler(self.db)
+        self.scheduler.start()
+
+        # Exports run on a worker thread; _poll_exports relays their progress
+        self.exports = ExportJobRunner(self.db, on_update=self._on_export_update)
+        self._export_poll_job = None
 
         self._build_menu()
         self._build_ui()
         self._bind_shortcuts()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._checkpoint_job = self.after(DEFAULT_WAL_CHECKPOINT_INTERVAL * 1000,
+                                          self._checkpoint_wal)
 
     def _build_menu(self):
         menubar = tk.Menu(self)
@@ -46,10 +72,10 @@ class App(ttk.Window):
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
-        file_menu.add_command(label="Export Inventory (CSV)", command=self._export_inventory,
+        file_menu.add_command(label="Export Inventory...", command=self._export_inventory,
                               accelerator="Ctrl+E")
-        file_menu.add_command(label="Export Sales (CSV)", command=self._export_sales)
-        file_menu.add_command(label="Export Comps (CSV)", command=self._export_comps)
+        file_menu.add_command(label="Export Sales...", command=self._export_sales)
+        file_menu.add_command(label="Export Comps...", command=self._export_comps)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self._on_close, accelerator="Ctrl+Q")
 
@@ -81,6 +107,16 @@ class App(ttk.Window):
             padding=(10, 5),
         ).pack(fill=X)
 
+        # Export status bar, shown only while exports are queued or running
+        self.export_bar = ttk.Frame(self, padding=(10, 0, 10, 6))
+        self.export_status_var = ttk.StringVar()
+        ttk.Label(self.export_bar, textvariable=self.export_status_var).pack(side=LEFT)
+        ttk.Button(self.export_bar, text="Cancel", bootstyle="danger-outline",
+                   command=self._cancel_exports).pack(side=RIGHT)
+        self.export_progress = ttk.Progressbar(self.export_bar, mode="determinate", length=240,
+                                               bootstyle="info-striped")
+        self.export_progress.pack(side=RIGHT, padx=10)
+
         # Notebook (tabs)
         self.notebook = ttk.Notebook(self, padding=5)
         self.notebook.pack(fill=BOTH, expand=True, padx=10, pady=(0, 10))
@@ -90,7 +126,8 @@ class App(ttk.Window):
         self.tab_comps = SoldCompsTab(self.notebook, self.conn, self.settings)
         self.tab_breakeven = BreakevenTab(self.notebook, self.conn, self.settings)
         self.tab_roi = ROITrackerTab(self.notebook, self.conn, self.settings)
-        self.tab_settings = SettingsTab(self.notebook, self.conn, self.settings)
+        self.tab_settings = SettingsTab(self.notebook, self.conn, self.settings,
+                                        on_save=self.scheduler.settings_changed)
 
         self.notebook.add(self.tab_profit, text="  Profit Calculator  ")
         self.notebook.add(self.tab_deals, text="  Deal Analyzer  ")
@@ -110,47 +147,86 @@ class App(ttk.Window):
         self.bind("<Control-Key-6>", lambda e: self.notebook.select(5))
 
     def _export_inventory(self):
-        filepath = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Export Inventory",
-            initialfile="inventory.csv",
-        )
-        if filepath:
-            result = export_inventory(self.conn, filepath)
-            if result:
-                Messagebox.ok(f"Inventory exported to:\n{result}", "Export Complete")
-            else:
-                Messagebox.show_info("No inventory data to export.", "Export")
+        self._start_export("inventory", "Export Inventory")
 
     def _export_sales(self):
-        filepath = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Export Sales",
-            initialfile="sales.csv",
-        )
-        if filepath:
-            result = export_sales(self.conn, filepath)
-            if result:
-                Messagebox.ok(f"Sales exported to:\n{result}", "Export Complete")
-            else:
-                Messagebox.show_info("No sales data to export.", "Export")
+        self._start_export("sales", "Export Sales")
 
     def _export_comps(self):
+        self._start_export("comps", "Export Comps")
+
+    def _start_export(self, kind: str, title: str):
+        # The exporter picks the format from the chosen file's extension
         filepath = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Export Comps",
-            initialfile="comps.csv",
+            filetypes=[(self.EXPORT_FORMAT_LABELS.get(fmt, fmt), f"*.{fmt}")
+                       for fmt in available_formats()],
+            title=title,
+            initialfile=f"{kind}.csv",
         )
-        if filepath:
-            result = export_comps(self.conn, filepath)
-            if result:
-                Messagebox.ok(f"Comps exported to:\n{result}", "Export Complete")
+        if not filepath:
+            return
+        self.exports.submit(kind, filepath)
+        self.export_bar.pack(fill=X, side=BOTTOM, before=self.notebook)
+        self._update_export_bar()
+        if self._export_poll_job is None:
+            self._export_poll_job = self.after(100, self._poll_exports)
+
+    def _poll_exports(self):
+        self.exports.poll()
+        if self.exports.active_jobs():
+            self._export_poll_job = self.after(100, self._poll_exports)
+        else:
+            self._export_poll_job = None
+            self.export_bar.pack_forget()
+
+    def _on_export_update(self, job):
+        if job.finished:
+            label = job.kind.capitalize()
+            if job.status == "done":
+                self._show_toast(f"{label} exported ({job.rows_written:,} rows) to\n{job.filepath}",
+                                 "success")
+            elif job.status == "empty":
+                self._show_toast(f"No {job.kind} data to export.", "secondary")
+            elif job.status == "cancelled":
+                self._show_toast(f"{label} export cancelled.", "warning")
             else:
-                Messagebox.show_info("No comp data to export.", "Export")
+                self._show_toast(f"{label} export failed: {job.error}", "danger")
+        self._update_export_bar()
+
+    def _update_export_bar(self):
+        active = self.exports.active_jobs()
+        if not active:
+            return
+        current = active[0]
+        queued = f" (+{len(active) - 1} queued)" if len(active) > 1 else ""
+        pct = current.progress_pct
+        self.export_progress.configure(value=pct or 0)
+        done = f"{current.rows_written:,} rows" if pct is None else f"{pct:.0f}%"
+        self.export_status_var.set(f"Exporting {current.kind}... {done}{queued}")
+
+    def _cancel_exports(self):
+        for job in self.exports.active_jobs():
+            self.exports.cancel(job.id)
+
+    def _show_toast(self, message: str, bootstyle: str = "info", duration_ms: int = 4000):
+        """Non-blocking notification in the bottom-right corner that fades out on its own."""
+        toast = ttk.Label(self, text=message, bootstyle=f"inverse-{bootstyle}", padding=(12, 8),
+                          wraplength=360)
+        toast.place(relx=1.0, rely=1.0, x=-16, y=-16, anchor="se")
+        self.after(duration_ms, toast.destroy)
+
+    def _checkpoint_wal(self):
+        # PASSIVE never waits on readers, so this can't stall the UI
+        self.db.checkpoint("PASSIVE")
+        self._checkpoint_job = self.after(DEFAULT_WAL_CHECKPOINT_INTERVAL * 1000,
+                                          self._checkpoint_wal)
 
     def _on_close(self):
+        self.after_cancel(self._checkpoint_job)
+        if self._export_poll_job is not None:
+            self.after_cancel(self._export_poll_job)
+        self.exports.stop()
+        self.scheduler.stop()
         close_connection()
         self.destroy()
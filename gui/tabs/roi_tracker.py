@@ -5,11 +5,16 @@ from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
 from datetime import date
 
+from database import tax_lots
 from database.repository import (
     CardRepository, PurchaseRepository, SaleRepository,
     ShippingRepository, FeeProfileRepository, GradingRepository,
 )
+from database.unit_of_work import unit_of_work
+from services.aging import AgingAnalytics, BUCKETS as AGING_BUCKETS, DIMENSIONS as AGING_DIMENSIONS
+from services.lot_intake import LotIntake
 from services.roi_tracker import ROITracker
+from services.valuation import ValuationService
 from services.calculator import calculate_profit, get_per_order_fee
 
 import matplotlib
@@ -19,11 +24,17 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
 class ROITrackerTab(ttk.Frame):
+    # Chart views backed by the P&L rollups, mapped to their granularity
+    CHART_GRANULARITIES = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+
     def __init__(self, parent, conn, settings):
         super().__init__(parent, padding=10)
         self.conn = conn
         self.settings = settings
         self.tracker = ROITracker(conn)
+        self.valuation = ValuationService(conn)
+        self.aging = AgingAnalytics(conn)
+        self.lot_intake = LotIntake(conn)
         self.cards_repo = CardRepository(conn)
         self.purchases_repo = PurchaseRepository(conn)
         self.sales_repo = SaleRepository(conn)
@@ -64,6 +75,7 @@ class ROITrackerTab(ttk.Frame):
             ("cards_sold", "Sold"),
             ("cards_in_inventory", "In Inventory"),
             ("avg_profit_per_card", "Avg Profit/Card"),
+            ("total_unrealized_pnl", "Unrealized P&L"),
         ]
 
         for i, (key, text) in enumerate(labels):
@@ -84,8 +96,12 @@ class ROITrackerTab(ttk.Frame):
 
         ttk.Button(bar, text="+ Log Purchase", bootstyle="success",
                    command=self._open_purchase_dialog).pack(side=LEFT, padx=(0, 5))
+        ttk.Button(bar, text="+ Log Lot", bootstyle="success-outline",
+                   command=self._open_lot_dialog).pack(side=LEFT, padx=(0, 5))
         ttk.Button(bar, text="+ Log Sale", bootstyle="info",
                    command=self._open_sale_dialog).pack(side=LEFT, padx=(0, 5))
+        ttk.Button(bar, text="Aging", bootstyle="warning-outline",
+                   command=self._open_aging_dialog).pack(side=LEFT, padx=(0, 5))
         ttk.Button(bar, text="Refresh", bootstyle="secondary-outline",
                    command=self._refresh_all).pack(side=LEFT, padx=(0, 15))
 
@@ -124,6 +140,15 @@ class ROITrackerTab(ttk.Frame):
         scroll = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=scroll.set)
 
+        # Rows are fetched one keyset page at a time
+        more_bar = ttk.Frame(table_frame)
+        more_bar.pack(side=BOTTOM, fill=X, pady=(4, 0))
+        self.load_more_btn = ttk.Button(more_bar, text="Load more", bootstyle="secondary-outline",
+                                        command=self._load_inventory_page, state=DISABLED)
+        self.load_more_btn.pack(side=RIGHT)
+        self.row_count_label = ttk.Label(more_bar, text="", bootstyle="secondary")
+        self.row_count_label.pack(side=LEFT)
+
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
         scroll.pack(side=RIGHT, fill=Y)
 
@@ -131,11 +156,22 @@ class ROITrackerTab(ttk.Frame):
         self.tree.tag_configure("profit", foreground="#00bc8c")
         self.tree.tag_configure("loss", foreground="#e74c3c")
         self.tree.tag_configure("unsold", foreground="#adb5bd")
+        self.tree.tag_configure("unrealized", foreground="#f39c12")
 
     def _build_chart_panel(self, paned):
-        chart_frame = ttk.Labelframe(paned, text="Profit / Loss by Card", padding=5)
+        chart_frame = ttk.Labelframe(paned, text="Profit / Loss", padding=5)
         paned.add(chart_frame, weight=2)
 
+        view_bar = ttk.Frame(chart_frame)
+        view_bar.pack(fill=X, pady=(0, 4))
+        ttk.Label(view_bar, text="View:").pack(side=LEFT, padx=(0, 5))
+        self.chart_view_var = ttk.StringVar(value="Recent Cards")
+        view_combo = ttk.Combobox(view_bar, textvariable=self.chart_view_var, width=14,
+                                  values=["Recent Cards", *self.CHART_GRANULARITIES],
+                                  state="readonly")
+        view_combo.pack(side=LEFT)
+        view_combo.bind("<<ComboboxSelected>>", lambda e: self._refresh_chart())
+
         self.fig = Figure(figsize=(4, 3), dpi=90, facecolor="#222222")
         self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
@@ -150,7 +186,9 @@ class ROITrackerTab(ttk.Frame):
 
     def _refresh_summary(self):
         summary = self.tracker.get_portfolio_summary()
-        money_keys = ("total_invested", "total_revenue", "total_profit", "avg_profit_per_card")
+        summary["total_unrealized_pnl"] = self.valuation.value_inventory()["total_unrealized_pnl"]
+        money_keys = ("total_invested", "total_revenue", "total_profit", "avg_profit_per_card",
+                      "total_unrealized_pnl")
         for key, var in self.summary_vars.items():
             val = summary.get(key, 0)
             if key in money_keys:
@@ -178,68 +216,109 @@ class ROITrackerTab(ttk.Frame):
     def _refresh_inventory(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self._inventory_cursor = None
+        # Unsold cards show mark-to-market estimates in the profit columns
+        self._valuations = {v.card_id: v for v in self.valuation.value_inventory()["cards"]}
+        self._load_inventory_page()
 
-        rows = self.tracker.get_inventory_with_details()
+    def _load_inventory_page(self):
         status_filter = self.filter_var.get()
+        rows, self._inventory_cursor = self.tracker.get_inventory_page(
+            self._inventory_cursor, status=None if status_filter == "All" else status_filter,
+        )
 
+        # Profit and ROI arrive computed by the card_pnl view; this only formats
         for row in rows:
-            status = row.get("status", "Inventory")
-            if status_filter != "All" and status != status_filter:
-                continue
-
-            cost_basis = row.get("total_cost_basis") or 0
-            sale_price = row.get("sale_price")
-            net_proceeds = row.get("net_proceeds")
-
-            if net_proceeds is not None and cost_basis > 0:
-                profit = net_proceeds - cost_basis
-                roi = profit / cost_basis * 100
-                tag = "profit" if profit >= 0 else "loss"
+            profit_text = f"${row.profit:,.2f}" if row.profit is not None else "--"
+            roi_text = f"{row.roi_pct:,.1f}%" if row.roi_pct is not None else "--"
+            estimate = self._valuations.get(row.card_id)
+            if row.profit is not None:
+                tag = "profit" if row.profit >= 0 else "loss"
+            elif estimate is not None and estimate.unrealized_pnl is not None:
+                tag = "unrealized"
+                profit_text = f"~${estimate.unrealized_pnl:,.2f}"
+                if estimate.unrealized_roi_pct is not None:
+                    roi_text = f"~{estimate.unrealized_roi_pct:,.1f}%"
             else:
-                profit = None
-                roi = None
                 tag = "unsold"
 
             values = (
-                row.get("card_id", ""),
-                row.get("description", ""),
-                status,
-                f"${cost_basis:,.2f}" if cost_basis else "--",
-                f"${sale_price:,.2f}" if sale_price is not None else "--",
-                f"${net_proceeds:,.2f}" if net_proceeds is not None else "--",
-                f"${profit:,.2f}" if profit is not None else "--",
-                f"{roi:,.1f}%" if roi is not None else "--",
+                row.card_id,
+                row.description,
+                row.status,
+                f"${row.total_cost_basis:,.2f}" if row.total_cost_basis else "--",
+                f"${row.sale_price:,.2f}" if row.sale_price is not None else "--",
+                f"${row.net_proceeds:,.2f}" if row.net_proceeds is not None else "--",
+                profit_text,
+                roi_text,
             )
             self.tree.insert("", END, values=values, tags=(tag,))
 
+        shown = len(self.tree.get_children())
+        more = self._inventory_cursor is not None
+        self.row_count_label.configure(text=f"{shown:,} cards shown" + (" (more available)" if more else ""))
+        self.load_more_btn.configure(state=NORMAL if more else DISABLED)
+
     def _refresh_chart(self):
         self.ax.clear()
-        rows = self.tracker.get_inventory_with_details()
+        granularity = self.CHART_GRANULARITIES.get(self.chart_view_var.get())
+        if granularity:
+            self._draw_rollup_chart(granularity)
+        else:
+            self._draw_recent_cards_chart()
+
+    def _draw_empty_chart(self, message):
+        self.ax.set_facecolor("#222222")
+        self.ax.text(0.5, 0.5, message, ha="center", va="center",
+                     color="#adb5bd", fontsize=11, transform=self.ax.transAxes)
+        self.canvas.draw()
+
+    def _style_axes(self):
+        self.ax.set_facecolor("#222222")
+        self.ax.tick_params(colors="#adb5bd", labelsize=8)
+        for spine in self.ax.spines.values():
+            spine.set_color("#444444")
+        self.fig.tight_layout()
+        self.canvas.draw()
 
-        # Only cards that have been sold
-        sold = [r for r in rows if r.get("net_proceeds") is not None and r.get("total_cost_basis")]
+    def _draw_recent_cards_chart(self):
+        # Only cards that have been sold, limited to the most recent 15 for readability
+        sold = self.tracker.get_recent_sold(15)
         if not sold:
-            self.ax.set_facecolor("#222222")
-            self.ax.text(0.5, 0.5, "No sold cards yet", ha="center", va="center",
-                         color="#adb5bd", fontsize=11, transform=self.ax.transAxes)
-            self.canvas.draw()
+            self._draw_empty_chart("No sold cards yet")
             return
 
-        # Limit to most recent 15 for readability
-        sold = sold[:15]
-        labels = [r.get("card_id", "?")[-6:] for r in sold]
-        profits = [round((r["net_proceeds"] or 0) - (r["total_cost_basis"] or 0), 2) for r in sold]
+        labels = [r.card_id[-6:] for r in sold]
+        profits = [r.profit for r in sold]
         colors = ["#00bc8c" if p >= 0 else "#e74c3c" for p in profits]
 
         self.ax.barh(labels, profits, color=colors)
-        self.ax.set_facecolor("#222222")
-        self.ax.tick_params(colors="#adb5bd", labelsize=8)
         self.ax.set_xlabel("Profit ($)", color="#adb5bd", fontsize=9)
         self.ax.axvline(0, color="#555555", linewidth=0.8)
-        for spine in self.ax.spines.values():
-            spine.set_color("#444444")
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self._style_axes()
+
+    def _draw_rollup_chart(self, granularity):
+        series = self.tracker.get_pnl_series(granularity)
+        if not series:
+            self._draw_empty_chart("No realized sales yet")
+            return
+
+        periods = [r["period"] for r in series]
+        profits = [r["profit"] for r in series]
+        cumulative = [r["cumulative_profit"] for r in series]
+        colors = ["#00bc8c" if p >= 0 else "#e74c3c" for p in profits]
+
+        positions = range(len(periods))
+        self.ax.bar(positions, profits, color=colors)
+        self.ax.plot(positions, cumulative, color="#3498db", linewidth=1.5, label="Cumulative")
+        self.ax.axhline(0, color="#555555", linewidth=0.8)
+        # Label at most ~12 ticks so years of daily data stay legible
+        step = max(1, len(periods) // 12)
+        self.ax.set_xticks(list(positions)[::step])
+        self.ax.set_xticklabels(periods[::step], rotation=45, ha="right")
+        self.ax.set_ylabel("Realized profit ($)", color="#adb5bd", fontsize=9)
+        self.ax.legend(fontsize=8, facecolor="#222222", labelcolor="#adb5bd", edgecolor="#444444")
+        self._style_axes()
 
     # ── Log Purchase Dialog ─────────────────────────────────────────
 
@@ -346,19 +425,20 @@ class ROITrackerTab(ttk.Frame):
                 "grade": grade_var.get().strip() or None if graded_var.get() else None,
                 "status": "Inventory",
             }
-            card_id = self.cards_repo.add(card_data)
-
-            purchase_data = {
-                "card_id": card_id,
-                "purchase_date": fields["Purchase Date"].get().strip(),
-                "purchase_price": price,
-                "sales_tax_paid": float(fields["Sales Tax Paid"].get() or 0),
-                "shipping_paid": float(fields["Shipping Paid"].get() or 0),
-                "grading_cost": float(fields["Grading Cost"].get() or 0),
-                "source": source_var.get(),
-                "notes": fields["Notes"].get().strip() or None,
-            }
-            self.purchases_repo.add(purchase_data)
+            with unit_of_work(self.conn):
+                card_id = self.cards_repo.add(card_data)
+
+                purchase_data = {
+                    "card_id": card_id,
+                    "purchase_date": fields["Purchase Date"].get().strip(),
+                    "purchase_price": price,
+                    "sales_tax_paid": float(fields["Sales Tax Paid"].get() or 0),
+                    "shipping_paid": float(fields["Shipping Paid"].get() or 0),
+                    "grading_cost": float(fields["Grading Cost"].get() or 0),
+                    "source": source_var.get(),
+                    "notes": fields["Notes"].get().strip() or None,
+                }
+                self.purchases_repo.add(purchase_data)
 
             dlg.destroy()
             self._refresh_all()
@@ -366,6 +446,140 @@ class ROITrackerTab(ttk.Frame):
         ttk.Button(btn_frame, text="Save Purchase", bootstyle="success",
                    command=save_purchase).pack(side=RIGHT)
 
+    # ── Log Lot Dialog ──────────────────────────────────────────────
+
+    def _open_lot_dialog(self):
+        dlg = ttk.Toplevel(self)
+        dlg.title("Log Lot Purchase")
+        dlg.geometry("640x640")
+        dlg.grab_set()
+
+        container = ttk.Frame(dlg, padding=15)
+        container.pack(fill=BOTH, expand=True)
+
+        ttk.Label(container, text="Log Lot Purchase", font=("-size", 14, "-weight", "bold")).pack(
+            anchor=W, pady=(0, 4))
+        ttk.Label(container, text="One card per line; for manual weights use 'Description | weight'.",
+                  bootstyle="secondary").pack(anchor=W, pady=(0, 4))
+        cards_text = ttk.Text(container, height=8, width=70)
+        cards_text.pack(fill=X)
+
+        fields = {}
+        form = ttk.Frame(container)
+        form.pack(fill=X, pady=(8, 0))
+        for i, (label, default) in enumerate([
+            ("Lot Price *", "0.00"), ("Sales Tax Paid", "0.00"), ("Shipping Paid", "0.00"),
+            ("Purchase Date", date.today().isoformat()),
+        ]):
+            ttk.Label(form, text=label, width=16, anchor=W).grid(row=i // 2, column=(i % 2) * 2,
+                                                                 sticky=W, pady=3)
+            entry = ttk.Entry(form, width=16)
+            entry.insert(0, default)
+            entry.grid(row=i // 2, column=(i % 2) * 2 + 1, sticky=W, padx=(0, 15), pady=3)
+            fields[label] = entry
+
+        choice_row = ttk.Frame(container)
+        choice_row.pack(fill=X, pady=3)
+        ttk.Label(choice_row, text="Sport", width=16, anchor=W).pack(side=LEFT)
+        sport_var = ttk.StringVar(value="Basketball")
+        ttk.Combobox(choice_row, textvariable=sport_var, width=12, state="readonly",
+                     values=["Basketball", "Baseball", "Football", "Hockey", "Soccer", "Other"]
+                     ).pack(side=LEFT, padx=(0, 10))
+        ttk.Label(choice_row, text="Source").pack(side=LEFT, padx=(0, 5))
+        source_var = ttk.StringVar(value="Card Show")
+        ttk.Combobox(choice_row, textvariable=source_var, width=12, state="readonly",
+                     values=["eBay", "Card Show", "LCS", "Facebook", "COMC", "Other"]
+                     ).pack(side=LEFT, padx=(0, 10))
+        ttk.Label(choice_row, text="Allocate by").pack(side=LEFT, padx=(0, 5))
+        methods = {"Market Value": "market", "Equal Split": "equal", "Manual Weights": "manual"}
+        method_var = ttk.StringVar(value="Market Value")
+        ttk.Combobox(choice_row, textvariable=method_var, width=14, state="readonly",
+                     values=list(methods)).pack(side=LEFT)
+
+        preview_cols = ("description", "weight", "price", "tax", "shipping")
+        preview = ttk.Treeview(container, columns=preview_cols, show="headings", height=8)
+        for col, heading, width in [
+            ("description", "Description", 240), ("weight", "Weight", 70), ("price", "Price", 80),
+            ("tax", "Tax", 70), ("shipping", "Shipping", 70),
+        ]:
+            preview.heading(col, text=heading)
+            preview.column(col, width=width, anchor=W if col == "description" else CENTER)
+        preview.pack(fill=BOTH, expand=True, pady=(8, 0))
+
+        def read_lot():
+            """(cards, weights, amounts) from the form; None after showing an error."""
+            cards, weights = [], []
+            for line in cards_text.get("1.0", END).splitlines():
+                desc, _, weight = line.partition("|")
+                if not desc.strip():
+                    continue
+                cards.append({"description": desc.strip(), "sport": sport_var.get(),
+                              "status": "Inventory"})
+                weights.append(weight.strip())
+            if not cards:
+                Messagebox.show_error("Enter at least one card.", "Validation Error", parent=dlg)
+                return None
+            try:
+                amounts = {label: float(fields[label].get() or 0)
+                           for label in ("Lot Price *", "Sales Tax Paid", "Shipping Paid")}
+                manual = ([float(w) for w in weights]
+                          if methods[method_var.get()] == "manual" else None)
+            except ValueError:
+                Messagebox.show_error("Amounts and weights must be numbers.", "Validation Error",
+                                      parent=dlg)
+                return None
+            return cards, manual, amounts
+
+        def plan_lot(lot):
+            cards, manual, amounts = lot
+            return self.lot_intake.plan(
+                cards, amounts["Lot Price *"], amounts["Sales Tax Paid"], amounts["Shipping Paid"],
+                methods[method_var.get()], manual,
+            )
+
+        def show_preview():
+            lot = read_lot()
+            if lot is None:
+                return
+            try:
+                allocations = plan_lot(lot)
+            except ValueError as exc:
+                Messagebox.show_error(str(exc), "Validation Error", parent=dlg)
+                return
+            preview.delete(*preview.get_children())
+            for card, a in zip(lot[0], allocations):
+                preview.insert("", END, values=(
+                    card["description"], f"{a['weight']:g}", f"${a['purchase_price']:,.2f}",
+                    f"${a['sales_tax_paid']:,.2f}", f"${a['shipping_paid']:,.2f}",
+                ))
+
+        def save_lot():
+            lot = read_lot()
+            if lot is None:
+                return
+            cards, manual, amounts = lot
+            try:
+                self.lot_intake.intake(
+                    cards, amounts["Lot Price *"], fields["Purchase Date"].get().strip(),
+                    amounts["Sales Tax Paid"], amounts["Shipping Paid"], source=source_var.get(),
+                    notes=f"Lot of {len(cards)}", method=methods[method_var.get()],
+                    manual_weights=manual,
+                )
+            except ValueError as exc:
+                Messagebox.show_error(str(exc), "Validation Error", parent=dlg)
+                return
+            dlg.destroy()
+            self._refresh_all()
+
+        btn_frame = ttk.Frame(container)
+        btn_frame.pack(fill=X, pady=(12, 0))
+        ttk.Button(btn_frame, text="Cancel", bootstyle="secondary",
+                   command=dlg.destroy).pack(side=RIGHT, padx=(5, 0))
+        ttk.Button(btn_frame, text="Save Lot", bootstyle="success",
+                   command=save_lot).pack(side=RIGHT)
+        ttk.Button(btn_frame, text="Preview Allocation", bootstyle="info-outline",
+                   command=show_preview).pack(side=LEFT)
+
     # ── Log Sale Dialog ─────────────────────────────────────────────
 
     def _open_sale_dialog(self):
@@ -377,7 +591,7 @@ class ROITrackerTab(ttk.Frame):
 
         dlg = ttk.Toplevel(self)
         dlg.title("Log Sale")
-        dlg.geometry("480x520")
+        dlg.geometry("480x555")
         dlg.resizable(False, False)
         dlg.grab_set()
 
@@ -391,10 +605,30 @@ class ROITrackerTab(ttk.Frame):
         card_frame = ttk.Frame(container)
         card_frame.pack(fill=X, pady=3)
         ttk.Label(card_frame, text="Select Card *", width=18, anchor=W).pack(side=LEFT)
-        card_map = {f"{c['card_id']} - {c['description'][:40]}": c['card_id'] for c in inventory_cards}
+        card_map = {f"{c.card_id} - {c.description[:40]}": c.card_id for c in inventory_cards}
         card_var = ttk.StringVar()
-        ttk.Combobox(card_frame, textvariable=card_var, width=33,
-                     values=list(card_map.keys()), state="readonly").pack(side=LEFT, fill=X, expand=True)
+        card_combo = ttk.Combobox(card_frame, textvariable=card_var, width=33,
+                                  values=list(card_map.keys()), state="readonly")
+        card_combo.pack(side=LEFT, fill=X, expand=True)
+
+        # Lot selector: a re-bought card can be sold against a specific purchase lot
+        lot_frame = ttk.Frame(container)
+        lot_frame.pack(fill=X, pady=3)
+        ttk.Label(lot_frame, text="Lot", width=18, anchor=W).pack(side=LEFT)
+        auto_lot = f"Auto ({self.settings.get('lot_method', 'FIFO')})"
+        lot_map = {}
+        lot_var = ttk.StringVar(value=auto_lot)
+        lot_combo = ttk.Combobox(lot_frame, textvariable=lot_var, width=33,
+                                 values=[auto_lot], state="readonly")
+        lot_combo.pack(side=LEFT, fill=X, expand=True)
+
+        def on_card_select(e):
+            lot_map.clear()
+            for lot in tax_lots.open_lots(self.conn, card_map[card_var.get()]):
+                lot_map[f"{lot['acquired_date']} - ${lot['cost_basis']:,.2f}"] = lot["lot_id"]
+            lot_combo.configure(values=[auto_lot, *lot_map])
+            lot_var.set(auto_lot)
+        card_combo.bind("<<ComboboxSelected>>", on_card_select)
 
         fields = {}
 
@@ -521,12 +755,97 @@ class ROITrackerTab(ttk.Frame):
                 "net_proceeds": result["net_proceeds"],
                 "platform": platform_var.get(),
                 "notes": fields["Notes"].get().strip() or None,
+                "lot_id": lot_map.get(lot_var.get()),
             }
-            self.sales_repo.add(sale_data)
-            self.cards_repo.update_status(card_id, "Sold")
+            with unit_of_work(self.conn):
+                self.sales_repo.add(sale_data)
+                self.cards_repo.update_status(card_id, "Sold")
 
             dlg.destroy()
             self._refresh_all()
 
         ttk.Button(btn_frame, text="Save Sale", bootstyle="info",
                    command=save_sale).pack(side=RIGHT)
+
+    # ── Aging Dialog ────────────────────────────────────────────────
+
+    def _open_aging_dialog(self):
+        dlg = ttk.Toplevel(self)
+        dlg.title("Inventory Aging")
+        dlg.geometry("820x560")
+
+        container = ttk.Frame(dlg, padding=15)
+        container.pack(fill=BOTH, expand=True)
+
+        ttk.Label(container, text="Inventory Aging", font=("-size", 14, "-weight", "bold")).pack(
+            anchor=W, pady=(0, 10))
+
+        # Aged-inventory buckets for unsold cards
+        bucket_frame = ttk.Frame(container)
+        bucket_frame.pack(fill=X, pady=(0, 8))
+        for i, bucket in enumerate(self.aging.buckets()):
+            col = ttk.Frame(bucket_frame)
+            col.grid(row=0, column=i, padx=12, sticky="n")
+            ttk.Label(col, text=f"{bucket['bucket']} days", bootstyle="secondary").pack()
+            style = "danger" if bucket["bucket"] == AGING_BUCKETS[-1] else "primary"
+            ttk.Label(col, text=f"{bucket['cards']:,} cards / ${bucket['capital']:,.2f}",
+                      font=("-size", 12, "-weight", "bold"), bootstyle=style).pack()
+
+        # Turnover metrics grouped by the chosen dimension
+        group_bar = ttk.Frame(container)
+        group_bar.pack(fill=X, pady=(4, 4))
+        ttk.Label(group_bar, text="Group by:").pack(side=LEFT, padx=(0, 5))
+        labels = {"source": "Source", "sport": "Sport", "graded": "Graded",
+                  "purchase_month": "Purchase Month"}
+        group_var = ttk.StringVar(value="Source")
+        group_combo = ttk.Combobox(group_bar, textvariable=group_var, width=16, state="readonly",
+                                   values=[labels[d] for d in AGING_DIMENSIONS])
+        group_combo.pack(side=LEFT)
+
+        metric_cols = ("group", "cards", "sell_through", "median_to_sell", "capital_held",
+                       "turnover", "aged")
+        metrics = ttk.Treeview(container, columns=metric_cols, show="headings", height=6)
+        for col, heading, width in [
+            ("group", "Group", 140), ("cards", "Cards", 60), ("sell_through", "Sell-Through", 90),
+            ("median_to_sell", "Median Days to Sell", 120), ("capital_held", "Capital Held", 100),
+            ("turnover", "Turnover /yr", 90), ("aged", f"Aged {' / '.join(AGING_BUCKETS)}", 150),
+        ]:
+            metrics.heading(col, text=heading)
+            metrics.column(col, width=width, anchor=W if col == "group" else CENTER)
+        metrics.pack(fill=X)
+
+        def refresh_metrics():
+            metrics.delete(*metrics.get_children())
+            by = next(d for d, label in labels.items() if label == group_var.get())
+            for row in self.aging.summary(by):
+                median = row["median_days_to_sell"]
+                metrics.insert("", END, values=(
+                    row["group"] or "--",
+                    f"{row['cards']:,}",
+                    f"{row['sell_through_pct']:.1f}%",
+                    f"{median:.0f}" if median is not None else "--",
+                    f"${row['capital_held']:,.2f}",
+                    f"{row['capital_turnover']:.2f}x",
+                    " / ".join(str(row[f"aged_{label}"]) for label in AGING_BUCKETS),
+                ))
+
+        group_combo.bind("<<ComboboxSelected>>", lambda e: refresh_metrics())
+        refresh_metrics()
+
+        # Stale cards, most tied-up capital first
+        ttk.Label(container, text=f"Stale cards ({AGING_BUCKETS[-1]} days) - free up this capital first",
+                  font=("-size", 11, "-weight", "bold")).pack(anchor=W, pady=(10, 4))
+        stale_cols = ("card_id", "description", "source", "days_held", "cost_basis")
+        stale = ttk.Treeview(container, columns=stale_cols, show="headings", height=10)
+        for col, heading, width in [
+            ("card_id", "Card ID", 90), ("description", "Description", 260), ("source", "Source", 90),
+            ("days_held", "Days Held", 80), ("cost_basis", "Cost Basis", 90),
+        ]:
+            stale.heading(col, text=heading)
+            stale.column(col, width=width, anchor=W if col == "description" else CENTER)
+        stale.pack(fill=BOTH, expand=True)
+        for card in self.aging.stale_cards():
+            stale.insert("", END, values=(
+                card["card_id"], card["description"], card["source"] or "--",
+                card["days_held"], f"${card['cost_basis']:,.2f}",
+            ))
@@ -6,10 +6,11 @@ from ttkbootstrap.dialogs import Messagebox
 
 
 class SettingsTab(ttk.Frame):
-    def __init__(self, parent, conn, settings):
+    def __init__(self, parent, conn, settings, on_save=None):
         super().__init__(parent, padding=15)
         self.conn = conn
         self.settings = settings
+        self.on_save = on_save
 
         self._build_ui()
         self._load_settings()
@@ -52,8 +53,9 @@ class SettingsTab(ttk.Frame):
         self.api_env = ttk.StringVar(value="PRODUCTION")
         ttk.Combobox(
             row3, textvariable=self.api_env,
-            values=["PRODUCTION", "SANDBOX"], state="readonly", width=15,
+            values=["PRODUCTION", "SANDBOX"], width=28,
         ).pack(side=LEFT)
+        ttk.Label(row3, text="or a local mock server URL", bootstyle="secondary").pack(side=LEFT, padx=(8, 0))
 
         # --- Fee Defaults Section ---
         fee_frame = ttk.Labelframe(container, text="  Default Fee Rates  ", padding=15)
@@ -70,6 +72,17 @@ class SettingsTab(ttk.Frame):
 
         self.tax_rate = self._make_setting_row(tax_frame, "Default Tax Rate (%):", 6.25)
 
+        lot_row = ttk.Frame(tax_frame)
+        lot_row.pack(fill=X, pady=2)
+        ttk.Label(lot_row, text="Lot Matching:", width=25, anchor=W).pack(side=LEFT)
+        self.lot_method = ttk.StringVar(value="FIFO")
+        ttk.Combobox(
+            lot_row, textvariable=self.lot_method,
+            values=["FIFO", "LIFO"], width=8, state="readonly",
+        ).pack(side=LEFT)
+        ttk.Label(lot_row, text="for re-bought cards; applies to new sales",
+                  bootstyle="secondary").pack(side=LEFT, padx=(8, 0))
+
         # --- Buttons ---
         btn_frame = ttk.Frame(container)
         btn_frame.pack(fill=X, pady=10, padx=5)
@@ -111,15 +124,22 @@ class SettingsTab(ttk.Frame):
         tax = self.settings.get("sales_tax_rate", "0.0625")
         self.tax_rate.set(float(tax) * 100)
 
+        self.lot_method.set(self.settings.get("lot_method", "FIFO"))
+
     def _save_settings(self):
-        self.settings.set("ebay_client_id", self.api_client_id.get())
-        self.settings.set("ebay_client_secret", self.api_client_secret.get())
-        self.settings.set("ebay_environment", self.api_env.get())
-        self.settings.set("fvf_rate", str(self.fvf_rate.get() / 100))
-        self.settings.set("per_order_fee_low", str(self.per_order_low.get()))
-        self.settings.set("per_order_fee_high", str(self.per_order_high.get()))
-        self.settings.set("intl_fee_rate", str(self.intl_rate.get() / 100))
-        self.settings.set("sales_tax_rate", str(self.tax_rate.get() / 100))
+        self.settings.set_many({
+            "ebay_client_id": self.api_client_id.get(),
+            "ebay_client_secret": self.api_client_secret.get(),
+            "ebay_environment": self.api_env.get(),
+            "fvf_rate": str(self.fvf_rate.get() / 100),
+            "per_order_fee_low": str(self.per_order_low.get()),
+            "per_order_fee_high": str(self.per_order_high.get()),
+            "intl_fee_rate": str(self.intl_rate.get() / 100),
+            "sales_tax_rate": str(self.tax_rate.get() / 100),
+            "lot_method": self.lot_method.get(),
+        })
+        if self.on_save is not None:
+            self.on_save()
 
         Messagebox.show_info("Settings saved successfully.", title="Settings Saved")
 
@@ -129,3 +149,4 @@ class SettingsTab(ttk.Frame):
         self.per_order_high.set(0.40)
         self.intl_rate.set(1.65)
         self.tax_rate.set(6.25)
+        self.lot_method.set("FIFO")
@@ -263,13 +263,13 @@ class SoldCompsTab(ttk.Frame):
         comps = self.comp_service.get_comp_stats(query)["comps"]
         for comp in comps:
             self.tree.insert("", END, values=(
-                comp.get("source", "manual").title(),
-                comp["title"],
-                f"${comp['sold_price']:.2f}",
-                f"${comp.get('shipping_price', 0):.2f}",
-                comp.get("condition", ""),
-                comp.get("sold_date", ""),
-                comp.get("item_url", ""),
+                (comp.source or "manual").title(),
+                comp.title,
+                f"${comp.sold_price:.2f}",
+                f"${comp.shipping_price or 0:.2f}",
+                comp.condition or "",
+                comp.sold_date or "",
+                comp.item_url or "",
             ))
 
     def _open_selected_url(self, event):
@@ -1,9 +1,9 @@
 """Card data model."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     card_id: str = ""
     description: str = ""
@@ -18,3 +18,45 @@ class Card:
     grade: str = ""
     status: str = "Inventory"
     notes: str = ""
+    id: int | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+@dataclass(slots=True)
+class InventoryRow:
+    """A row of the card_pnl view: a card with its purchase and sale totals and P&L."""
+    card_id: str = ""
+    description: str = ""
+    sport: str = "Basketball"
+    is_graded: bool = False
+    grading_company: str | None = None
+    grade: str | None = None
+    status: str = "Inventory"
+    purchase_price: float | None = None
+    total_cost_basis: float | None = None
+    purchase_date: str | None = None
+    source: str | None = None
+    sale_price: float | None = None
+    net_proceeds: float | None = None
+    sale_date: str | None = None
+    total_fees: float | None = None
+    profit: float | None = None
+    roi_pct: float | None = None
+    created_at: str | None = None
+    id: int | None = None
+
+
+@dataclass(slots=True)
+class CardValuation:
+    """Mark-to-market estimate for an unsold card."""
+    card_id: str = ""
+    description: str = ""
+    status: str = "Inventory"
+    total_cost_basis: float | None = None
+    market_value: float | None = None
+    value_source: str | None = None
+    comp_count: int | None = None
+    est_net_proceeds: float | None = None
+    unrealized_pnl: float | None = None
+    unrealized_roi_pct: float | None = None
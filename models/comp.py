@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class SoldComp:
     search_query: str = ""
     card_id: str = ""
@@ -14,3 +14,5 @@ class SoldComp:
     condition: str = ""
     item_url: str = ""
     source: str = "manual"
+    id: int | None = None
+    fetched_at: str | None = None
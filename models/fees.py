@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class FeeProfile:
     profile_name: str = "eBay Standard (No Store)"
     platform: str = "eBay"
@@ -16,7 +16,7 @@ class FeeProfile:
     intl_fee_rate: float = 0.0165
 
 
-@dataclass
+@dataclass(slots=True)
 class ShippingOption:
     method_name: str = ""
     carrier: str = ""
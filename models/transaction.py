@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Purchase:
     card_id: str = ""
     purchase_date: str = ""
@@ -15,13 +15,15 @@ class Purchase:
     grading_tier: str = ""
     source: str = ""
     notes: str = ""
+    id: int | None = None
+    created_at: str | None = None
 
     @property
     def total_cost_basis(self) -> float:
         return self.purchase_price + self.sales_tax_paid + self.shipping_paid + self.grading_cost
 
 
-@dataclass
+@dataclass(slots=True)
 class Sale:
     card_id: str = ""
     sale_date: str = ""
@@ -32,3 +34,13 @@ class Sale:
     platform: str = "eBay"
     buyer_state: str = ""
     notes: str = ""
+    ebay_fvf_rate: float = 0.1325
+    ebay_fvf_amount: float | None = None
+    ebay_per_order_fee: float = 0.30
+    ebay_intl_fee_rate: float = 0.0
+    ebay_intl_fee_amount: float = 0.0
+    total_fees: float | None = None
+    net_proceeds: float | None = None
+    id: int | None = None
+    created_at: str | None = None
+    lot_id: int | None = None
@@ -0,0 +1,159 @@
+"""Inventory aging and turnover analytics.
+
+Every purchase lot (see database.tax_lots) is loaded once into numpy arrays,
+with acquisition and disposal dates parsed to integer day numbers, so holding
+periods, aging buckets and per-group rollups are whole-array operations instead
+of per-row date parsing. A lot is sold once a sale is matched to it; open lots
+age up to today, so a card sold and bought again counts its current lot as held. The arrays are cached per instance until the
+portfolio ledger or card statuses change, or the day rolls over.
+
+Capital turnover is annualized: cost of cards sold per year divided by the
+average capital held, i.e. sold cost basis * 365 / sum(cost basis * days held).
+"""
+
+import numpy as np
+
+DIMENSIONS = ("source", "sport", "graded", "purchase_month")
+# Unsold cards held this many days or more are stale: the last aging bucket
+STALE_DAYS = 91
+BUCKETS = ("0-30", f"31-{STALE_DAYS - 1}", f"{STALE_DAYS}+")
+_BUCKET_EDGES = [31, STALE_DAYS]
+
+# One row per lot with its own dates and adjusted cost, so earlier sold lots of
+# a re-bought card neither mark it sold nor inflate its cost
+_LOAD_SQL = """
+    SELECT c.card_id, c.description, c.status, COALESCE(p.source, ''), COALESCE(c.sport, ''),
+           c.is_graded, date(l.acquired_date), date(lm.disposed_date), COALESCE(l.cost_basis, 0)
+    FROM purchase_lots l
+    JOIN cards c ON c.card_id = l.card_id
+    JOIN purchases p ON p.id = l.lot_id
+    LEFT JOIN lot_matches lm ON lm.lot_id = l.lot_id
+"""
+
+_CACHE_TOKEN_SQL = """
+    SELECT
+        (SELECT total_invested || ':' || cards_purchased || ':' || total_revenue || ':' || cards_sold
+         FROM portfolio_totals WHERE id = 1),
+        (SELECT group_concat(status || '=' || card_count) FROM card_status_counts),
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(sale_id), 0) FROM lot_matches),
+        date('now', 'localtime')
+"""
+
+
+def _day_numbers(dates: list[str | None]) -> np.ndarray:
+    """ISO dates to days since 1970-01-01 as int64; missing or invalid dates become -1."""
+    parsed = np.array(dates, dtype="datetime64[D]")
+    return np.where(np.isnat(parsed), -1, parsed.astype(np.int64))
+
+
+class AgingAnalytics:
+    def __init__(self, conn):
+        self.conn = conn
+        self._cache: tuple[tuple, dict] | None = None
+
+    def _arrays(self) -> dict:
+        token = tuple(self.conn.execute(_CACHE_TOKEN_SQL).fetchone())
+        if self._cache is not None and self._cache[0] == token:
+            return self._cache[1]
+
+        rows = self.conn.execute(_LOAD_SQL).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 9
+        card_ids, descriptions, statuses, sources, sports, graded, bought, sold_on, cost = columns
+
+        today = int(np.datetime64(token[-1] or "today", "D").astype(np.int64))
+        purchase_day = _day_numbers(list(bought))
+        sale_day = _day_numbers(list(sold_on))
+        is_sold = sale_day >= 0
+        valid = purchase_day >= 0
+        end_day = np.where(is_sold, sale_day, today)
+        days_held = np.maximum(end_day - purchase_day, 0)
+
+        keep = np.flatnonzero(valid)
+        arrays = {
+            "card_id": np.array(card_ids, dtype=object)[keep],
+            "description": np.array(descriptions, dtype=object)[keep],
+            "status": np.array(statuses, dtype=object)[keep],
+            "source": np.array(sources, dtype=object)[keep],
+            "sport": np.array(sports, dtype=object)[keep],
+            "graded": np.where(np.array(graded, dtype=bool), "Graded", "Raw")[keep],
+            "purchase_month": np.datetime_as_string(
+                purchase_day[keep].astype("datetime64[D]").astype("datetime64[M]")
+            ),
+            "days_held": days_held[keep],
+            "is_sold": is_sold[keep],
+            "cost": np.array(cost, dtype=float)[keep],
+        }
+        arrays["bucket"] = np.digitize(arrays["days_held"], _BUCKET_EDGES)
+        self._cache = (token, arrays)
+        return arrays
+
+    def summary(self, by: str | None = None) -> list[dict]:
+        """Holding-period, sell-through and turnover metrics, overall or per group."""
+        if by is not None and by not in DIMENSIONS:
+            raise ValueError(f"Cannot group aging metrics by {by!r}; expected one of {DIMENSIONS}")
+        a = self._arrays()
+        if by is None:
+            keys, groups = np.array(["All"], dtype=object), np.zeros(len(a["cost"]), dtype=np.int64)
+        else:
+            keys, groups = np.unique(a[by].astype(str), return_inverse=True)
+        n = len(keys)
+
+        sold, held = a["is_sold"], ~a["is_sold"]
+        cards = np.bincount(groups, minlength=n)
+        sold_count = np.bincount(groups, weights=sold, minlength=n).astype(np.int64)
+        sold_cost = np.bincount(groups, weights=a["cost"] * sold, minlength=n)
+        held_cost = np.bincount(groups, weights=a["cost"] * held, minlength=n)
+        capital_days = np.bincount(groups, weights=a["cost"] * a["days_held"], minlength=n)
+        bucket_counts = np.zeros((n, len(BUCKETS)), dtype=np.int64)
+        np.add.at(bucket_counts, (groups[held], a["bucket"][held]), 1)
+
+        results = []
+        for i, key in enumerate(keys):
+            in_group = groups == i
+            sold_days = a["days_held"][in_group & sold]
+            held_days = a["days_held"][in_group & held]
+            results.append({
+                "group": str(key),
+                "cards": int(cards[i]),
+                "sold": int(sold_count[i]),
+                "sell_through_pct": (round(float(sold_count[i] / cards[i] * 100), 2)
+                                     if cards[i] else 0.0),
+                "median_days_to_sell": float(np.median(sold_days)) if len(sold_days) else None,
+                "p90_days_to_sell": float(np.percentile(sold_days, 90)) if len(sold_days) else None,
+                "median_days_held": float(np.median(held_days)) if len(held_days) else None,
+                "capital_held": round(float(held_cost[i]), 2),
+                "capital_turnover": (round(float(sold_cost[i] * 365 / capital_days[i]), 2)
+                                     if capital_days[i] > 0 else 0.0),
+                **{f"aged_{label}": int(bucket_counts[i, j]) for j, label in enumerate(BUCKETS)},
+            })
+        return results
+
+    def buckets(self) -> list[dict]:
+        """Unsold cards and their capital in each aging bucket."""
+        a = self._arrays()
+        held = ~a["is_sold"]
+        counts = np.bincount(a["bucket"][held], minlength=len(BUCKETS))
+        capital = np.bincount(a["bucket"][held], weights=a["cost"][held], minlength=len(BUCKETS))
+        return [
+            {"bucket": label, "cards": int(counts[j]), "capital": round(float(capital[j]), 2)}
+            for j, label in enumerate(BUCKETS)
+        ]
+
+    def stale_cards(self, min_days: int = STALE_DAYS, limit: int | None = 100) -> list[dict]:
+        """Unsold cards held at least min_days, most tied-up capital (cost x days) first."""
+        a = self._arrays()
+        idx = np.flatnonzero(~a["is_sold"] & (a["days_held"] >= min_days))
+        capital_days = a["cost"][idx] * a["days_held"][idx]
+        idx = idx[np.argsort(-capital_days, kind="stable")][:limit]
+        return [
+            {
+                "card_id": a["card_id"][i],
+                "description": a["description"][i],
+                "status": a["status"][i],
+                "source": a["source"][i],
+                "days_held": int(a["days_held"][i]),
+                "cost_basis": round(float(a["cost"][i]), 2),
+                "capital_days": round(float(a["cost"][i] * a["days_held"][i]), 2),
+            }
+            for i in idx
+        ]
@@ -6,6 +6,46 @@ def get_per_order_fee(sale_price: float, threshold: float = 10.0,
     return fee_low if sale_price <= threshold else fee_high
 
 
+def calculate_fees(
+    sale_price: float,
+    shipping_charged: float,
+    fvf_rate: float = 0.1325,
+    fvf_cap: float = 7500.0,
+    fvf_rate_above_cap: float = 0.0235,
+    per_order_fee: float | None = None,
+    per_order_threshold: float = 10.0,
+    per_order_fee_low: float = 0.30,
+    per_order_fee_high: float = 0.40,
+    is_international: bool = False,
+    intl_fee_rate: float = 0.0165,
+) -> tuple[float, float, float, float]:
+    """Unrounded (total_sale_amount, fvf_amount, per_order_fee, intl_fee) for one sale.
+
+    The single home of the eBay fee rules shared by calculate_profit() and
+    calculate_net_proceeds_batch().
+    """
+    total_sale_amount = sale_price + shipping_charged
+
+    # Tiered FVF
+    if total_sale_amount <= fvf_cap:
+        fvf_amount = total_sale_amount * fvf_rate
+    else:
+        fvf_amount = (fvf_cap * fvf_rate) + (
+            (total_sale_amount - fvf_cap) * fvf_rate_above_cap
+        )
+
+    # Per-order fee (auto-select if not provided)
+    if per_order_fee is None:
+        per_order_fee = get_per_order_fee(
+            sale_price, per_order_threshold, per_order_fee_low, per_order_fee_high
+        )
+
+    # International fee
+    intl_fee = total_sale_amount * intl_fee_rate if is_international else 0.0
+
+    return total_sale_amount, fvf_amount, per_order_fee, intl_fee
+
+
 def calculate_cost_basis(
     purchase_price: float,
     sales_tax_rate: float = 0.0625,
@@ -44,25 +84,11 @@ def calculate_profit(
     eBay FVF applies to total_sale_amount (item price + shipping charged).
     Payment processing is bundled into the FVF — no separate PayPal fee.
     """
-    total_sale_amount = sale_price + shipping_charged
-
-    # Tiered FVF
-    if total_sale_amount <= fvf_cap:
-        fvf_amount = total_sale_amount * fvf_rate
-    else:
-        fvf_amount = (fvf_cap * fvf_rate) + (
-            (total_sale_amount - fvf_cap) * fvf_rate_above_cap
-        )
-
-    # Per-order fee (auto-select if not provided)
-    if per_order_fee is None:
-        per_order_fee = get_per_order_fee(
-            sale_price, per_order_threshold, per_order_fee_low, per_order_fee_high
-        )
-
-    # International fee
-    intl_fee = total_sale_amount * intl_fee_rate if is_international else 0.0
-
+    total_sale_amount, fvf_amount, per_order_fee, intl_fee = calculate_fees(
+        sale_price, shipping_charged, fvf_rate, fvf_cap, fvf_rate_above_cap, per_order_fee,
+        per_order_threshold, per_order_fee_low, per_order_fee_high, is_international,
+        intl_fee_rate,
+    )
     total_fees = fvf_amount + per_order_fee + intl_fee
     net_proceeds = total_sale_amount - total_fees - shipping_cost
     net_profit = net_proceeds - cost_basis
@@ -84,3 +110,32 @@ def calculate_profit(
         "profit_margin_pct": round(profit_margin, 2),
         "roi_pct": round(roi, 2),
     }
+
+
+def calculate_net_proceeds_batch(
+    sale_prices: list[float],
+    shipping_charged: float = 0.0,
+    shipping_cost: float = 0.0,
+    fvf_rate: float = 0.1325,
+    fvf_cap: float = 7500.0,
+    fvf_rate_above_cap: float = 0.0235,
+    per_order_threshold: float = 10.0,
+    per_order_fee_low: float = 0.30,
+    per_order_fee_high: float = 0.40,
+    is_international: bool = False,
+    intl_fee_rate: float = 0.0165,
+) -> list[float]:
+    """Net proceeds for many sale prices under one fee profile.
+
+    Same fee rules as calculate_profit() via calculate_fees(), without building a
+    result dict per price.
+    """
+    results = []
+    for sale_price in sale_prices:
+        total, fvf, per_order, intl = calculate_fees(
+            sale_price, shipping_charged, fvf_rate, fvf_cap, fvf_rate_above_cap, None,
+            per_order_threshold, per_order_fee_low, per_order_fee_high, is_international,
+            intl_fee_rate,
+        )
+        results.append(round(total - (fvf + per_order + intl) - shipping_cost, 2))
+    return results
@@ -2,6 +2,7 @@
 
 import statistics
 from database.repository import CompRepository
+from models.comp import SoldComp
 
 
 class CompService:
@@ -35,7 +36,7 @@ class CompService:
                 "comps": [],
             }
 
-        prices = [c["sold_price"] for c in comps]
+        prices = [c.sold_price for c in comps]
         return {
             "count": len(prices),
             "median": round(statistics.median(prices), 2),
@@ -45,5 +46,5 @@ class CompService:
             "comps": comps,
         }
 
-    def get_all_comps(self) -> list[dict]:
+    def get_all_comps(self) -> list[SoldComp]:
         return self.repo.get_all()
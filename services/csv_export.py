@@ -1,118 +1,164 @@
-"""CSV export service for inventory, sales, and comps data."""
+"""Export service for inventory, sales, and comps data.
+
+Exports stream the cursor with fetchmany() in fixed-size chunks through a
+buffered file, so memory stays flat however many rows there are. After each
+chunk an optional progress callback receives (rows written, total rows), and an
+optional cancel event (anything with is_set(), e.g. threading.Event) stops the
+export. Rows go to a ".part" file that replaces the target only on success, so
+a cancelled or failed export never leaves a truncated file behind.
+
+The file format (CSV by default, or compressed CSV, JSON Lines, Parquet or
+Arrow; see services.export_formats) comes from the fmt argument or else the
+file extension.
+"""
 
-import csv
 import os
+from collections.abc import Callable
 from datetime import datetime
 
+from config.defaults import DEFAULT_EXPORT_CHUNK_SIZE
+from services.export_formats import format_for_path, get_format
+
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 
+ProgressCallback = Callable[[int, int | None], None]
+
+_EXPORTED_TABLES = ("cards", "purchases", "sales", "comps")
+
+# Computed or aliased export columns that no table declares
+_COMPUTED_TYPES = {"purchase_source": "TEXT", "net_profit": "REAL", "roi_pct": "REAL"}
+
+_INVENTORY_SQL = """
+    SELECT
+        c.card_id, c.description, c.player_name, c.year, c.set_name,
+        c.card_number, c.parallel, c.sport, c.is_graded, c.grading_company,
+        c.grade, c.status,
+        p.purchase_date, p.purchase_price, p.sales_tax_paid, p.shipping_paid,
+        p.grading_cost, p.total_cost_basis, p.source AS purchase_source,
+        s.sale_date, s.sale_price, s.shipping_charged, s.shipping_cost,
+        s.total_fees, s.net_proceeds, s.platform
+    FROM cards c
+    LEFT JOIN purchases p ON c.card_id = p.card_id
+    LEFT JOIN sales s ON c.card_id = s.card_id
+    ORDER BY c.created_at DESC
+"""
+
+# One row per sale: cost and profit come from the matched lot, which already
+# includes fees such as grading attached to it
+_SALES_SQL = """
+    SELECT
+        s.card_id, c.description, c.player_name, c.sport,
+        p.purchase_price, lm.cost_basis AS total_cost_basis,
+        s.sale_date, s.sale_price, s.shipping_charged, s.shipping_cost,
+        s.ebay_fvf_amount, s.ebay_per_order_fee, s.ebay_intl_fee_amount,
+        s.total_fees, s.net_proceeds,
+        ROUND(lm.gain, 2) AS net_profit,
+        CASE WHEN lm.cost_basis > 0
+             THEN ROUND(lm.gain / lm.cost_basis * 100, 2)
+             ELSE 0 END AS roi_pct,
+        s.platform
+    FROM sales s
+    JOIN cards c ON s.card_id = c.card_id
+    LEFT JOIN lot_matches lm ON lm.sale_id = s.id
+    LEFT JOIN purchases p ON p.id = lm.lot_id
+    ORDER BY s.sale_date DESC
+"""
+
+_COMPS_SQL = """
+    SELECT search_query, title, sold_price, shipping_price, sold_date,
+           condition, item_url, source, fetched_at
+    FROM comps
+    ORDER BY fetched_at DESC
+"""
+
+
+class ExportCancelled(Exception):
+    """Raised when an export's cancel event is set; no output file is left behind."""
+
 
 def _ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
-def export_inventory(conn, filepath=None) -> str:
-    """Export full inventory with purchase/sale details to CSV."""
+def _default_path(prefix: str, fmt: str | None) -> str:
     _ensure_data_dir()
-    if filepath is None:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(DATA_DIR, f"inventory_{ts}.csv")
-
-    cursor = conn.execute("""
-        SELECT
-            c.card_id, c.description, c.player_name, c.year, c.set_name,
-            c.card_number, c.parallel, c.sport, c.is_graded, c.grading_company,
-            c.grade, c.status,
-            p.purchase_date, p.purchase_price, p.sales_tax_paid, p.shipping_paid,
-            p.grading_cost, p.total_cost_basis, p.source AS purchase_source,
-            s.sale_date, s.sale_price, s.shipping_charged, s.shipping_cost,
-            s.total_fees, s.net_proceeds, s.platform
-        FROM cards c
-        LEFT JOIN purchases p ON c.card_id = p.card_id
-        LEFT JOIN sales s ON c.card_id = s.card_id
-        ORDER BY c.created_at DESC
-    """)
-
-    rows = cursor.fetchall()
-    if not rows:
-        return ""
-
-    headers = [desc[0] for desc in cursor.description]
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(DATA_DIR, f"{prefix}_{ts}.{fmt or 'csv'}")
 
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(list(row))
 
-    return filepath
+def _column_types(conn, columns: list[str]) -> list[str | None]:
+    """Declared SQLite type of each exported column, for the typed formats."""
+    declared = dict(_COMPUTED_TYPES)
+    for table in _EXPORTED_TABLES:
+        for row in conn.execute(f"PRAGMA table_xinfo({table})"):
+            declared.setdefault(row[1], row[2].upper() or None)
+    return [declared.get(name) for name in columns]
 
 
-def export_sales(conn, filepath=None) -> str:
-    """Export all sales with calculated profit to CSV."""
-    _ensure_data_dir()
-    if filepath is None:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(DATA_DIR, f"sales_{ts}.csv")
-
-    cursor = conn.execute("""
-        SELECT
-            s.card_id, c.description, c.player_name, c.sport,
-            p.purchase_price, p.total_cost_basis,
-            s.sale_date, s.sale_price, s.shipping_charged, s.shipping_cost,
-            s.ebay_fvf_amount, s.ebay_per_order_fee, s.ebay_intl_fee_amount,
-            s.total_fees, s.net_proceeds,
-            ROUND(s.net_proceeds - p.total_cost_basis, 2) AS net_profit,
-            CASE WHEN p.total_cost_basis > 0
-                 THEN ROUND((s.net_proceeds - p.total_cost_basis) / p.total_cost_basis * 100, 2)
-                 ELSE 0 END AS roi_pct,
-            s.platform
-        FROM sales s
-        JOIN cards c ON s.card_id = c.card_id
-        LEFT JOIN purchases p ON s.card_id = p.card_id
-        ORDER BY s.sale_date DESC
-    """)
-
-    rows = cursor.fetchall()
+def _write_export(conn, cursor, filepath: str, make_writer, progress: ProgressCallback | None = None,
+                  cancel=None, total: int | None = None,
+                  chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> str:
+    """Stream a cursor to filepath in chunks. Returns "" if it has no rows."""
+    rows = cursor.fetchmany(chunk_size)
     if not rows:
         return ""
 
-    headers = [desc[0] for desc in cursor.description]
-
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(list(row))
+    columns = [desc[0] for desc in cursor.description]
+    partial = f"{filepath}.part"
+    written = 0
+    try:
+        writer = make_writer(partial)
+        try:
+            writer.start(columns, _column_types(conn, columns))
+            while rows:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled(filepath)
+                writer.write(rows)
+                written += len(rows)
+                if progress is not None:
+                    progress(written, total)
+                rows = cursor.fetchmany(chunk_size)
+        finally:
+            writer.close()
+        os.replace(partial, filepath)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
 
     return filepath
 
 
-def export_comps(conn, filepath=None) -> str:
-    """Export all sold comps to CSV."""
-    _ensure_data_dir()
+def _export(conn, sql: str, prefix: str, filepath: str | None, fmt: str | None,
+            progress: ProgressCallback | None, cancel, chunk_size: int) -> str:
     if filepath is None:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(DATA_DIR, f"comps_{ts}.csv")
-
-    cursor = conn.execute("""
-        SELECT search_query, title, sold_price, shipping_price, sold_date,
-               condition, item_url, source, fetched_at
-        FROM comps
-        ORDER BY fetched_at DESC
-    """)
-
-    rows = cursor.fetchall()
-    if not rows:
-        return ""
-
-    headers = [desc[0] for desc in cursor.description]
-
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(list(row))
-
-    return filepath
+        filepath = _default_path(prefix, fmt)
+    make_writer = get_format(fmt or format_for_path(filepath))
+    # Counting costs a second pass, so only do it when someone shows progress
+    total = None
+    if progress is not None:
+        total = conn.execute(f"SELECT COUNT(*) FROM ({sql})").fetchone()[0]
+    return _write_export(conn, conn.execute(sql), filepath, make_writer, progress, cancel, total,
+                         chunk_size)
+
+
+def export_inventory(conn, filepath=None, progress: ProgressCallback | None = None,
+                     cancel=None, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+                     fmt: str | None = None) -> str:
+    """Export full inventory with purchase/sale details."""
+    return _export(conn, _INVENTORY_SQL, "inventory", filepath, fmt, progress, cancel, chunk_size)
+
+
+def export_sales(conn, filepath=None, progress: ProgressCallback | None = None,
+                 cancel=None, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+                 fmt: str | None = None) -> str:
+    """Export all sales with calculated profit."""
+    return _export(conn, _SALES_SQL, "sales", filepath, fmt, progress, cancel, chunk_size)
+
+
+def export_comps(conn, filepath=None, progress: ProgressCallback | None = None,
+                 cancel=None, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+                 fmt: str | None = None) -> str:
+    """Export all sold comps."""
+    return _export(conn, _COMPS_SQL, "comps", filepath, fmt, progress, cancel, chunk_size)
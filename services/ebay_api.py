@@ -2,7 +2,57 @@
 
 import base64
 import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_search_filter(
+    price_min: float | None = None,
+    price_max: float | None = None,
+    currency: str = "USD",
+    buying_options: list[str] | None = None,
+    conditions: list[str] | None = None,
+    condition_ids: list[str] | None = None,
+) -> str:
+    """Build the Browse API `filter` parameter, e.g. price:[10..50],priceCurrency:USD.
+
+    buying_options: FIXED_PRICE, AUCTION, BEST_OFFER
+    conditions: NEW, USED, UNSPECIFIED
+    """
+    parts = []
+    if price_min is not None or price_max is not None:
+        low = "" if price_min is None else f"{price_min:g}"
+        high = "" if price_max is None else f"{price_max:g}"
+        parts.append(f"price:[{low}..{high}]")
+        parts.append(f"priceCurrency:{currency}")
+    if buying_options:
+        parts.append("buyingOptions:{" + "|".join(buying_options) + "}")
+    if conditions:
+        parts.append("conditions:{" + "|".join(conditions) + "}")
+    if condition_ids:
+        parts.append("conditionIds:{" + "|".join(str(c) for c in condition_ids) + "}")
+    return ",".join(parts)
+
+
+def _parse_item_summary(item: dict) -> dict:
+    """Keep only the listing fields the app stores or displays."""
+    price_val = item.get("price") or {}
+    shipping = (item.get("shippingOptions") or [{}])[0].get("shippingCost") or {}
+    return {
+        "item_id": item.get("itemId", ""),
+        "title": item.get("title", ""),
+        "price": float(price_val.get("value", 0)),
+        "currency": price_val.get("currency", "USD"),
+        "shipping_cost": float(shipping["value"]) if "value" in shipping else None,
+        "condition": item.get("condition", ""),
+        "item_url": item.get("itemWebUrl", ""),
+        "image_url": (item.get("image") or {}).get("imageUrl", ""),
+        "seller": (item.get("seller") or {}).get("username", ""),
+        "buying_options": item.get("buyingOptions", []),
+        "end_time": item.get("itemEndDate"),
+    }
 
 
 class EbayApiClient:
@@ -14,20 +64,60 @@ class EbayApiClient:
     # Trading Cards category ID on eBay
     TRADING_CARDS_CATEGORY = "261328"
 
-    def __init__(self, client_id: str, client_secret: str, environment: str = "PRODUCTION"):
+    MARKETPLACE_ID = "EBAY_US"
+
+    # Browse API paging limits: 200 items per page, offset + limit <= 10,000
+    MAX_PAGE_SIZE = 200
+    MAX_RESULT_WINDOW = 10000
+
+    # getItems accepts at most 20 item IDs per call
+    MAX_ITEMS_PER_BATCH = 20
+
+    # Throttled and transient server errors are retried with backoff
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, client_id: str, client_secret: str, environment: str = "PRODUCTION",
+                 rate_limiter=None, quota_ledger=None, pool_size: int = 16,
+                 max_retries: int = 3, retry_backoff: float = 0.5):
+        """environment is PRODUCTION, SANDBOX, or a base URL such as
+        http://127.0.0.1:8765 for a local stand-in server."""
         self.client_id = client_id
         self.client_secret = client_secret
-        self.environment = environment.upper()
+        environment = environment.strip()
+        if environment.lower().startswith(("http://", "https://")):
+            self.environment = environment.rstrip("/")
+        else:
+            self.environment = environment.upper()
+        self.rate_limiter = rate_limiter
+        self.quota_ledger = quota_ledger
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self._token: str | None = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+        # One pooled session shared by all worker threads keeps connections alive
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def is_custom_host(self) -> bool:
+        return self.environment.startswith(("http://", "https://"))
 
     @property
     def auth_url(self) -> str:
+        if self.is_custom_host:
+            return f"{self.environment}/identity/v1/oauth2/token"
         if self.environment == "SANDBOX":
             return self.SANDBOX_AUTH_URL
         return self.PRODUCTION_AUTH_URL
 
     @property
     def browse_url(self) -> str:
+        if self.is_custom_host:
+            return f"{self.environment}/buy/browse/v1"
         if self.environment == "SANDBOX":
             return self.SANDBOX_BROWSE_URL
         return self.PRODUCTION_BROWSE_URL
@@ -38,7 +128,7 @@ class EbayApiClient:
             f"{self.client_id}:{self.client_secret}".encode()
         ).decode()
 
-        response = requests.post(
+        response = self._session.post(
             self.auth_url,
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -53,11 +143,100 @@ class EbayApiClient:
         response.raise_for_status()
         data = response.json()
         self._token = data["access_token"]
+        # Refresh a minute early so in-flight requests never carry an expired token
+        self._token_expires_at = time.monotonic() + int(data.get("expires_in", 7200)) - 60
         return self._token
 
     def _ensure_token(self):
-        if self._token is None:
-            self.get_app_token()
+        with self._token_lock:
+            if self._token is None or time.monotonic() >= self._token_expires_at:
+                self.get_app_token()
+
+    def _send(self, path: str, params: dict, headers: dict | None = None) -> requests.Response:
+        """GET a Browse API resource, honoring the rate limiter and daily quota.
+
+        One quota unit is charged per logical call; every attempt, including
+        retries of 429/5xx responses, waits for a rate-limiter token.
+        """
+        self._ensure_token()
+        if self.quota_ledger is not None:
+            self.quota_ledger.consume()
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = self._session.get(
+                f"{self.browse_url}{path}",
+                headers={
+                    "Authorization": f"Bearer {self._token}",
+                    "X-EBAY-C-MARKETPLACE-ID": self.MARKETPLACE_ID,
+                    "Content-Type": "application/json",
+                    **(headers or {}),
+                },
+                params=params,
+                timeout=15,
+            )
+            if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return self.retry_backoff * (2 ** attempt)
+
+    def _get(self, path: str, params: dict) -> dict:
+        response = self._send(path, params)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_items(
+        self,
+        query: str,
+        category_id: str | None = None,
+        sort: str = "price",
+        page_size: int = MAX_PAGE_SIZE,
+        max_items: int | None = None,
+        **filters,
+    ):
+        """Lazily yield parsed listings across every result page.
+
+        Pages are fetched one at a time as the caller consumes items, so a query that
+        matches thousands of listings never holds more than one page in memory.
+        `filters` are passed to build_search_filter and applied server-side.
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        params = {"q": query, "sort": sort}
+        if category_id:
+            params["category_ids"] = category_id
+        filter_expr = build_search_filter(**filters)
+        if filter_expr:
+            params["filter"] = filter_expr
+
+        offset = 0
+        yielded = 0
+        while offset < self.MAX_RESULT_WINDOW:
+            limit = min(page_size, self.MAX_RESULT_WINDOW - offset)
+            if max_items is not None:
+                if yielded >= max_items:
+                    return
+                limit = min(limit, max_items - yielded)
+            data = self._get("/item_summary/search", {**params, "limit": limit, "offset": offset})
+
+            summaries = data.get("itemSummaries", [])
+            for item in summaries:
+                yield _parse_item_summary(item)
+                yielded += 1
+
+            offset += len(summaries)
+            if not summaries or not data.get("next") or offset >= data.get("total", 0):
+                return
 
     def search_items(
         self,
@@ -65,51 +244,25 @@ class EbayApiClient:
         category_id: str | None = None,
         limit: int = 25,
         sort: str = "price",
+        **filters,
     ) -> list[dict]:
         """Search active eBay listings via Browse API.
 
         Note: This returns ACTIVE listings only, not sold/completed items.
         The Browse API does not support sold item data.
         """
-        self._ensure_token()
-
-        params = {
-            "q": query,
-            "limit": min(limit, 200),
-            "sort": sort,
-        }
-        if category_id:
-            params["category_ids"] = category_id
-
-        response = requests.get(
-            f"{self.browse_url}/item_summary/search",
-            headers={
-                "Authorization": f"Bearer {self._token}",
-                "X-EBAY-C-MARKETPLACE-ID": "EBAY_US",
-                "Content-Type": "application/json",
-            },
-            params=params,
-            timeout=15,
-        )
-        response.raise_for_status()
-        data = response.json()
+        return list(self.iter_items(
+            query, category_id, sort=sort, page_size=limit, max_items=limit, **filters,
+        ))
 
-        items = []
-        for item in data.get("itemSummaries", []):
-            price_val = item.get("price", {})
-            items.append({
-                "item_id": item.get("itemId", ""),
-                "title": item.get("title", ""),
-                "price": float(price_val.get("value", 0)),
-                "currency": price_val.get("currency", "USD"),
-                "condition": item.get("condition", ""),
-                "item_url": item.get("itemWebUrl", ""),
-                "image_url": item.get("image", {}).get("imageUrl", ""),
-                "seller": item.get("seller", {}).get("username", ""),
-                "buying_options": item.get("buyingOptions", []),
-            })
-
-        return items
+    def get_items(self, item_ids: list[str]) -> list[dict]:
+        """Fetch full item details for up to 20 item IDs in one getItems call."""
+        if len(item_ids) > self.MAX_ITEMS_PER_BATCH:
+            raise ValueError(f"getItems accepts at most {self.MAX_ITEMS_PER_BATCH} item IDs")
+        if not item_ids:
+            return []
+        data = self._get("/item/", {"item_ids": ",".join(item_ids)})
+        return data.get("items", [])
 
     def search_items_async(self, query: str, callback, category_id: str | None = None,
                            limit: int = 25, error_callback=None):
@@ -0,0 +1,259 @@
+"""Persistent SQLite response cache for eBay Browse API calls."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config.defaults import (
+    DEFAULT_EBAY_CACHE_STALE_SECONDS,
+    DEFAULT_EBAY_CACHE_TTL,
+    DEFAULT_EBAY_CACHE_TTLS,
+)
+from services.ebay_api import EbayApiClient
+
+_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "ebay_cache.db")
+
+_CACHE_TABLE = """
+    CREATE TABLE IF NOT EXISTS api_cache (
+        cache_key   TEXT PRIMARY KEY,
+        endpoint    TEXT NOT NULL,
+        params      TEXT NOT NULL,
+        marketplace TEXT NOT NULL,
+        etag        TEXT,
+        body        BLOB NOT NULL,
+        fetched_at  REAL NOT NULL,
+        expires_at  REAL NOT NULL
+    )
+"""
+
+
+def normalize_params(params: dict) -> list[list[str]]:
+    """Sort params and fold case/whitespace in the search text so equivalent queries share a key."""
+    normalized = []
+    for key, value in sorted(params.items()):
+        value = str(value)
+        if key == "q":
+            value = " ".join(value.lower().split())
+        normalized.append([key, value])
+    return normalized
+
+
+class ResponseCache:
+    """On-disk cache of Browse API JSON bodies keyed by (endpoint, params, marketplace).
+
+    Uses its own connection (in its own file by default) so any thread may read or
+    write it; access is serialized by a lock.
+    """
+
+    def __init__(self, path: str = _CACHE_PATH, ttls: dict | None = None,
+                 default_ttl: float = DEFAULT_EBAY_CACHE_TTL,
+                 stale_seconds: float = DEFAULT_EBAY_CACHE_STALE_SECONDS,
+                 clock=time.time):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_CACHE_TABLE)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.ttls = ttls if ttls is not None else DEFAULT_EBAY_CACHE_TTLS
+        self.default_ttl = default_ttl
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self._stats = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "coalesced", "not_modified", "revalidations"), 0
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict, marketplace: str) -> str:
+        raw = json.dumps([endpoint, normalize_params(params), marketplace], separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> float:
+        for prefix, ttl in self.ttls.items():
+            if endpoint.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, fetched_at, expires_at FROM api_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "body": json.loads(zlib.decompress(row[0])),
+            "etag": row[1],
+            "fetched_at": row[2],
+            "expires_at": row[3],
+        }
+
+    def store(self, key: str, endpoint: str, params: dict, marketplace: str,
+              body: dict, etag: str | None = None):
+        now = self.clock()
+        blob = zlib.compress(json.dumps(body, separators=(",", ":")).encode())
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO api_cache
+                    (cache_key, endpoint, params, marketplace, etag, body, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, endpoint, json.dumps(normalize_params(params)), marketplace, etag,
+                 blob, now, now + self.ttl_for(endpoint)),
+            )
+            self._conn.commit()
+
+    def touch(self, key: str, endpoint: str):
+        """Extend an entry's freshness after the server answered 304 Not Modified."""
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE api_cache SET fetched_at = ?, expires_at = ? WHERE cache_key = ?",
+                (now, now + self.ttl_for(endpoint), key),
+            )
+            self._conn.commit()
+
+    def purge(self) -> int:
+        """Delete entries too old to be served even as stale. Returns rows removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM api_cache WHERE expires_at + ? < ?",
+                (self.stale_seconds, self.clock()),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM api_cache")
+            self._conn.commit()
+
+    def record(self, event: str):
+        with self._lock:
+            self._stats[event] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        served = stats["hits"] + stats["stale_hits"]
+        stats["lookups"] = lookups
+        stats["hit_rate_pct"] = round(served / lookups * 100, 2) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: str, fn) -> tuple:
+        """Run fn() once per key at a time. Returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class CachedEbayApiClient(EbayApiClient):
+    """Drop-in EbayApiClient that serves Browse API GETs from a ResponseCache.
+
+    Fresh entries cost no network call or quota. Entries past their TTL but inside
+    the stale window are returned immediately while a background thread revalidates
+    them (with If-None-Match when an ETag is known). Identical concurrent misses
+    share a single request.
+    """
+
+    def __init__(self, *args, cache: ResponseCache | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache if cache is not None else ResponseCache()
+        self._flight = SingleFlight()
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+    def _get(self, path: str, params: dict) -> dict:
+        key = self.cache.make_key(path, params, self.MARKETPLACE_ID)
+        entry = self.cache.lookup(key)
+        if entry is not None:
+            now = self.cache.clock()
+            if now < entry["expires_at"]:
+                self.cache.record("hits")
+                return entry["body"]
+            if now < entry["expires_at"] + self.cache.stale_seconds:
+                self.cache.record("stale_hits")
+                self._revalidate_in_background(key, path, params, entry)
+                return entry["body"]
+
+        self.cache.record("misses")
+        body, shared = self._flight.do(key, lambda: self._fetch(key, path, params, entry))
+        if shared:
+            self.cache.record("coalesced")
+        return body
+
+    def _fetch(self, key: str, path: str, params: dict, entry: dict | None) -> dict:
+        headers = {"If-None-Match": entry["etag"]} if entry and entry["etag"] else None
+        response = self._send(path, params, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key, path)
+            self.cache.record("not_modified")
+            return entry["body"]
+        response.raise_for_status()
+        body = response.json()
+        self.cache.store(key, path, params, self.MARKETPLACE_ID, body, response.headers.get("ETag"))
+        return body
+
+    def _revalidate_in_background(self, key: str, path: str, params: dict, entry: dict):
+        if self._flight.in_flight(key):
+            return
+
+        def _worker():
+            try:
+                self._flight.do(key, lambda: self._fetch(key, path, params, entry))
+                self.cache.record("revalidations")
+            except Exception:
+                pass  # Keep serving the stale copy; the next lookup will retry
+
+        threading.Thread(target=_worker, daemon=True).start()
@@ -0,0 +1,103 @@
+"""Concurrent multi-query eBay search on a bounded thread pool."""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from services.ebay_api import EbayApiClient
+from services.ebay_cache import CachedEbayApiClient
+from services.rate_limiter import DailyQuotaLedger, QuotaExceededError, TokenBucket
+
+
+class ConcurrentSearchExecutor:
+    """Runs many Browse API searches in parallel and yields results as they complete.
+
+    Pacing and quota are enforced by the client's rate limiter and quota ledger, so
+    max_workers only bounds how many requests may be waiting on the network at once.
+    """
+
+    def __init__(self, client: EbayApiClient, max_workers: int = 8):
+        self.client = client
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_settings(cls, conn, settings, cache=None) -> "ConcurrentSearchExecutor":
+        """Build a rate-limited client and executor from the settings table.
+
+        Pass a ResponseCache to serve repeated searches without spending quota.
+        """
+        limiter = TokenBucket(
+            rate=settings.get_float("ebay_rate_limit_per_sec"),
+            capacity=int(settings.get_float("ebay_rate_limit_burst")),
+        )
+        ledger = DailyQuotaLedger(conn, int(settings.get_float("ebay_daily_call_limit")))
+        kwargs = {"rate_limiter": limiter, "quota_ledger": ledger}
+        client_cls = EbayApiClient
+        if cache is not None:
+            client_cls = CachedEbayApiClient
+            kwargs["cache"] = cache
+        client = client_cls(
+            settings.get("ebay_client_id"),
+            settings.get("ebay_client_secret"),
+            settings.get("ebay_environment", "PRODUCTION"),
+            **kwargs,
+        )
+        return cls(client, max_workers=int(settings.get_float("ebay_search_workers")))
+
+    def search_many(
+        self,
+        queries: Iterable[str],
+        category_id: str | None = None,
+        limit: int = 25,
+        sort: str = "price",
+    ) -> Iterator[dict]:
+        """Yield {"query", "items", "error"} for each query in completion order.
+
+        At most 2 * max_workers searches are queued at a time, so a list of thousands
+        of queries never materializes thousands of futures. Once the daily quota is
+        exhausted the remaining queries are yielded with an error instead of being sent.
+        """
+        pending_queries = iter(queries)
+        in_flight = {}
+        quota_exhausted = False
+        ledger = self.client.quota_ledger
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="ebay-search") as pool:
+
+            def submit_next() -> bool:
+                query = next(pending_queries, None)
+                if query is None:
+                    return False
+                future = pool.submit(self.client.search_items, query, category_id, limit, sort)
+                in_flight[future] = query
+                return True
+
+            while len(in_flight) < self.max_workers * 2 and submit_next():
+                pass
+
+            try:
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        query = in_flight.pop(future)
+                        try:
+                            result = {"query": query, "items": future.result(), "error": None}
+                        except QuotaExceededError as e:
+                            quota_exhausted = True
+                            result = {"query": query, "items": [], "error": str(e)}
+                        except Exception as e:
+                            result = {"query": query, "items": [], "error": str(e)}
+                        if ledger is not None:
+                            ledger.flush()
+                        yield result
+                        if not quota_exhausted:
+                            submit_next()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                if ledger is not None:
+                    ledger.flush()
+
+        if quota_exhausted:
+            for query in pending_queries:
+                yield {"query": query, "items": [], "error": "Daily eBay API quota exhausted"}
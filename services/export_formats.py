@@ -0,0 +1,200 @@
+"""Pluggable file formats for the streaming exporters.
+
+Every format is a writer with the same three calls: start(columns, types),
+write(rows) once per fetchmany() chunk, and close(). types are the columns'
+declared SQLite types (INTEGER, REAL, TEXT or None when computed); only the
+columnar formats use them. The cursor pipeline in csv_export never needs to know
+which format it is feeding.
+
+- csv, csv.gz, csv.zst: CSV text, optionally gzip or zstandard compressed
+- jsonl, jsonl.gz: one JSON object per row
+- parquet, arrow: typed columnar files; each chunk becomes one Parquet row group
+  or Arrow record batch
+
+zstandard and pyarrow are optional; formats needing a missing package are left
+out of available_formats().
+"""
+
+import abc
+import csv
+import gzip
+import io
+import json
+
+from config.defaults import DEFAULT_EXPORT_BUFFER_BYTES
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def _open_text(path: str, compression: str | None):
+    if compression == "gzip":
+        return gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=_GZIP_LEVEL)
+    if compression == "zstd":
+        raw = open(path, "wb")
+        stream = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).stream_writer(raw)
+        return io.TextIOWrapper(stream, newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8", buffering=DEFAULT_EXPORT_BUFFER_BYTES)
+
+
+class CsvFormat:
+    def __init__(self, path: str, compression: str | None = None):
+        self._file = _open_text(path, compression)
+        self._writer = csv.writer(self._file)
+
+    def start(self, columns: list[str], types: list[str | None] | None = None):
+        self._writer.writerow(columns)
+
+    def write(self, rows: list):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesFormat:
+    def __init__(self, path: str, compression: str | None = None):
+        self._file = _open_text(path, compression)
+        self._columns: list[str] = []
+
+    def start(self, columns: list[str], types: list[str | None] | None = None):
+        self._columns = columns
+
+    def write(self, rows: list):
+        columns = self._columns
+        self._file.write("".join(
+            json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n" for row in rows
+        ))
+
+    def close(self):
+        self._file.close()
+
+
+def _arrow_type(declared: str | None, values) -> str:
+    """Arrow type name ("int64", "float64" or "string") for a column; needs no pyarrow."""
+    if declared == "INTEGER":
+        return "int64"
+    if declared == "REAL":
+        return "float64"
+    if declared == "TEXT":
+        return "string"
+    # Undeclared (computed) column: infer from the first chunk's values
+    kinds = {type(v) for v in values if v is not None}
+    if kinds and kinds <= {int, bool}:
+        return "int64"
+    if kinds and kinds <= {int, bool, float}:
+        return "float64"
+    return "string"
+
+
+def _schema_fields(columns: list[str], types: list[str | None], data: list) -> list[tuple[str, str]]:
+    """(column, Arrow type name) pairs for the first chunk's column-wise data."""
+    return [(name, _arrow_type(declared, values)) for name, declared, values in zip(columns, types, data)]
+
+
+class _ArrowFormat(abc.ABC):
+    """Typed record batches; the schema is fixed when the first chunk arrives."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._columns: list[str] = []
+        self._types: list[str | None] = []
+        self._schema = None
+
+    def start(self, columns: list[str], types: list[str | None] | None = None):
+        self._columns = columns
+        self._types = types or [None] * len(columns)
+
+    def _batch(self, rows: list) -> "pa.RecordBatch":
+        data = list(zip(*rows))
+        if self._schema is None:
+            # Type names match pyarrow's factories: pa.int64(), pa.float64(), pa.string()
+            self._schema = pa.schema([
+                (name, getattr(pa, type_name)())
+                for name, type_name in _schema_fields(self._columns, self._types, data)
+            ])
+            self._open(self._schema)
+        arrays = []
+        for values, f in zip(data, self._schema):
+            if pa.types.is_string(f.type):
+                values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+            arrays.append(pa.array(values, type=f.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+    @abc.abstractmethod
+    def _open(self, schema):
+        """Create the underlying file writer for the fixed schema."""
+
+
+class ParquetFormat(_ArrowFormat):
+    def _open(self, schema):
+        self._writer = pq.ParquetWriter(self._path, schema, compression="zstd")
+
+    def write(self, rows: list):
+        # One row group per chunk keeps the writer's memory bounded by the chunk size
+        batch = self._batch(rows)
+        self._writer.write_table(pa.Table.from_batches([batch]), row_group_size=len(rows))
+
+    def close(self):
+        if self._schema is not None:
+            self._writer.close()
+
+
+class ArrowFormat(_ArrowFormat):
+    def _open(self, schema):
+        self._writer = pa.ipc.new_file(self._path, schema)
+
+    def write(self, rows: list):
+        batch = self._batch(rows)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._schema is not None:
+            self._writer.close()
+
+
+# Name -> (writer factory, available)
+FORMATS = {
+    "csv": (lambda path: CsvFormat(path), True),
+    "csv.gz": (lambda path: CsvFormat(path, "gzip"), True),
+    "csv.zst": (lambda path: CsvFormat(path, "zstd"), HAS_ZSTD),
+    "jsonl": (lambda path: JsonLinesFormat(path), True),
+    "jsonl.gz": (lambda path: JsonLinesFormat(path, "gzip"), True),
+    "parquet": (lambda path: ParquetFormat(path), HAS_PYARROW),
+    "arrow": (lambda path: ArrowFormat(path), HAS_PYARROW),
+}
+
+
+def available_formats() -> list[str]:
+    return [name for name, (_factory, available) in FORMATS.items() if available]
+
+
+def format_for_path(path: str) -> str:
+    """The format named by a file's extension (".csv.gz" -> "csv.gz"); plain CSV otherwise."""
+    lower = path.lower()
+    matches = [name for name in FORMATS if lower.endswith("." + name)]
+    return max(matches, key=len) if matches else "csv"
+
+
+def get_format(fmt: str):
+    """Writer factory (path -> writer) for a format name; ValueError if unknown or unavailable."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {tuple(FORMATS)}")
+    factory, available = FORMATS[fmt]
+    if not available:
+        package = "zstandard" if fmt.endswith("zst") else "pyarrow"
+        raise ValueError(f"Export format {fmt!r} needs the optional {package} package")
+    return factory
@@ -0,0 +1,156 @@
+"""Background export jobs, kept off the Tk main loop.
+
+Submitted exports queue up and run one at a time on a worker thread, each on a
+pooled read-only connection, so the window stays responsive however large the
+export. The worker never touches Tk: progress and completion are queued as
+events, and the GUI drains them on its own thread by calling poll() from an
+after() loop. Cancelling a job stops it at the next chunk boundary (or before
+it starts) and leaves no output file.
+"""
+
+import queue
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from database.connection import ConnectionManager
+from services.csv_export import ExportCancelled, export_comps, export_inventory, export_sales
+
+EXPORTERS = {
+    "inventory": export_inventory,
+    "sales": export_sales,
+    "comps": export_comps,
+}
+
+# Terminal states; "empty" means the query returned no rows and no file was written
+FINISHED = ("done", "empty", "cancelled", "failed")
+
+
+@dataclass(slots=True)
+class ExportJob:
+    id: int
+    kind: str
+    filepath: str
+    status: str = "queued"
+    rows_written: int = 0
+    total_rows: int | None = None
+    error: str | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def progress_pct(self) -> float | None:
+        if not self.total_rows:
+            return None
+        return round(self.rows_written / self.total_rows * 100, 1)
+
+
+class ExportJobRunner:
+    def __init__(self, db: ConnectionManager | str,
+                 on_update: Callable[[ExportJob], None] | None = None):
+        if not isinstance(db, ConnectionManager):
+            db = ConnectionManager(db)
+        self.db = db
+        self.on_update = on_update
+
+        self._jobs: dict[int, ExportJob] = {}
+        self._next_id = 1
+        self._pending: queue.Queue = queue.Queue()
+        self._events: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ── Main-thread API ─────────────────────────────────────────────
+
+    def submit(self, kind: str, filepath: str) -> ExportJob:
+        """Queue an export of `kind` (inventory, sales or comps) to filepath."""
+        if kind not in EXPORTERS:
+            raise ValueError(f"Unknown export {kind!r}; expected one of {tuple(EXPORTERS)}")
+        with self._lock:
+            job = ExportJob(self._next_id, kind, filepath)
+            self._jobs[job.id] = job
+            self._next_id += 1
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="export-worker",
+                                                daemon=True)
+                self._thread.start()
+        self._pending.put(job)
+        return job
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+
+    def active_jobs(self) -> list[ExportJob]:
+        """Queued and running jobs in submission order."""
+        return [job for job in self._jobs.values() if not job.finished]
+
+    def poll(self) -> list[ExportJob]:
+        """Apply queued worker events on the calling thread. Returns the jobs that changed.
+
+        Finished jobs are reported once and then forgotten.
+        """
+        changed = {}
+        while True:
+            try:
+                job_id, updates = self._events.get_nowait()
+            except queue.Empty:
+                break
+            job = self._jobs[job_id]
+            for name, value in updates.items():
+                setattr(job, name, value)
+            changed[job_id] = job
+        for job in changed.values():
+            if job.finished:
+                self._jobs.pop(job.id, None)
+            if self.on_update is not None:
+                self.on_update(job)
+        return list(changed.values())
+
+    def stop(self, timeout: float | None = 10.0):
+        """Cancel every outstanding job and wait for the worker to exit."""
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._stop.set()
+        self._pending.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ── Worker thread ───────────────────────────────────────────────
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self._pending.get()
+            if job is None:
+                continue
+            self._execute(job)
+
+    def _emit(self, job: ExportJob, **updates):
+        self._events.put((job.id, updates))
+
+    def _execute(self, job: ExportJob):
+        if job.cancel_event.is_set():
+            self._emit(job, status="cancelled")
+            return
+        self._emit(job, status="running")
+
+        def progress(done, total):
+            self._emit(job, rows_written=done, total_rows=total)
+
+        try:
+            with self.db.read() as conn:
+                result = EXPORTERS[job.kind](conn, job.filepath, progress=progress,
+                                             cancel=job.cancel_event)
+        except ExportCancelled:
+            self._emit(job, status="cancelled")
+        except Exception as exc:
+            self._emit(job, status="failed", error=str(exc))
+        else:
+            self._emit(job, status="done" if result else "empty")
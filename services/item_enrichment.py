@@ -0,0 +1,158 @@
+"""Bulk item-detail enrichment via batched Browse API getItems calls."""
+
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config.defaults import DEFAULT_ITEM_DETAIL_TTL
+
+# eBay "Professional Grader" aspect values mapped to the short names used elsewhere
+_GRADER_NAMES = {
+    "PSA": ("PSA", "PROFESSIONAL SPORTS AUTHENTICATOR"),
+    "BGS": ("BGS", "BECKETT"),
+    "SGC": ("SGC", "SPORTSCARD GUARANTY"),
+    "CGC": ("CGC", "CERTIFIED GUARANTY"),
+}
+
+_SERIAL = re.compile(r"(\d+\s*/\s*\d+|/\s*\d+)")
+_YEAR = re.compile(r"(19|20)\d{2}")
+
+_DETAIL_COLUMNS = (
+    "item_id", "title", "grader", "grade", "serial_number", "player_name", "year",
+    "set_name", "card_number", "parallel", "shipping_cost", "aspects",
+)
+
+
+def _normalize_grader(value: str | None) -> str | None:
+    if not value:
+        return None
+    upper = value.upper()
+    for short, needles in _GRADER_NAMES.items():
+        if any(n in upper for n in needles):
+            return short
+    return value
+
+
+def parse_item_specifics(item: dict) -> dict:
+    """Pull grading, serial numbering and shipping out of a getItems item."""
+    aspects = {a.get("name", ""): a.get("value", "") for a in item.get("localizedAspects", [])}
+
+    serial = aspects.get("Print Run") or aspects.get("Serial Number")
+    if not serial:
+        match = _SERIAL.search(item.get("title", ""))
+        serial = match.group(1).replace(" ", "") if match else None
+
+    year = None
+    year_match = _YEAR.search(aspects.get("Season") or aspects.get("Year Manufactured") or "")
+    if year_match:
+        year = int(year_match.group(0))
+
+    shipping = (item.get("shippingOptions") or [{}])[0].get("shippingCost") or {}
+
+    return {
+        "item_id": item.get("itemId", ""),
+        "title": item.get("title", ""),
+        "grader": _normalize_grader(aspects.get("Professional Grader")),
+        "grade": aspects.get("Grade"),
+        "serial_number": serial,
+        "player_name": aspects.get("Player/Athlete") or aspects.get("Player"),
+        "year": year,
+        "set_name": aspects.get("Set"),
+        "card_number": aspects.get("Card Number"),
+        "parallel": aspects.get("Parallel/Variety"),
+        "shipping_cost": float(shipping["value"]) if "value" in shipping else None,
+        "aspects": aspects,
+    }
+
+
+class ItemEnricher:
+    """Fetches and caches parsed item specifics by itemId.
+
+    Missing or expired IDs are grouped into getItems batches of 20 and fetched on a
+    thread pool; the client's rate limiter and quota ledger pace the batches. All
+    database reads and writes happen on the calling thread.
+    """
+
+    def __init__(self, client, conn, ttl: float = DEFAULT_ITEM_DETAIL_TTL,
+                 max_workers: int = 4, clock=time.time):
+        self.client = client
+        self._conn = conn
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._clock = clock
+
+    def get_cached(self, item_ids: list[str]) -> dict[str, dict]:
+        """Return unexpired cached specifics for the given IDs."""
+        found = {}
+        cutoff = self._clock() - self.ttl
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._conn.execute(
+                f"""
+                SELECT {", ".join(_DETAIL_COLUMNS)} FROM item_details
+                WHERE item_id IN ({placeholders}) AND fetched_at >= ?
+                """,
+                (*chunk, cutoff),
+            )
+            for row in cursor:
+                details = dict(zip(_DETAIL_COLUMNS, row))
+                details["aspects"] = json.loads(details["aspects"] or "{}")
+                found[details["item_id"]] = details
+        return found
+
+    def enrich(self, item_ids: list[str]) -> dict[str, dict]:
+        """Return specifics for every ID that eBay still knows about.
+
+        IDs whose batch fails are left out of the result so they are retried on
+        the next call.
+        """
+        unique_ids = list(dict.fromkeys(i for i in item_ids if i))
+        results = self.get_cached(unique_ids)
+        missing = [i for i in unique_ids if i not in results]
+        if not missing:
+            return results
+
+        size = self.client.MAX_ITEMS_PER_BATCH
+        batches = [missing[i:i + size] for i in range(0, len(missing), size)]
+        fetched = []
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="ebay-enrich") as pool:
+            futures = [pool.submit(self.client.get_items, batch) for batch in batches]
+            for future in as_completed(futures):
+                try:
+                    items = future.result()
+                except Exception:
+                    continue
+                fetched.extend(parse_item_specifics(item) for item in items)
+
+        self._store(fetched)
+        if self.client.quota_ledger is not None:
+            self.client.quota_ledger.flush()
+        results.update({d["item_id"]: d for d in fetched})
+        return results
+
+    def enrich_listings(self, listings: list[dict]) -> list[dict]:
+        """Attach a "specifics" dict to each listing from search_items/iter_items."""
+        details = self.enrich([listing["item_id"] for listing in listings])
+        for listing in listings:
+            listing["specifics"] = details.get(listing["item_id"])
+        return listings
+
+    def _store(self, details: list[dict]):
+        if not details:
+            return
+        now = self._clock()
+        self._conn.executemany(
+            f"""
+            INSERT OR REPLACE INTO item_details ({", ".join(_DETAIL_COLUMNS)}, fetched_at)
+            VALUES ({", ".join("?" * (len(_DETAIL_COLUMNS) + 1))})
+            """,
+            [
+                (*(d[c] for c in _DETAIL_COLUMNS[:-1]), json.dumps(d["aspects"]), now)
+                for d in details
+            ],
+        )
+        self._conn.commit()
@@ -0,0 +1,239 @@
+"""Active-listing watchlist with snapshot diffing and inferred-sold detection.
+
+The Browse API exposes no sold data, so each tracked query is polled and compared
+against the last known set of listings. Only the differences are written: new
+listings, price changes, and listings that disappeared. A listing that vanishes
+before its scheduled end time was most likely bought, so it is recorded as an
+"inferred" comp along with a confidence score.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from services.ebay_api import EbayApiClient
+
+# Base likelihood that a listing which vanished early was actually sold
+_FIXED_PRICE_CONFIDENCE = 0.75
+_AUCTION_CONFIDENCE = 0.35  # Early-ended auctions are often seller cancellations
+_BEST_OFFER_BONUS = 0.10
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def diff_snapshots(previous: dict, current: dict) -> tuple[set, set, set]:
+    """Hash-join two {item_id: price} maps. Returns (listed, delisted, price_changed) IDs."""
+    previous_ids = previous.keys()
+    current_ids = current.keys()
+    listed = current_ids - previous_ids
+    delisted = previous_ids - current_ids
+    changed = {i for i in current_ids & previous_ids if current[i] != previous[i]}
+    return listed, delisted, changed
+
+
+def inferred_sale_confidence(buying_options: list[str], end_time: str | None,
+                             seen_at: str) -> float | None:
+    """Confidence that a vanished listing sold, or None if it simply reached its end time."""
+    end = _parse_time(end_time)
+    if end is not None and _parse_time(seen_at) >= end:
+        return None
+    options = set(buying_options or [])
+    confidence = _FIXED_PRICE_CONFIDENCE if "FIXED_PRICE" in options else _AUCTION_CONFIDENCE
+    if "BEST_OFFER" in options:
+        confidence += _BEST_OFFER_BONUS
+    return round(min(confidence, 0.95), 2)
+
+
+class ListingTracker:
+    def __init__(self, conn, client: EbayApiClient, category_id: str | None = None,
+                 max_items: int | None = None, clock=_utc_now):
+        self._conn = conn
+        self.client = client
+        self.category_id = category_id or EbayApiClient.TRADING_CARDS_CATEGORY
+        self.max_items = max_items
+        self._clock = clock
+
+    # ── Watchlist ───────────────────────────────────────────────────
+
+    def watch(self, query: str, **filters) -> int:
+        """Track a query (with optional build_search_filter kwargs). Returns its watch id."""
+        filters_json = json.dumps(filters, sort_keys=True)
+        self._conn.execute(
+            """
+            INSERT INTO watch_queries (search_query, filters) VALUES (?, ?)
+            ON CONFLICT(search_query, filters) DO UPDATE SET is_active = 1
+            """,
+            (query, filters_json),
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT id FROM watch_queries WHERE search_query = ? AND filters = ?",
+            (query, filters_json),
+        ).fetchone()
+        return row[0]
+
+    def unwatch(self, watch_id: int):
+        self._conn.execute("UPDATE watch_queries SET is_active = 0 WHERE id = ?", (watch_id,))
+        self._conn.commit()
+
+    def get_watches(self) -> list[dict]:
+        cursor = self._conn.execute(
+            "SELECT * FROM watch_queries WHERE is_active = 1 ORDER BY search_query"
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    # ── Polling ─────────────────────────────────────────────────────
+
+    def _fetch(self, watch: dict) -> tuple[dict[str, dict], bool]:
+        """Return current listings by item_id and whether the result set is complete."""
+        filters = json.loads(watch["filters"])
+        current = {}
+        for item in self.client.iter_items(watch["search_query"], self.category_id,
+                                           max_items=self.max_items, **filters):
+            current[item["item_id"]] = item
+        limit = self.max_items or EbayApiClient.MAX_RESULT_WINDOW
+        return current, len(current) < limit
+
+    def poll(self, watch_id: int) -> dict:
+        watch = dict(self._conn.execute(
+            "SELECT * FROM watch_queries WHERE id = ?", (watch_id,)
+        ).fetchone())
+        current, complete = self._fetch(watch)
+        return self._apply(watch, current, complete)
+
+    def poll_all(self, max_workers: int = 4) -> dict:
+        """Fetch every active watch concurrently, then diff each on this thread."""
+        watches = self.get_watches()
+        totals = {"watches": 0, "errors": 0, "listed": 0, "price_changed": 0,
+                  "delisted": 0, "inferred_sold": 0}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ebay-watch") as pool:
+            fetches = [(w, pool.submit(self._fetch, w)) for w in watches]
+            for watch, future in fetches:
+                try:
+                    current, complete = future.result()
+                except Exception:
+                    totals["errors"] += 1
+                    continue
+                summary = self._apply(watch, current, complete)
+                totals["watches"] += 1
+                for key, count in summary.items():
+                    totals[key] += count
+        if self.client.quota_ledger is not None:
+            self.client.quota_ledger.flush()
+        return totals
+
+    def _apply(self, watch: dict, current: dict[str, dict], complete: bool) -> dict:
+        watch_id = watch["id"]
+        seen_at = self._clock()
+        previous = {
+            row[0]: row
+            for row in self._conn.execute(
+                """
+                SELECT item_id, price, end_time, buying_options, title, condition,
+                       item_url, shipping_cost
+                FROM listing_snapshots WHERE watch_id = ?
+                """,
+                (watch_id,),
+            )
+        }
+        listed, delisted, changed = diff_snapshots(
+            {item_id: row[1] for item_id, row in previous.items()},
+            {item_id: item["price"] for item_id, item in current.items()},
+        )
+        if not complete:
+            # A truncated result set can't prove a listing is gone
+            delisted = set()
+
+        self._conn.executemany(
+            """
+            INSERT INTO listing_snapshots (watch_id, item_id, price, shipping_cost, end_time,
+                buying_options, title, condition, item_url, first_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (watch_id, i, current[i]["price"], current[i].get("shipping_cost"),
+                 current[i].get("end_time"), ",".join(current[i].get("buying_options", [])),
+                 current[i].get("title"), current[i].get("condition"),
+                 current[i].get("item_url"), seen_at)
+                for i in listed
+            ],
+        )
+        self._conn.executemany(
+            "UPDATE listing_snapshots SET price = ? WHERE watch_id = ? AND item_id = ?",
+            [(current[i]["price"], watch_id, i) for i in changed],
+        )
+
+        events = [(watch_id, i, "listed", current[i]["price"], None, None, None, seen_at)
+                  for i in listed]
+        events += [(watch_id, i, "price_changed", current[i]["price"], previous[i][1],
+                    None, None, seen_at) for i in changed]
+
+        inferred = 0
+        for item_id in delisted:
+            _, price, end_time, buying_options, title, condition, item_url, shipping = previous[item_id]
+            confidence = inferred_sale_confidence(
+                buying_options.split(",") if buying_options else [], end_time, seen_at
+            )
+            comp_id = None
+            if confidence is not None:
+                cursor = self._conn.execute(
+                    """
+                    INSERT INTO comps (search_query, title, sold_price, shipping_price,
+                        sold_date, condition, item_url, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 'inferred')
+                    """,
+                    (watch["search_query"], title or item_id, price, shipping or 0.0,
+                     seen_at[:10], condition, item_url),
+                )
+                comp_id = cursor.lastrowid
+                inferred += 1
+            events.append((watch_id, item_id, "delisted", price, None, confidence, comp_id,
+                           seen_at))
+
+        self._conn.executemany(
+            "DELETE FROM listing_snapshots WHERE watch_id = ? AND item_id = ?",
+            [(watch_id, i) for i in delisted],
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO listing_events (watch_id, item_id, event, price, previous_price,
+                confidence, comp_id, seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            events,
+        )
+        self._conn.execute(
+            "UPDATE watch_queries SET last_polled_at = ? WHERE id = ?", (seen_at, watch_id)
+        )
+        self._conn.commit()
+
+        return {
+            "listed": len(listed),
+            "price_changed": len(changed),
+            "delisted": len(delisted),
+            "inferred_sold": inferred,
+        }
+
+    def get_inferred_sales(self, watch_id: int | None = None, min_confidence: float = 0.0) -> list[dict]:
+        query = """
+            SELECT e.item_id, e.price, e.confidence, e.seen_at, c.id AS comp_id, c.title,
+                   w.search_query
+            FROM listing_events e
+            JOIN comps c ON c.id = e.comp_id
+            JOIN watch_queries w ON w.id = e.watch_id
+            WHERE e.event = 'delisted' AND e.confidence >= ?
+        """
+        params: list = [min_confidence]
+        if watch_id is not None:
+            query += " AND e.watch_id = ?"
+            params.append(watch_id)
+        cursor = self._conn.execute(query + " ORDER BY e.seen_at DESC", params)
+        return [dict(row) for row in cursor.fetchall()]
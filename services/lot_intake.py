@@ -0,0 +1,106 @@
+"""Lot intake: one bulk purchase split into individual cards.
+
+A lot's price, sales tax and shipping are each allocated across its cards by
+weight, working in integer cents. Every card first gets the floor of its exact
+share, then the leftover cents go one each to the largest fractional remainders
+(largest-remainder method), so each component sums to the lot total exactly.
+
+Weights come from recent comp medians per card description ("market"), an equal
+split, or caller-supplied values ("manual"). In market mode, cards without comps
+are weighted at the median of the valued cards; with no comps at all the lot is
+split equally.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from database.profiles import use_profile
+from database.repository import CardRepository, PurchaseRepository
+from database.unit_of_work import unit_of_work
+from services.valuation import ValuationService
+
+METHODS = ("market", "equal", "manual")
+
+
+def allocate_cents(total: float, weights: Sequence[float]) -> list[float]:
+    """Split total across weights to the cent; the parts always sum to round(total, 2)."""
+    w = np.asarray(weights, dtype=np.float64)
+    if w.size == 0:
+        raise ValueError("Cannot allocate across zero cards")
+    if np.any(w < 0) or not np.all(np.isfinite(w)):
+        raise ValueError("Allocation weights must be finite and non-negative")
+    if w.sum() <= 0:
+        w = np.ones_like(w)
+
+    cents = round(total * 100)
+    exact = cents * w / w.sum()
+    parts = np.floor(exact).astype(np.int64)
+    leftover = cents - int(parts.sum())
+    if leftover:
+        # Stable sort keeps ties in card order
+        order = np.argsort(-(exact - parts), kind="stable")
+        parts[order[:leftover]] += 1
+    return (parts / 100).tolist()
+
+
+class LotIntake:
+    def __init__(self, conn, days: int = 90):
+        self.conn = conn
+        self.valuation = ValuationService(conn, days)
+        self.cards = CardRepository(conn)
+        self.purchases = PurchaseRepository(conn)
+
+    def weights(self, cards: list[dict], method: str = "market",
+                manual_weights: Sequence[float] | None = None) -> list[float]:
+        """Allocation weight per card for the given method."""
+        if method not in METHODS:
+            raise ValueError(f"Unknown allocation method {method!r}; expected one of {METHODS}")
+        if method == "equal":
+            return [1.0] * len(cards)
+        if method == "manual":
+            if manual_weights is None or len(manual_weights) != len(cards):
+                raise ValueError("Manual allocation needs one weight per card")
+            return [float(w) for w in manual_weights]
+
+        keys = [c["description"].strip().lower() for c in cards]
+        medians = self.valuation.estimate_by_description(keys)
+        known = [medians[k] for k in keys if k in medians]
+        fallback = float(np.median(known)) if known else 1.0
+        return [medians.get(k, fallback) for k in keys]
+
+    def plan(self, cards: list[dict], purchase_price: float, sales_tax_paid: float = 0.0,
+             shipping_paid: float = 0.0, method: str = "market",
+             manual_weights: Sequence[float] | None = None) -> list[dict]:
+        """Per-card weight and allocated price, tax and shipping, without writing anything."""
+        weights = self.weights(cards, method, manual_weights)
+        prices = allocate_cents(purchase_price, weights)
+        taxes = allocate_cents(sales_tax_paid, weights)
+        shipping = allocate_cents(shipping_paid, weights)
+        return [
+            {"weight": w, "purchase_price": p, "sales_tax_paid": t, "shipping_paid": s}
+            for w, p, t, s in zip(weights, prices, taxes, shipping)
+        ]
+
+    def intake(self, cards: list[dict], purchase_price: float, purchase_date: str,
+               sales_tax_paid: float = 0.0, shipping_paid: float = 0.0,
+               source: str | None = None, notes: str | None = None, method: str = "market",
+               manual_weights: Sequence[float] | None = None) -> list[str]:
+        """Create every card and its allocated purchase in one bulk transaction. Returns card_ids."""
+        allocations = self.plan(cards, purchase_price, sales_tax_paid, shipping_paid,
+                                method, manual_weights)
+        with use_profile(self.conn, "bulk-import"), unit_of_work(self.conn):
+            card_ids = self.cards.add_many(cards)
+            self.purchases.add_many([
+                {
+                    "card_id": card_id,
+                    "purchase_date": purchase_date,
+                    "purchase_price": a["purchase_price"],
+                    "sales_tax_paid": a["sales_tax_paid"],
+                    "shipping_paid": a["shipping_paid"],
+                    "source": source,
+                    "notes": notes,
+                }
+                for card_id, a in zip(card_ids, allocations)
+            ])
+        return card_ids
@@ -0,0 +1,207 @@
+"""Multi-dimensional realized P&L cube.
+
+Every lot match (a sale joined to its card, purchase lot and platform) is
+dictionary-encoded: each dimension value becomes a small integer code, and sales
+sharing all eight codes collapse into one cell of summed measures. Group-bys over
+any combination of dimensions, with optional filters, then run as numpy
+reductions over the cells rather than SQL over every sale.
+
+Query results are cached as per-group sums. When new sales arrive, only their
+facts are read and added to their cells and to the matching groups of each
+cached result. Edits or deletions of existing sales are detected from the
+ledger's sale count and totals per platform and month, so changing a sale's
+price, date or platform triggers a full rebuild. Renaming a sold card's sport,
+player or set needs an explicit invalidate().
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+DIMENSIONS = ("sport", "player", "set", "year", "grading_company", "source", "platform", "month")
+MEASURES = ("sales", "revenue", "fees", "net_proceeds", "cost_basis", "profit")
+
+_FACTS_SQL = """
+    SELECT lm.sale_id,
+           COALESCE(c.sport, ''), COALESCE(c.player_name, ''), COALESCE(c.set_name, ''),
+           COALESCE(CAST(c.year AS TEXT), ''), COALESCE(c.grading_company, ''),
+           COALESCE(p.source, ''), COALESCE(s.platform, ''),
+           COALESCE(strftime('%Y-%m', lm.disposed_date), lm.disposed_date),
+           1, s.sale_price, COALESCE(s.total_fees, 0), lm.proceeds, lm.cost_basis, lm.gain
+    FROM lot_matches lm
+    JOIN sales s ON s.id = lm.sale_id
+    LEFT JOIN cards c ON c.card_id = lm.card_id
+    LEFT JOIN purchases p ON p.id = lm.lot_id
+    WHERE lm.sale_id > ?
+    ORDER BY lm.sale_id
+"""
+
+# Ledger fingerprint per (platform, month): any edit moving a sale between them
+# changes two groups even when the overall count and totals stay put
+_STATE_SQL = """
+    SELECT COALESCE(s.platform, ''), COALESCE(strftime('%Y-%m', lm.disposed_date), lm.disposed_date),
+           MAX(lm.sale_id), COUNT(*), SUM(s.sale_price), SUM(COALESCE(s.total_fees, 0)), SUM(lm.gain)
+    FROM lot_matches lm JOIN sales s ON s.id = lm.sale_id
+    GROUP BY 1, 2
+"""
+
+# Positions of the platform and month values in a _FACTS_SQL row
+_PLATFORM = 1 + DIMENSIONS.index("platform")
+_MONTH = 1 + DIMENSIONS.index("month")
+
+# Summed REAL amounts drift slightly, so compare ledger states with a tolerance
+_TOLERANCE = 0.005
+
+
+def _close(a, b) -> bool:
+    return all(abs(x - y) <= _TOLERANCE for x, y in zip(a, b))
+
+
+def _same_state(a: dict, b: dict) -> bool:
+    """Equal group keys and counts, with totals equal within the tolerance."""
+    return a.keys() == b.keys() and all(a[k][0] == b[k][0] and _close(a[k], b[k]) for k in a)
+
+
+class PnLCube:
+    def __init__(self, conn):
+        self.conn = conn
+        self._reset()
+
+    def _reset(self):
+        self._codes = {dim: {} for dim in DIMENSIONS}
+        self._values = {dim: [] for dim in DIMENSIONS}
+        self._cell_index: dict[tuple, int] = {}
+        self._cell_codes = np.zeros((0, len(DIMENSIONS)), dtype=np.int32)
+        self._cell_measures = np.zeros((0, len(MEASURES)), dtype=np.float64)
+        # (platform, month) -> [sales, revenue, fees, profit], plus the newest sale folded in
+        self._state: dict[tuple, list] = {}
+        self._max_sale_id = 0
+        self._results: dict[tuple, dict[tuple, np.ndarray]] = {}
+
+    def invalidate(self):
+        """Drop the cube and every cached result; the next query reloads all sales."""
+        self._reset()
+
+    def _encode(self, dim: str, value: str) -> int:
+        codes = self._codes[dim]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self._values[dim].append(value)
+        return code
+
+    def refresh(self) -> int:
+        """Fold sales matched since the last refresh into the cube. Returns the facts added."""
+        state, max_sale_id = {}, 0
+        for platform, month, group_max, *totals in self.conn.execute(_STATE_SQL):
+            state[(platform, month)] = totals
+            max_sale_id = max(max_sale_id, group_max)
+        if max_sale_id == self._max_sale_id and _same_state(state, self._state):
+            return 0
+
+        rows = self.conn.execute(_FACTS_SQL, (self._max_sale_id,)).fetchall()
+        # Appended facts must account for the whole change, else earlier sales were edited
+        expected = {key: list(totals) for key, totals in self._state.items()}
+        for row in rows:
+            totals = expected.setdefault((row[_PLATFORM], row[_MONTH]), [0, 0.0, 0.0, 0.0])
+            for i, value in enumerate((1, row[-5], row[-4], row[-1])):
+                totals[i] += value
+        if not _same_state(state, expected):
+            self._reset()
+            rows = self.conn.execute(_FACTS_SQL, (0,)).fetchall()
+
+        width = len(DIMENSIONS)
+        new_cells, cell_rows, fact_codes = [], [], []
+        for row in rows:
+            key = tuple(self._encode(dim, value) for dim, value in zip(DIMENSIONS, row[1:1 + width]))
+            index = self._cell_index.get(key)
+            if index is None:
+                index = self._cell_index[key] = len(self._cell_index)
+                new_cells.append(key)
+            cell_rows.append(index)
+            fact_codes.append(key)
+
+        if new_cells:
+            self._cell_codes = np.vstack([self._cell_codes, np.array(new_cells, dtype=np.int32)])
+            self._cell_measures = np.vstack([
+                self._cell_measures, np.zeros((len(new_cells), len(MEASURES)))
+            ])
+        fact_measures = np.array([row[1 + width:] for row in rows], dtype=np.float64)
+        if len(rows):
+            np.add.at(self._cell_measures, np.array(cell_rows), fact_measures)
+
+        # Patch cached group-bys with just the groups the new facts land in
+        fact_codes = np.array(fact_codes, dtype=np.int32).reshape(-1, width)
+        for (by, where), groups in self._results.items():
+            mask = self._filter_mask(fact_codes, where)
+            columns = [DIMENSIONS.index(d) for d in by]
+            for codes, measures in zip(fact_codes[mask], fact_measures[mask]):
+                group = tuple(codes[columns].tolist())
+                if group in groups:
+                    groups[group] = groups[group] + measures
+                else:
+                    groups[group] = measures.copy()
+
+        self._state, self._max_sale_id = state, max_sale_id
+        return len(rows)
+
+    def _filter_mask(self, codes: np.ndarray, where: tuple) -> np.ndarray:
+        mask = np.ones(len(codes), dtype=bool)
+        for dim, values in where:
+            wanted = [self._codes[dim][v] for v in values if v in self._codes[dim]]
+            mask &= np.isin(codes[:, DIMENSIONS.index(dim)], wanted)
+        return mask
+
+    def query(self, by: Sequence[str] = (), where: dict | None = None) -> list[dict]:
+        """Realized P&L grouped by any dimensions, largest profit first.
+
+        where maps a dimension to one value or a list of accepted values.
+        """
+        by = tuple(by)
+        unknown = [d for d in (*by, *(where or {})) if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown cube dimension(s) {unknown}; expected any of {DIMENSIONS}")
+        where_key = tuple(sorted(
+            (dim, tuple(sorted(map(str, v if isinstance(v, (list, tuple, set)) else [v]))))
+            for dim, v in (where or {}).items()
+        ))
+
+        self.refresh()
+        key = (by, where_key)
+        groups = self._results.get(key)
+        if groups is None:
+            groups = self._results[key] = self._aggregate(by, where_key)
+
+        rows = []
+        for group, measures in groups.items():
+            sums = dict(zip(MEASURES, measures.tolist()))
+            row = {dim: self._values[dim][code] for dim, code in zip(by, group)}
+            row.update({name: round(value, 2) for name, value in sums.items()})
+            row["sales"] = int(sums["sales"])
+            row["roi_pct"] = (round(sums["profit"] / sums["cost_basis"] * 100, 2)
+                              if sums["cost_basis"] > 0 else None)
+            row["fee_share_pct"] = (round(sums["fees"] / sums["revenue"] * 100, 2)
+                                    if sums["revenue"] > 0 else None)
+            rows.append(row)
+        rows.sort(key=lambda r: -r["profit"])
+        return rows
+
+    def _aggregate(self, by: tuple, where: tuple) -> dict[tuple, np.ndarray]:
+        mask = self._filter_mask(self._cell_codes, where)
+        codes = self._cell_codes[mask][:, [DIMENSIONS.index(d) for d in by]]
+        measures = self._cell_measures[mask]
+        if not len(measures):
+            return {}
+        keys, inverse = np.unique(codes, axis=0, return_inverse=True)
+        sums = np.zeros((len(keys), len(MEASURES)))
+        np.add.at(sums, inverse.reshape(-1), measures)
+        return {tuple(k.tolist()): s for k, s in zip(keys, sums)}
+
+    def stats(self) -> dict:
+        """Cube size: facts folded in, cells, and distinct values per dimension."""
+        return {
+            "facts": sum(totals[0] for totals in self._state.values()),
+            "cells": len(self._cell_index),
+            "cached_queries": len(self._results),
+            **{f"{dim}_values": len(self._values[dim]) for dim in DIMENSIONS},
+        }
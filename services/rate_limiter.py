@@ -0,0 +1,124 @@
+"""Token-bucket rate limiting and a persisted daily call quota for eBay API calls."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when the daily eBay API call quota has been used up."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int | None = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: int = 1, timeout: float | None = None) -> bool:
+        """Block until `tokens` are available. Returns False if `timeout` elapses first."""
+        if tokens > self.capacity:
+            raise ValueError("cannot acquire more tokens than the bucket capacity")
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self._sleep(wait)
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class DailyQuotaLedger:
+    """Counts API calls per UTC day against a limit, persisted in api_quota_ledger.
+
+    consume() is thread-safe and only touches memory, so worker threads can call it.
+    flush() writes the pending counts and must run on the thread that owns `conn`.
+    """
+
+    def __init__(self, conn, daily_limit: int, today=_utc_day):
+        self._conn = conn
+        self.daily_limit = daily_limit
+        self._today = today
+        self._lock = threading.Lock()
+        self._day = today()
+        self._used = self._load(self._day)
+        self._pending: dict[str, int] = {}
+
+    def _load(self, day: str) -> int:
+        row = self._conn.execute(
+            "SELECT calls FROM api_quota_ledger WHERE day = ?", (day,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _roll_over(self):
+        day = self._today()
+        if day != self._day:
+            self._day = day
+            self._used = 0
+
+    def consume(self, calls: int = 1):
+        with self._lock:
+            self._roll_over()
+            if self._used + calls > self.daily_limit:
+                raise QuotaExceededError(
+                    f"Daily eBay API quota of {self.daily_limit} calls reached for {self._day}"
+                )
+            self._used += calls
+            self._pending[self._day] = self._pending.get(self._day, 0) + calls
+
+    @property
+    def used(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return self._used
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO api_quota_ledger (day, calls) VALUES (?, ?)
+            ON CONFLICT(day) DO UPDATE SET calls = calls + excluded.calls
+            """,
+            list(pending.items()),
+        )
+        self._conn.commit()
@@ -0,0 +1,367 @@
+"""Background scheduler that keeps market data for inventory cards fresh.
+
+Work is persisted in the `jobs` table, so queued refreshes survive restarts. A
+dispatcher thread owns the only writing connection: it queues stale cards,
+claims the highest-priority jobs, and stores results. Worker threads fetch comp
+stats and active listings using pooled read-only connections, so nothing here
+touches the Tk main loop or its connection.
+"""
+
+import math
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config.defaults import (
+    DEFAULT_REFRESH_MAX_AGE_HOURS,
+    DEFAULT_REFRESH_MAX_ATTEMPTS,
+    DEFAULT_REFRESH_WORKERS,
+)
+from config.settings import SettingsManager
+from database.connection import ConnectionManager
+from services.comp_service import CompService
+from services.ebay_api import EbayApiClient
+from services.rate_limiter import DailyQuotaLedger, TokenBucket
+
+JOB_COMP_STATS = "comp_stats"
+JOB_ACTIVE_LISTINGS = "active_listings"
+
+# Settings client_from_settings() reads; the client is rebuilt when any of them changes
+CLIENT_SETTINGS = (
+    "ebay_client_id", "ebay_client_secret", "ebay_environment",
+    "ebay_rate_limit_per_sec", "ebay_rate_limit_burst", "ebay_daily_call_limit",
+)
+
+
+def compute_priority(cost_basis: float, stale_hours: float | None, volatility: float | None) -> float:
+    """Higher runs sooner: expensive cards, stale (or never fetched) data, volatile prices."""
+    staleness = 30.0 if stale_hours is None else min(stale_hours / 24, 30.0)
+    return round(math.log1p(max(cost_basis, 0.0)) * (1 + staleness) * (1 + (volatility or 0.0)), 4)
+
+
+def client_from_settings(conn) -> EbayApiClient | None:
+    settings = SettingsManager(conn)
+    client_id = settings.get("ebay_client_id")
+    client_secret = settings.get("ebay_client_secret")
+    if not client_id or not client_secret:
+        return None
+    return EbayApiClient(
+        client_id, client_secret, settings.get("ebay_environment", "PRODUCTION"),
+        rate_limiter=TokenBucket(
+            rate=settings.get_float("ebay_rate_limit_per_sec"),
+            capacity=int(settings.get_float("ebay_rate_limit_burst")),
+        ),
+        quota_ledger=DailyQuotaLedger(conn, int(settings.get_float("ebay_daily_call_limit"))),
+    )
+
+
+def _client_settings(conn) -> tuple:
+    return tuple(conn.execute(
+        f"SELECT key, value FROM settings WHERE key IN ({', '.join('?' * len(CLIENT_SETTINGS))}) "
+        "ORDER BY key",
+        CLIENT_SETTINGS,
+    ).fetchall())
+
+
+class RefreshScheduler:
+    def __init__(self, db: ConnectionManager | str, client_factory=client_from_settings,
+                 workers: int = DEFAULT_REFRESH_WORKERS,
+                 max_age_hours: float = DEFAULT_REFRESH_MAX_AGE_HOURS,
+                 max_attempts: int = DEFAULT_REFRESH_MAX_ATTEMPTS,
+                 poll_interval: float = 1.0, enqueue_interval: float = 300.0):
+        if not isinstance(db, ConnectionManager):
+            db = ConnectionManager(db, read_pool_size=workers)
+        self.db = db
+        self.client_factory = client_factory
+        self.workers = workers
+        self.max_age_hours = max_age_hours
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.enqueue_interval = enqueue_interval
+
+        self._stop = threading.Event()
+        self._settings_changed = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._finished: deque[float] = deque(maxlen=1000)
+        self._counts = {"completed": 0, "failed": 0}
+
+    # ── Lifecycle ───────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="refresh-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def settings_changed(self):
+        """Re-read the API settings on the next dispatcher pass instead of the next enqueue."""
+        self._settings_changed.set()
+
+    def _run(self):
+        conn = self.db.thread_connection()
+        try:
+            self.recover(conn)
+            client, client_settings = None, None
+            last_enqueue = 0.0
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="refresh-worker") as pool:
+                in_flight = {}
+                while not self._stop.is_set():
+                    if (self._settings_changed.is_set()
+                            or time.monotonic() - last_enqueue >= self.enqueue_interval):
+                        self._settings_changed.clear()
+                        # Credentials or limits saved since launch take effect here;
+                        # jobs already running finish on the client they started with
+                        current = _client_settings(conn)
+                        if current != client_settings:
+                            if client is not None and client.quota_ledger is not None:
+                                client.quota_ledger.flush()
+                            client = self.client_factory(conn) if self.client_factory else None
+                            client_settings = current
+                        self.enqueue_stale(conn, include_active=client is not None)
+                        last_enqueue = time.monotonic()
+                    busy = self._tick(conn, pool, in_flight, client)
+                    self._stop.wait(0.05 if busy else self.poll_interval)
+                for future in in_flight:
+                    future.cancel()
+            # Anything still running goes back to the queue for next launch
+            self.recover(conn)
+        finally:
+            self.db.release_thread_connection()
+
+    def run_until_idle(self, timeout: float = 30.0) -> int:
+        """Run queued jobs on this thread's pool until none remain. Returns jobs finished."""
+        conn = self.db.thread_connection()
+        try:
+            client = self.client_factory(conn) if self.client_factory else None
+            before = self._counts["completed"] + self._counts["failed"]
+            deadline = time.monotonic() + timeout
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="refresh-worker") as pool:
+                in_flight = {}
+                while time.monotonic() < deadline:
+                    if not self._tick(conn, pool, in_flight, client) and not in_flight:
+                        break
+                    time.sleep(0.01)
+            return self._counts["completed"] + self._counts["failed"] - before
+        finally:
+            self.db.release_thread_connection()
+
+    def recover(self, conn):
+        """Requeue jobs left 'running' by a previous process that exited mid-job."""
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', updated_at = datetime('now') WHERE status = 'running'"
+        )
+        conn.commit()
+
+    # ── Queueing ────────────────────────────────────────────────────
+
+    def enqueue_stale(self, conn, include_active: bool = True) -> int:
+        """Queue refresh jobs for unsold cards whose market data is missing or stale."""
+        cursor = conn.execute(
+            """
+            SELECT c.card_id,
+                   COALESCE(p.cost_basis, 0) AS cost_basis,
+                   (julianday('now') - julianday(m.refreshed_at)) * 24 AS stale_hours,
+                   m.volatility
+            FROM cards c
+            LEFT JOIN (
+                SELECT card_id, SUM(total_cost_basis) AS cost_basis
+                FROM purchases GROUP BY card_id
+            ) p ON p.card_id = c.card_id
+            LEFT JOIN market_values m ON m.card_id = c.card_id
+            WHERE c.status IN ('Inventory', 'At Grading')
+              AND (m.refreshed_at IS NULL OR m.refreshed_at < datetime('now', ?))
+            """,
+            (f"-{self.max_age_hours} hours",),
+        )
+        kinds = [JOB_COMP_STATS] + ([JOB_ACTIVE_LISTINGS] if include_active else [])
+        rows = [
+            (kind, row["card_id"],
+             compute_priority(row["cost_basis"], row["stale_hours"], row["volatility"]))
+            for row in cursor
+            for kind in kinds
+        ]
+        conn.executemany(
+            """
+            INSERT INTO jobs (kind, card_id, priority) VALUES (?, ?, ?)
+            ON CONFLICT(kind, card_id) DO UPDATE SET
+                priority = excluded.priority,
+                status = CASE WHEN status IN ('done', 'failed') THEN 'queued' ELSE status END,
+                attempts = CASE WHEN status IN ('done', 'failed') THEN 0 ELSE attempts END,
+                run_after = CASE WHEN status IN ('done', 'failed') THEN datetime('now')
+                                 ELSE run_after END,
+                updated_at = datetime('now')
+            """,
+            rows,
+        )
+        conn.commit()
+        return len(rows)
+
+    def _claim(self, conn, limit: int) -> list[dict]:
+        if limit <= 0:
+            return []
+        cursor = conn.execute(
+            """
+            UPDATE jobs SET status = 'running', updated_at = datetime('now')
+            WHERE id IN (
+                SELECT id FROM jobs
+                WHERE status = 'queued' AND run_after <= datetime('now')
+                ORDER BY priority DESC
+                LIMIT ?
+            )
+            RETURNING id, kind, card_id, attempts
+            """,
+            (limit,),
+        )
+        jobs = [dict(row) for row in cursor.fetchall()]
+        conn.commit()
+        return jobs
+
+    # ── Dispatch ────────────────────────────────────────────────────
+
+    def _tick(self, conn, pool, in_flight: dict, client) -> bool:
+        """Store finished results and start new jobs. Returns True if any work moved."""
+        moved = False
+        for future in [f for f in in_flight if f.done()]:
+            job = in_flight.pop(future)
+            try:
+                self._store_result(conn, job, future.result())
+            except Exception as e:
+                self._record_failure(conn, job, e)
+            moved = True
+
+        for job in self._claim(conn, self.workers - len(in_flight)):
+            in_flight[pool.submit(self._run_job, job, client)] = job
+            moved = True
+
+        if client is not None and client.quota_ledger is not None:
+            client.quota_ledger.flush()
+        return moved
+
+    def _run_job(self, job: dict, client) -> dict:
+        # Hold the pooled reader only for local queries, never across an API call
+        with self.db.read() as conn:
+            card = conn.execute(
+                "SELECT description FROM cards WHERE card_id = ?", (job["card_id"],)
+            ).fetchone()
+            if card is None:
+                raise LookupError(f"Card {job['card_id']} no longer exists")
+            query = card["description"]
+            stats = CompService(conn).get_comp_stats(query) if job["kind"] == JOB_COMP_STATS else None
+
+        if job["kind"] == JOB_COMP_STATS:
+            prices = [c.sold_price for c in stats["comps"]]
+            volatility = None
+            if len(prices) >= 2 and stats["average"] > 0:
+                volatility = round(statistics.pstdev(prices) / stats["average"], 4)
+            return {
+                "search_query": query,
+                "comp_count": stats["count"],
+                "comp_median": stats["median"] if stats["count"] else None,
+                "comp_average": stats["average"] if stats["count"] else None,
+                "volatility": volatility,
+            }
+
+        if job["kind"] == JOB_ACTIVE_LISTINGS:
+            if client is None:
+                raise RuntimeError("eBay API not configured")
+            items = client.search_items(query, EbayApiClient.TRADING_CARDS_CATEGORY, limit=50)
+            prices = [i["price"] for i in items if i["price"] > 0]
+            return {
+                "search_query": query,
+                "active_count": len(prices),
+                "active_low": min(prices) if prices else None,
+                "active_median": round(statistics.median(prices), 2) if prices else None,
+            }
+
+        raise ValueError(f"Unknown job kind: {job['kind']}")
+
+    def _store_result(self, conn, job: dict, result: dict):
+        columns = list(result)
+        conn.execute(
+            f"""
+            INSERT INTO market_values (card_id, {", ".join(columns)}, refreshed_at)
+            VALUES (?, {", ".join("?" * len(columns))}, datetime('now'))
+            ON CONFLICT(card_id) DO UPDATE SET
+                {", ".join(f"{c} = excluded.{c}" for c in columns)},
+                refreshed_at = excluded.refreshed_at
+            """,
+            (job["card_id"], *result.values()),
+        )
+        # Sold comps win; fall back to the active-listing median when there are none
+        conn.execute(
+            """
+            UPDATE market_values SET market_value = COALESCE(comp_median, active_median)
+            WHERE card_id = ?
+            """,
+            (job["card_id"],),
+        )
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'done', attempts = attempts + 1, last_error = NULL,
+                finished_at = datetime('now'), updated_at = datetime('now')
+            WHERE id = ?
+            """,
+            (job["id"],),
+        )
+        conn.commit()
+        self._mark_finished("completed")
+
+    def _record_failure(self, conn, job: dict, error: Exception):
+        attempts = job["attempts"] + 1
+        if attempts >= self.max_attempts:
+            status, delay = "failed", 0
+        else:
+            status, delay = "queued", 60 * 2 ** attempts
+        conn.execute(
+            """
+            UPDATE jobs SET status = ?, attempts = ?, last_error = ?,
+                run_after = datetime('now', ?), updated_at = datetime('now')
+            WHERE id = ?
+            """,
+            (status, attempts, str(error), f"+{delay} seconds", job["id"]),
+        )
+        conn.commit()
+        if status == "failed":
+            self._mark_finished("failed")
+
+    def _mark_finished(self, outcome: str):
+        with self._lock:
+            self._counts[outcome] += 1
+            self._finished.append(time.monotonic())
+
+    # ── Monitoring ──────────────────────────────────────────────────
+
+    def stats(self, conn=None) -> dict:
+        """Queue depth by status plus throughput over the last minute."""
+        if conn is None:
+            with self.db.read() as reader:
+                return self.stats(reader)
+        depth = {row[0]: row[1] for row in conn.execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        )}
+        now = time.monotonic()
+        with self._lock:
+            recent = sum(1 for t in self._finished if now - t <= 60)
+            counts = dict(self._counts)
+        return {
+            "queued": depth.get("queued", 0),
+            "running": depth.get("running", 0),
+            "done": depth.get("done", 0),
+            "failed": depth.get("failed", 0),
+            "completed_this_session": counts["completed"],
+            "failed_this_session": counts["failed"],
+            "jobs_per_minute": recent,
+            "is_running": self._thread is not None,
+        }
@@ -1,6 +1,52 @@
 """Portfolio ROI tracking service."""
 
+from collections.abc import Iterator
+
+from config.defaults import DEFAULT_PAGE_SIZE
+from database import pnl_rollups, portfolio_ledger
 from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.rows import iter_keyset, keyset_page, model_columns
+from models.card import InventoryRow
+from services.pnl_cube import PnLCube
+
+_INVENTORY_SELECT = f"""
+    SELECT {model_columns(InventoryRow, "c")}
+    FROM card_pnl c
+"""
+
+# Derived portfolio metrics, computed from the one-row ledger
+_SUMMARY_SQL = """
+    SELECT
+        ROUND(total_invested, 2) AS total_invested,
+        ROUND(total_revenue, 2) AS total_revenue,
+        ROUND(total_revenue - total_invested, 2) AS total_profit,
+        CASE WHEN total_invested > 0
+             THEN ROUND((total_revenue - total_invested) / total_invested * 100, 2)
+             ELSE 0.0 END AS overall_roi_pct,
+        cards_purchased,
+        cards_sold,
+        cards_purchased - cards_sold AS cards_in_inventory,
+        CASE WHEN cards_sold > 0
+             THEN ROUND((total_revenue - total_invested) / cards_sold, 2)
+             ELSE 0.0 END AS avg_profit_per_card
+    FROM portfolio_totals
+    WHERE id = 1
+"""
+
+# Realized P&L per sale date with a running total; each matched lot counts on its
+# own disposal date, so a card sold, re-bought and sold again shows both sales
+_CUMULATIVE_PNL_SQL = """
+    WITH daily AS (
+        SELECT disposed_date AS sale_date, COUNT(*) AS cards_sold, ROUND(SUM(gain), 2) AS profit
+        FROM lot_matches
+        GROUP BY disposed_date
+    )
+    SELECT sale_date, cards_sold, profit,
+           ROUND(SUM(profit) OVER (ORDER BY sale_date ROWS UNBOUNDED PRECEDING), 2)
+               AS cumulative_profit
+    FROM daily
+    ORDER BY sale_date
+"""
 
 
 class ROITracker:
@@ -9,44 +55,49 @@ class ROITracker:
         self.cards = CardRepository(conn)
         self.purchases = PurchaseRepository(conn)
         self.sales = SaleRepository(conn)
+        self.cube = PnLCube(conn)
 
     def get_portfolio_summary(self) -> dict:
-        all_purchases = self.purchases.get_all()
-        all_sales = self.sales.get_all()
-
-        total_invested = sum(p["total_cost_basis"] for p in all_purchases)
-        total_revenue = sum(s.get("net_proceeds", 0) or 0 for s in all_sales)
-        total_profit = total_revenue - total_invested
-
-        cards_purchased = len(all_purchases)
-        cards_sold = len(all_sales)
-        cards_in_inventory = cards_purchased - cards_sold
-
-        overall_roi = (total_profit / total_invested * 100) if total_invested > 0 else 0.0
-        avg_profit = (total_profit / cards_sold) if cards_sold > 0 else 0.0
-
-        return {
-            "total_invested": round(total_invested, 2),
-            "total_revenue": round(total_revenue, 2),
-            "total_profit": round(total_profit, 2),
-            "overall_roi_pct": round(overall_roi, 2),
-            "cards_purchased": cards_purchased,
-            "cards_sold": cards_sold,
-            "cards_in_inventory": cards_in_inventory,
-            "avg_profit_per_card": round(avg_profit, 2),
-        }
-
-    def get_inventory_with_details(self) -> list[dict]:
-        """Get all cards with their purchase and sale details joined."""
-        cursor = self.conn.execute("""
-            SELECT
-                c.card_id, c.description, c.sport, c.is_graded, c.grading_company,
-                c.grade, c.status,
-                p.purchase_price, p.total_cost_basis, p.purchase_date, p.source,
-                s.sale_price, s.net_proceeds, s.sale_date, s.total_fees
-            FROM cards c
-            LEFT JOIN purchases p ON c.card_id = p.card_id
-            LEFT JOIN sales s ON c.card_id = s.card_id
-            ORDER BY c.created_at DESC
-        """)
-        return [dict(row) for row in cursor.fetchall()]
+        # One-row read of the trigger-maintained ledger, independent of history size
+        summary = dict(self.conn.execute(_SUMMARY_SQL).fetchone())
+        summary["status_counts"] = self.get_status_counts()
+        return summary
+
+    def get_status_counts(self) -> dict[str, int]:
+        return portfolio_ledger.read(self.conn)["status_counts"]
+
+    def get_cumulative_pnl(self) -> list[dict]:
+        """Realized profit per sale date and its running total, oldest first."""
+        return [dict(row) for row in self.conn.execute(_CUMULATIVE_PNL_SQL)]
+
+    def get_pnl_series(self, granularity: str = "month", start: str | None = None,
+                       end: str | None = None, by: str | None = None) -> list[dict]:
+        """Realized P&L per day, week or month from the trigger-maintained rollups."""
+        return pnl_rollups.series(self.conn, granularity, start, end, by)
+
+    def slice_pnl(self, by=(), where: dict | None = None) -> list[dict]:
+        """Realized P&L, ROI and fee share grouped by any cube dimensions, e.g. ("sport", "month")."""
+        return self.cube.query(by, where)
+
+    def get_inventory_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                           status: str | None = None) -> tuple[list[InventoryRow], tuple | None]:
+        """One keyset page of cards with purchase and sale totals and P&L, newest first."""
+        return keyset_page(
+            self.conn, InventoryRow, _INVENTORY_SELECT, ("c.created_at", "c.id"), after, limit,
+            where="c.status = ?" if status else "", params=(status,) if status else (),
+        )
+
+    def iter_inventory_with_details(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[InventoryRow]:
+        """Stream all cards with their purchase and sale totals and P&L."""
+        return iter_keyset(self.get_inventory_page, page_size)
+
+    def get_inventory_with_details(self) -> list[InventoryRow]:
+        return list(self.iter_inventory_with_details())
+
+    def get_recent_sold(self, limit: int = 15) -> list[InventoryRow]:
+        """The most recently added cards that have both a cost basis and a sale."""
+        rows, _ = keyset_page(
+            self.conn, InventoryRow, _INVENTORY_SELECT, ("c.created_at", "c.id"), None, limit,
+            where="c.profit IS NOT NULL",
+        )
+        return rows
@@ -0,0 +1,159 @@
+"""Mark-to-market valuation of unsold inventory.
+
+One query values every Inventory / At Grading card: recent comps are ranked per
+key with window functions to take medians, then joined to the cards by card_id
+link, by normalized search query (lower-cased, trimmed, equal to the card's
+description), and finally by the refresh scheduler's market_values. Estimated
+net proceeds for all valued cards go through the batch fee engine in one call.
+Unrealized P&L is measured against the card's open (unsold) tax lots only, so a
+re-bought card's sold lot is not charged again next to its realized P&L.
+
+Results are cached per service instance until comps, market values or the
+portfolio ledger change (or the day rolls over, which moves the comp window).
+"""
+
+import json
+
+from database.repository import FeeProfileRepository
+from models.card import CardValuation
+from services.calculator import calculate_net_proceeds_batch
+
+UNSOLD_STATUSES = ("Inventory", "At Grading")
+
+_MEDIAN_SQL = """
+    SELECT key, AVG(sold_price) AS median, MAX(n) AS n
+    FROM (
+        SELECT {key} AS key, sold_price,
+               ROW_NUMBER() OVER w AS rn,
+               COUNT(*) OVER w AS n
+        FROM recent
+        WHERE {key} IS NOT NULL
+        WINDOW w AS (PARTITION BY {key} ORDER BY sold_price
+                     ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    )
+    WHERE rn IN ((n + 1) / 2, (n + 2) / 2)
+    GROUP BY key
+"""
+
+_VALUATION_SQL = f"""
+    WITH recent AS (
+        SELECT card_id, lower(trim(search_query)) AS query_key, sold_price
+        FROM comps
+        WHERE fetched_at >= datetime('now', ?)
+    ),
+    by_card AS ({_MEDIAN_SQL.format(key="card_id")}),
+    by_query AS ({_MEDIAN_SQL.format(key="query_key")})
+    SELECT
+        c.card_id, c.description, c.status,
+        (SELECT SUM(l.cost_basis) FROM purchase_lots l
+         WHERE l.card_id = c.card_id
+           AND NOT EXISTS (SELECT 1 FROM lot_matches lm WHERE lm.lot_id = l.lot_id)
+        ) AS total_cost_basis,
+        ROUND(COALESCE(bc.median, bq.median, mv.market_value), 2) AS market_value,
+        CASE WHEN bc.median IS NOT NULL THEN 'card comps'
+             WHEN bq.median IS NOT NULL THEN 'query comps'
+             WHEN mv.market_value IS NOT NULL THEN 'market refresh' END AS value_source,
+        CASE WHEN bc.median IS NOT NULL THEN bc.n
+             WHEN bq.median IS NOT NULL THEN bq.n
+             ELSE mv.comp_count END AS comp_count
+    FROM cards c
+    LEFT JOIN by_card bc ON bc.key = c.card_id
+    LEFT JOIN by_query bq ON bq.key = lower(trim(c.description))
+    LEFT JOIN market_values mv ON mv.card_id = c.card_id
+    WHERE c.status IN ({", ".join("?" * len(UNSOLD_STATUSES))})
+    ORDER BY c.card_id
+"""
+
+# Comp medians for descriptions of cards not yet in the database, passed as a JSON array
+_DESCRIPTION_MEDIAN_SQL = f"""
+    WITH recent AS (
+        SELECT card_id, lower(trim(search_query)) AS query_key, sold_price
+        FROM comps
+        WHERE fetched_at >= datetime('now', ?)
+          AND lower(trim(search_query)) IN (SELECT lower(trim(value)) FROM json_each(?))
+    )
+    {_MEDIAN_SQL.format(key="query_key")}
+"""
+
+# Cheap reads that change whenever a cached valuation could be stale
+_CACHE_TOKEN_SQL = """
+    SELECT
+        (SELECT MAX(id) FROM comps),
+        (SELECT MAX(refreshed_at) FROM market_values),
+        (SELECT total_invested || ':' || cards_purchased || ':' || cards_sold
+         FROM portfolio_totals WHERE id = 1),
+        (SELECT group_concat(status || '=' || card_count) FROM card_status_counts),
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(sale_id), 0) FROM lot_matches),
+        date('now')
+"""
+
+
+class ValuationService:
+    def __init__(self, conn, days: int = 90):
+        self.conn = conn
+        self.days = days
+        self._cache: tuple[tuple, dict] | None = None
+
+    def estimate_by_description(self, descriptions: list[str]) -> dict[str, float]:
+        """Median recent comp price per description, matched like value_inventory's query comps.
+
+        Keys are the normalized (lower-cased, trimmed) descriptions that have comps.
+        """
+        rows = self.conn.execute(
+            _DESCRIPTION_MEDIAN_SQL, (f"-{self.days} days", json.dumps(list(descriptions)))
+        )
+        return {key: round(median, 2) for key, median, _n in rows}
+
+    def value_inventory(self, fee_profile: dict | None = None, shipping_charged: float = 0.0,
+                        shipping_cost: float = 0.0, is_international: bool = False) -> dict:
+        """Estimated market value, net proceeds and unrealized P&L for every unsold card.
+
+        fee_profile is a fee_profiles row; the default profile is used when omitted.
+        Totals cover valued cards only; cards with no market data are counted separately.
+        """
+        if fee_profile is None:
+            fee_profile = FeeProfileRepository(self.conn).get_default() or {}
+        token = (
+            tuple(self.conn.execute(_CACHE_TOKEN_SQL).fetchone()),
+            tuple(sorted(fee_profile.items())), shipping_charged, shipping_cost, is_international,
+        )
+        if self._cache is not None and self._cache[0] == token:
+            return self._cache[1]
+
+        rows = self.conn.execute(_VALUATION_SQL, (f"-{self.days} days", *UNSOLD_STATUSES)).fetchall()
+        cards = [CardValuation(*row) for row in rows]
+        valued = [c for c in cards if c.market_value is not None]
+        net = calculate_net_proceeds_batch(
+            [c.market_value for c in valued],
+            shipping_charged=shipping_charged,
+            shipping_cost=shipping_cost,
+            fvf_rate=fee_profile.get("fvf_rate", 0.1325),
+            fvf_cap=fee_profile.get("fvf_cap_amount", 7500.0),
+            fvf_rate_above_cap=fee_profile.get("fvf_rate_above_cap", 0.0235),
+            per_order_threshold=fee_profile.get("per_order_threshold", 10.0),
+            per_order_fee_low=fee_profile.get("per_order_fee_low", 0.30),
+            per_order_fee_high=fee_profile.get("per_order_fee_high", 0.40),
+            is_international=is_international,
+            intl_fee_rate=fee_profile.get("intl_fee_rate", 0.0165),
+        )
+        for card, proceeds in zip(valued, net):
+            cost = card.total_cost_basis or 0.0
+            card.est_net_proceeds = proceeds
+            card.unrealized_pnl = round(proceeds - cost, 2)
+            card.unrealized_roi_pct = round((proceeds - cost) / cost * 100, 2) if cost > 0 else None
+
+        total_cost = sum(c.total_cost_basis or 0.0 for c in valued)
+        total_pnl = sum(c.unrealized_pnl for c in valued)
+        result = {
+            "cards": cards,
+            "valued_count": len(valued),
+            "unvalued_count": len(cards) - len(valued),
+            "total_cost_basis": round(total_cost, 2),
+            "total_market_value": round(sum(c.market_value for c in valued), 2),
+            "total_est_net_proceeds": round(sum(net), 2),
+            "total_unrealized_pnl": round(total_pnl, 2),
+            "unrealized_roi_pct": round(total_pnl / total_cost * 100, 2) if total_cost > 0 else 0.0,
+            "unvalued_cost_basis": round(sum(c.total_cost_basis or 0.0 for c in cards) - total_cost, 2),
+        }
+        self._cache = (token, result)
+        return result
@@ -0,0 +1,260 @@
+"""Local stand-in for the eBay OAuth and Browse APIs.
+
+Point an EbayApiClient at it by using the server URL as the environment:
+
+    with MockEbayServer(total_items=500, latency=0.05) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+
+Listings are generated deterministically from the query, so runs are repeatable.
+Run this file directly to serve on a fixed port for manual testing.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TOKEN_PATH = "/identity/v1/oauth2/token"
+SEARCH_PATH = "/buy/browse/v1/item_summary/search"
+ITEMS_PATH = "/buy/browse/v1/item/"
+
+_PRICE_FILTER = re.compile(r"price:\[([\d.]*)\.\.([\d.]*)\]")
+_BUYING_FILTER = re.compile(r"buyingOptions:\{([A-Z_|]+)\}")
+
+
+class MockEbayServer:
+    def __init__(self, total_items: int = 250, latency: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: int | None = None, retry_after: float = 1.0, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        total_items: listings returned for every query (before filters)
+        latency: seconds to sleep before answering each API request
+        error_rate: fraction of Browse requests answered with HTTP 500
+        rate_limit: max Browse requests per second before answering 429
+        retry_after: value of the Retry-After header sent with 429s
+        """
+        self.total_items = total_items
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.removed_items: set[str] = set()
+        self.price_overrides: dict[str, float] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window: list[float] = []
+        self.stats = dict.fromkeys(
+            ("token", "search", "get_items", "throttled", "errors", "not_modified",
+             "unauthorized"), 0
+        )
+        self.tokens: set[str] = set()
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockEbayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    # ── Behaviour knobs ─────────────────────────────────────────────
+
+    def should_throttle(self) -> bool:
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.rate_limit:
+                return True
+            self._window.append(now)
+            return False
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    # ── Fake catalogue ──────────────────────────────────────────────
+
+    def listing(self, query: str, n: int) -> dict:
+        rng = random.Random(f"{query.lower()}:{n}")
+        price = round(rng.uniform(1, 500), 2)
+        query_hash = int(hashlib.md5(query.lower().encode()).hexdigest()[:8], 16)
+        item_id = f"v1|{query_hash}{n:05d}|0"
+        price = self.price_overrides.get(item_id, price)
+        return {
+            "itemId": item_id,
+            "title": f"{query} #{n}",
+            "price": {"value": f"{price:.2f}", "currency": "USD"},
+            "condition": "Used" if n % 3 else "New",
+            "itemWebUrl": f"https://www.ebay.com/itm/{n}",
+            "buyingOptions": ["AUCTION"] if n % 2 else ["FIXED_PRICE"],
+            "itemEndDate": "2099-01-01T00:00:00.000Z",
+            "shippingOptions": [{"shippingCost": {"value": "4.63", "currency": "USD"}}],
+            "seller": {"username": f"seller{n % 17}"},
+        }
+
+    def item_detail(self, item_id: str) -> dict:
+        rng = random.Random(item_id)
+        grader = rng.choice(["Professional Sports Authenticator (PSA)", "Beckett (BGS)", None])
+        aspects = [
+            {"name": "Player/Athlete", "value": "Nikola Jokic"},
+            {"name": "Season", "value": str(rng.randint(2015, 2025))},
+            {"name": "Set", "value": "Panini Prizm"},
+            {"name": "Card Number", "value": str(rng.randint(1, 300))},
+        ]
+        if grader:
+            aspects.append({"name": "Professional Grader", "value": grader})
+            aspects.append({"name": "Grade", "value": str(rng.choice([8, 9, 10]))})
+        if rng.random() < 0.3:
+            aspects.append({"name": "Print Run", "value": f"/{rng.choice([10, 25, 99])}"})
+        return {
+            "itemId": item_id,
+            "title": f"Item {item_id}",
+            "price": {"value": f"{rng.uniform(1, 500):.2f}", "currency": "USD"},
+            "localizedAspects": aspects,
+            "shippingOptions": [{"shippingCost": {"value": "4.63", "currency": "USD"}}],
+        }
+
+    def search(self, query: str, filter_expr: str) -> list[dict]:
+        items = [self.listing(query, n) for n in range(self.total_items)]
+        items = [i for i in items if i["itemId"] not in self.removed_items]
+        price = _PRICE_FILTER.search(filter_expr or "")
+        if price:
+            low = float(price.group(1)) if price.group(1) else float("-inf")
+            high = float(price.group(2)) if price.group(2) else float("inf")
+            items = [i for i in items if low <= float(i["price"]["value"]) <= high]
+        buying = _BUYING_FILTER.search(filter_expr or "")
+        if buying:
+            wanted = set(buying.group(1).split("|"))
+            items = [i for i in items if wanted & set(i["buyingOptions"])]
+        return items
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def mock(self) -> MockEbayServer:
+        return self.server.mock
+
+    def _send_json(self, status: int, body: dict | None, headers: dict | None = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if urlparse(self.path).path != TOKEN_PATH:
+            self._send_json(404, {"errors": [{"message": "not found"}]})
+            return
+        if not self.headers.get("Authorization", "").startswith("Basic "):
+            self._send_json(401, {"error": "invalid_client"})
+            return
+        self.mock.count("token")
+        token = f"mock-token-{len(self.mock.tokens) + 1}"
+        self.mock.tokens.add(token)
+        self._send_json(200, {"access_token": token, "expires_in": 7200,
+                              "token_type": "Application Access Token"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in self.mock.tokens:
+            self.mock.count("unauthorized")
+            self._send_json(401, {"errors": [{"message": "Invalid access token"}]})
+            return
+        if self.mock.should_throttle():
+            self.mock.count("throttled")
+            self._send_json(429, {"errors": [{"message": "Too many requests"}]},
+                            {"Retry-After": str(self.mock.retry_after)})
+            return
+        if self.mock.should_fail():
+            self.mock.count("errors")
+            self._send_json(500, {"errors": [{"message": "Internal error"}]})
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == SEARCH_PATH:
+            self._search(params)
+        elif url.path == ITEMS_PATH:
+            self._get_items(params)
+        else:
+            self._send_json(404, {"errors": [{"message": "not found"}]})
+
+    def _respond_cacheable(self, body: dict):
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.mock.count("not_modified")
+            self._send_json(304, None, {"ETag": etag})
+            return
+        self._send_json(200, body, {"ETag": etag})
+
+    def _search(self, params: dict):
+        self.mock.count("search")
+        limit = min(int(params.get("limit", 50)), 200)
+        offset = int(params.get("offset", 0))
+        items = self.mock.search(params.get("q", ""), params.get("filter", ""))
+        page = items[offset:offset + limit]
+        body = {"total": len(items), "limit": limit, "offset": offset, "itemSummaries": page}
+        if offset + limit < len(items):
+            body["next"] = f"{SEARCH_PATH}?q={params.get('q', '')}&limit={limit}&offset={offset + limit}"
+        self._respond_cacheable(body)
+
+    def _get_items(self, params: dict):
+        self.mock.count("get_items")
+        item_ids = [i for i in params.get("item_ids", "").split(",") if i]
+        if not item_ids or len(item_ids) > 20:
+            self._send_json(400, {"errors": [{"message": "item_ids must list 1-20 IDs"}]})
+            return
+        items = [self.mock.item_detail(i) for i in item_ids if i not in self.mock.removed_items]
+        self._respond_cacheable({"items": items})
+
+
+if __name__ == "__main__":
+    server = MockEbayServer(total_items=1000, port=8765).start()
+    print(f"Mock eBay API listening on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
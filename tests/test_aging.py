@@ -0,0 +1,145 @@
+"""Unit tests for inventory aging and turnover analytics."""
+
+import sys
+import os
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from services.aging import AgingAnalytics
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _days_ago(n):
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def _seed(conn):
+    """Five $10 cards: two sold (after 20 and 40 days), three unsold aged 10, 60 and 200 days."""
+    specs = [
+        # (sport, graded, source, bought days ago, sold days ago)
+        ("Basketball", True, "eBay", 100, 80),
+        ("Basketball", False, "eBay", 50, 10),
+        ("Baseball", False, "LCS", 10, None),
+        ("Baseball", True, "LCS", 60, None),
+        ("Basketball", False, "eBay", 200, None),
+    ]
+    card_ids = CardRepository(conn).add_many([
+        {"description": f"Card {i}", "sport": sport, "is_graded": graded}
+        for i, (sport, graded, *_rest) in enumerate(specs)
+    ])
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": _days_ago(spec[3]), "purchase_price": 10.0,
+         "source": spec[2]}
+        for card_id, spec in zip(card_ids, specs)
+    ])
+    SaleRepository(conn).add_many([
+        {"card_id": card_id, "sale_date": _days_ago(spec[4]), "sale_price": 20.0}
+        for card_id, spec in zip(card_ids, specs) if spec[4] is not None
+    ])
+    return card_ids
+
+
+def test_overall_summary_and_buckets():
+    conn = _make_db()
+    _seed(conn)
+    aging = AgingAnalytics(conn)
+
+    overall = aging.summary()[0]
+    assert overall["cards"] == 5 and overall["sold"] == 2
+    assert overall["sell_through_pct"] == 40.0
+    assert overall["median_days_to_sell"] == 30.0
+    assert overall["median_days_held"] == 60.0
+    assert overall["capital_held"] == 30.0
+    # 20 sold cost * 365 / (10 * (20 + 40 + 10 + 60 + 200)) capital-days
+    assert overall["capital_turnover"] == round(20 * 365 / 3300, 2)
+    assert (overall["aged_0-30"], overall["aged_31-90"], overall["aged_91+"]) == (1, 1, 1)
+
+    assert aging.buckets() == [
+        {"bucket": "0-30", "cards": 1, "capital": 10.0},
+        {"bucket": "31-90", "cards": 1, "capital": 10.0},
+        {"bucket": "91+", "cards": 1, "capital": 10.0},
+    ]
+
+
+def test_summary_grouped_by_dimension():
+    conn = _make_db()
+    _seed(conn)
+    aging = AgingAnalytics(conn)
+
+    by_source = {r["group"]: r for r in aging.summary("source")}
+    assert by_source["eBay"]["sell_through_pct"] == round(2 / 3 * 100, 2)
+    assert by_source["LCS"]["sold"] == 0 and by_source["LCS"]["median_days_to_sell"] is None
+    assert {r["group"] for r in aging.summary("graded")} == {"Graded", "Raw"}
+    months = [r["group"] for r in aging.summary("purchase_month")]
+    assert months == sorted(months) and all(len(m) == 7 for m in months)
+    with pytest.raises(ValueError):
+        aging.summary("buyer_state")
+
+
+def test_stale_cards_and_cache_invalidation():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    aging = AgingAnalytics(conn)
+
+    assert [c["card_id"] for c in aging.stale_cards()] == [card_ids[4]]
+    assert aging.stale_cards()[0]["days_held"] == 200
+    assert [c["card_id"] for c in aging.stale_cards(min_days=30)] == [card_ids[4], card_ids[3]]
+
+    arrays = aging._arrays()
+    assert aging._arrays() is arrays
+    SaleRepository(conn).add({"card_id": card_ids[4], "sale_date": _days_ago(0), "sale_price": 5.0})
+    assert aging.stale_cards() == []
+
+
+def test_rebought_card_ages_its_open_lot():
+    conn = _make_db()
+    card_id = CardRepository(conn).add({"description": "Rebought", "sport": "Hockey"})
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": _days_ago(300), "purchase_price": 50.0},
+        {"card_id": card_id, "purchase_date": _days_ago(120), "purchase_price": 20.0},
+    ])
+    SaleRepository(conn).add({"card_id": card_id, "sale_date": _days_ago(200), "sale_price": 80.0})
+    aging = AgingAnalytics(conn)
+
+    overall = aging.summary()[0]
+    assert (overall["cards"], overall["sold"]) == (2, 1)
+    assert overall["median_days_to_sell"] == 100.0
+    assert overall["capital_held"] == 20.0
+    assert [(c["card_id"], c["days_held"], c["cost_basis"]) for c in aging.stale_cards()] == [
+        (card_id, 120, 20.0),
+    ]
+
+
+def test_bucket_edges_agree_with_stale_threshold():
+    conn = _make_db()
+    card_ids = CardRepository(conn).add_many([{"description": f"Card {d}"} for d in (90, 91)])
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": _days_ago(d), "purchase_price": 10.0}
+        for card_id, d in zip(card_ids, (90, 91))
+    ])
+    aging = AgingAnalytics(conn)
+    assert [b["cards"] for b in aging.buckets()] == [0, 1, 1]
+    assert [c["card_id"] for c in aging.stale_cards()] == [card_ids[1]]
+
+
+def test_empty_portfolio():
+    aging = AgingAnalytics(_make_db())
+    assert aging.summary()[0]["cards"] == 0
+    assert aging.stale_cards() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,7 +4,9 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from services.calculator import calculate_cost_basis, calculate_profit, get_per_order_fee
+from services.calculator import (
+    calculate_cost_basis, calculate_net_proceeds_batch, calculate_profit, get_per_order_fee,
+)
 
 
 def test_per_order_fee_low():
@@ -120,6 +122,19 @@ def test_negative_profit():
     assert result["roi_pct"] < 0
 
 
+def test_batch_net_proceeds_match_calculate_profit():
+    # Either side of the per-order threshold and the FVF cap (total = price + shipping)
+    prices = [0.0, 5.0, 10.0, 10.01, 49.99, 7495.99, 7496.0, 7496.01, 7500.0, 9000.0, 25000.0]
+    for shipping, international in [(4.0, True), (0.0, False)]:
+        batch = calculate_net_proceeds_batch(prices, shipping_charged=shipping, shipping_cost=3.5,
+                                             is_international=international)
+        expected = [
+            calculate_profit(p, shipping, 0.0, 3.5, is_international=international)["net_proceeds"]
+            for p in prices
+        ]
+        assert batch == expected
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, "-v"])
@@ -0,0 +1,158 @@
+"""Unit tests for the thread-aware connection manager and storage profiles."""
+
+import sys
+import os
+import queue
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.connection import ConnectionManager
+from database.profiles import PROFILES, checkpoint, get_pragmas, use_profile
+from database.repository import CardRepository
+from database.schema import initialize_database
+
+
+def _make_manager(tmp_path, read_pool_size=2):
+    db = ConnectionManager(str(tmp_path / "cards.db"), read_pool_size=read_pool_size)
+    initialize_database(db.writer)
+    return db
+
+
+def test_readers_are_read_only(tmp_path):
+    db = _make_manager(tmp_path)
+    try:
+        with db.read() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO cards (card_id, description) VALUES ('X', 'x')")
+    finally:
+        db.close()
+
+
+def test_readers_run_alongside_open_write_transaction(tmp_path):
+    db = _make_manager(tmp_path)
+    try:
+        CardRepository(db.writer).add({"description": "Committed"})
+        with db.write() as writer:
+            CardRepository(writer).add({"description": "Pending"})
+            with db.read() as conn:
+                rows = conn.execute("SELECT description FROM cards").fetchall()
+            assert [r["description"] for r in rows] == ["Committed"]
+
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 2
+    finally:
+        db.close()
+
+
+def test_read_pool_is_bounded_and_reused(tmp_path):
+    db = _make_manager(tmp_path, read_pool_size=1)
+    try:
+        with db.read() as first:
+            with pytest.raises(queue.Empty):
+                with db.read(timeout=0.05):
+                    pass
+        with db.read() as again:
+            assert again is first
+    finally:
+        db.close()
+
+
+def test_each_thread_gets_its_own_connection(tmp_path):
+    db = _make_manager(tmp_path)
+    seen = []
+
+    def worker():
+        conn = db.thread_connection()
+        assert db.thread_connection() is conn
+        CardRepository(conn).add({"description": threading.current_thread().name})
+        seen.append(conn)
+        db.release_thread_connection()
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(c) for c in seen}) == 3
+        assert db.writer not in seen
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 3
+    finally:
+        db.close()
+
+
+def test_write_serializes_threads_on_one_writer(tmp_path):
+    db = _make_manager(tmp_path)
+
+    def worker():
+        for _ in range(20):
+            with db.write() as conn:
+                CardRepository(conn).add({"description": "Threaded"})
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with db.read() as conn:
+            assert conn.execute("SELECT COUNT(DISTINCT card_id) FROM cards").fetchone()[0] == 80
+    finally:
+        db.close()
+
+
+def test_connections_use_their_profiles(tmp_path):
+    db = _make_manager(tmp_path)
+    try:
+        assert get_pragmas(db.writer)["cache_size"] == PROFILES["desktop"]["cache_size"]
+        with db.read() as conn:
+            assert get_pragmas(conn)["cache_size"] == PROFILES["analytics"]["cache_size"]
+    finally:
+        db.close()
+
+
+def test_use_profile_restores_previous_settings():
+    conn = sqlite3.connect(":memory:")
+    before = get_pragmas(conn)
+    with use_profile(conn, "bulk-import"):
+        assert get_pragmas(conn)["synchronous"] == 0
+        assert get_pragmas(conn)["wal_autocheckpoint"] == 0
+    assert get_pragmas(conn) == before
+
+
+def test_bulk_write_switches_profile_and_checkpoints(tmp_path):
+    db = _make_manager(tmp_path)
+    try:
+        with db.write(profile="bulk-import") as conn:
+            assert get_pragmas(conn)["wal_autocheckpoint"] == 0
+            CardRepository(conn).add_many([{"description": f"Card {i}"} for i in range(500)])
+        pragmas = get_pragmas(db.writer)
+        assert pragmas["wal_autocheckpoint"] == PROFILES["desktop"]["wal_autocheckpoint"]
+        assert pragmas["synchronous"] == 1  # NORMAL
+        assert db.checkpoint()["log_frames"] == db.checkpoint()["checkpointed"]
+    finally:
+        db.close()
+
+
+def test_close_truncates_wal(tmp_path):
+    db = _make_manager(tmp_path)
+    CardRepository(db.writer).add_many([{"description": f"Card {i}"} for i in range(200)])
+    wal = db.path + "-wal"
+    assert os.path.getsize(wal) > 0
+    db.close()
+    assert not os.path.exists(wal) or os.path.getsize(wal) == 0
+
+
+def test_checkpoint_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        checkpoint(sqlite3.connect(":memory:"), "EVENTUALLY")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,13 +2,17 @@
 
 import sys
 import os
+import csv
 import sqlite3
 import tempfile
+import threading
+
+import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from database.schema import initialize_database
-from services.csv_export import export_inventory, export_sales, export_comps
+from services.csv_export import ExportCancelled, export_inventory, export_sales, export_comps
 
 
 def _make_db():
@@ -70,6 +74,26 @@ def test_export_sales_creates_file():
         os.unlink(path)
 
 
+def test_export_sales_one_row_per_sale_with_lot_cost():
+    conn = _make_db()
+    conn.execute("INSERT INTO cards (card_id, description) VALUES ('CARD-000001', 'Graded Card')")
+    conn.executemany(
+        "INSERT INTO purchases (card_id, purchase_date, purchase_price, grading_cost) VALUES (?, ?, ?, ?)",
+        [("CARD-000001", "2025-01-15", 10.00, 0.0), ("CARD-000001", "2025-01-20", 0.0, 5.00)],
+    )
+    conn.execute("INSERT INTO sales (card_id, sale_date, sale_price, net_proceeds) "
+                 "VALUES ('CARD-000001', '2025-03-01', 60.00, 50.00)")
+    conn.commit()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_sales(conn, os.path.join(tmp, "sales.csv"))
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    assert float(rows[0]["total_cost_basis"]) == 15.0
+    assert float(rows[0]["net_profit"]) == 35.0
+    assert float(rows[0]["roi_pct"]) == 233.33
+
+
 def test_export_comps_creates_file():
     conn = _make_db()
     _seed_data(conn)
@@ -98,6 +122,43 @@ def test_export_empty_returns_empty_string():
         os.unlink(path)
 
 
+def _seed_comps(conn, n):
+    conn.executemany(
+        "INSERT INTO comps (search_query, title, sold_price, source) VALUES (?, ?, ?, 'manual')",
+        [("bulk", f"Comp {i}", float(i)) for i in range(n)],
+    )
+    conn.commit()
+
+
+def test_export_reports_progress_per_chunk():
+    conn = _make_db()
+    _seed_comps(conn, 25)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "comps.csv")
+        calls = []
+        export_comps(conn, path, progress=lambda done, total: calls.append((done, total)),
+                     chunk_size=10)
+        assert calls == [(10, 25), (20, 25), (25, 25)]
+        with open(path, "r") as f:
+            assert len(f.readlines()) == 26
+        assert os.listdir(tmp) == ["comps.csv"]
+
+
+def test_cancelled_export_leaves_no_file():
+    conn = _make_db()
+    _seed_comps(conn, 25)
+    cancel = threading.Event()
+
+    def progress(done, total):
+        if done >= 10:
+            cancel.set()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "comps.csv")
+        with pytest.raises(ExportCancelled):
+            export_comps(conn, path, progress=progress, cancel=cancel, chunk_size=10)
+        assert os.listdir(tmp) == []
+
+
 if __name__ == "__main__":
-    import pytest
     pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+"""Unit tests for the eBay Browse API client."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import requests
+
+from services.ebay_api import EbayApiClient, build_search_filter
+from services.ebay_cache import CachedEbayApiClient, ResponseCache
+from services.ebay_search import ConcurrentSearchExecutor
+from services.rate_limiter import TokenBucket
+from tests.mock_ebay_server import MockEbayServer
+
+
+class PagedClient(EbayApiClient):
+    """Serves `total` fake listings from memory instead of the network."""
+
+    def __init__(self, total):
+        super().__init__("id", "secret")
+        self.total = total
+        self.requests = []
+
+    def _get(self, path, params):
+        self.requests.append(dict(params))
+        offset, limit = params["offset"], params["limit"]
+        count = max(0, min(limit, self.total - offset))
+        page = {
+            "total": self.total,
+            "itemSummaries": [
+                {
+                    "itemId": f"v1|{i}|0",
+                    "title": f"Card {i}",
+                    "price": {"value": "9.99", "currency": "USD"},
+                    "itemEndDate": "2030-01-01T00:00:00.000Z",
+                    "shippingOptions": [{"shippingCost": {"value": "1.25", "currency": "USD"}}],
+                    "thumbnailImages": [{"imageUrl": "ignored"}],
+                }
+                for i in range(offset, offset + count)
+            ],
+        }
+        if offset + count < self.total:
+            page["next"] = f"{path}?offset={offset + count}"
+        return page
+
+
+def test_build_search_filter():
+    expr = build_search_filter(
+        price_min=10, price_max=50.5, buying_options=["FIXED_PRICE", "AUCTION"],
+        conditions=["USED"], condition_ids=[2750],
+    )
+    assert expr == (
+        "price:[10..50.5],priceCurrency:USD,buyingOptions:{FIXED_PRICE|AUCTION},"
+        "conditions:{USED},conditionIds:{2750}"
+    )
+
+
+def test_build_search_filter_open_range():
+    assert build_search_filter(price_min=5) == "price:[5..],priceCurrency:USD"
+    assert build_search_filter() == ""
+
+
+def test_iter_items_follows_pagination():
+    client = PagedClient(total=450)
+    items = list(client.iter_items("jokic", page_size=200))
+    assert len(items) == 450
+    assert [r["offset"] for r in client.requests] == [0, 200, 400]
+    assert items[0]["shipping_cost"] == 1.25
+    assert items[0]["end_time"] == "2030-01-01T00:00:00.000Z"
+
+
+def test_iter_items_is_lazy():
+    client = PagedClient(total=1000)
+    gen = client.iter_items("jokic", page_size=100)
+    next(gen)
+    assert len(client.requests) == 1
+
+
+def test_iter_items_passes_filter_and_respects_max_items():
+    client = PagedClient(total=1000)
+    items = list(client.iter_items("jokic", category_id="261328", page_size=200,
+                                   max_items=250, price_max=20, buying_options=["AUCTION"]))
+    assert len(items) == 250
+    assert client.requests[-1]["limit"] == 50
+    assert client.requests[0]["filter"] == "price:[..20],priceCurrency:USD,buyingOptions:{AUCTION}"
+    assert client.requests[0]["category_ids"] == "261328"
+
+
+def test_search_items_no_longer_capped_at_200():
+    client = PagedClient(total=600)
+    assert len(client.search_items("jokic", limit=500)) == 500
+
+
+def test_environment_accepts_base_url():
+    client = EbayApiClient("id", "secret", environment="http://127.0.0.1:9999/")
+    assert client.auth_url == "http://127.0.0.1:9999/identity/v1/oauth2/token"
+    assert client.browse_url == "http://127.0.0.1:9999/buy/browse/v1"
+    assert EbayApiClient("id", "secret", "sandbox").browse_url == EbayApiClient.SANDBOX_BROWSE_URL
+
+
+def test_search_against_mock_server():
+    with MockEbayServer(total_items=450) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        items = list(client.iter_items("Jokic Prizm", page_size=200))
+        assert len(items) == 450
+        assert len({i["item_id"] for i in items}) == 450
+        assert server.stats["token"] == 1
+        assert server.stats["search"] == 3
+
+
+def test_mock_server_applies_price_filter():
+    with MockEbayServer(total_items=200) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        items = client.search_items("jokic", limit=200, price_max=100, buying_options=["AUCTION"])
+        assert items
+        assert all(i["price"] <= 100 and i["buying_options"] == ["AUCTION"] for i in items)
+
+
+def test_throttled_requests_are_retried():
+    with MockEbayServer(total_items=10, rate_limit=1, retry_after=0.5) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        client.search_items("a")
+        client.search_items("b")  # second call inside the same second gets a 429 first
+        assert server.stats["throttled"] >= 1
+        assert server.stats["search"] == 2
+
+
+def test_persistent_server_errors_raise_after_retries():
+    with MockEbayServer(total_items=10, error_rate=1.0) as server:
+        client = EbayApiClient("id", "secret", environment=server.url,
+                               max_retries=2, retry_backoff=0.01)
+        try:
+            client.search_items("a")
+            assert False, "expected HTTPError"
+        except requests.HTTPError:
+            pass
+        assert server.stats["errors"] == 3
+
+
+def test_concurrent_executor_against_mock_server():
+    with MockEbayServer(total_items=20, latency=0.05) as server:
+        client = EbayApiClient("id", "secret", environment=server.url,
+                               rate_limiter=TokenBucket(rate=200, capacity=20))
+        executor = ConcurrentSearchExecutor(client, max_workers=8)
+        results = list(executor.search_many([f"player {i}" for i in range(40)], limit=20))
+        assert len(results) == 40
+        assert all(r["error"] is None and len(r["items"]) == 20 for r in results)
+
+
+def test_cached_client_revalidates_with_etag_against_mock_server():
+    clock = [1000.0]
+    cache = ResponseCache(":memory:", stale_seconds=0, clock=lambda: clock[0])
+    with MockEbayServer(total_items=10) as server:
+        client = CachedEbayApiClient("id", "secret", environment=server.url, cache=cache)
+        first = client.search_items("jokic")
+        client.search_items("jokic")
+        assert server.stats["search"] == 1
+
+        clock[0] += 10_000
+        assert client.search_items("jokic") == first
+        assert server.stats["not_modified"] == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+"""Unit tests for the eBay response cache and single-flight coalescing."""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from services.ebay_cache import CachedEbayApiClient, ResponseCache, SingleFlight
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, etag=None):
+        self._body = body
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._body
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubCachedClient(CachedEbayApiClient):
+    def __init__(self, cache, delay=0.0, etag=None):
+        super().__init__("id", "secret", cache=cache)
+        self.delay = delay
+        self.etag = etag
+        self.sent = []
+        self.sent_event = threading.Event()
+
+    def _send(self, path, params, headers=None):
+        self.sent.append(headers)
+        time.sleep(self.delay)
+        self.sent_event.set()
+        if headers and headers.get("If-None-Match") == self.etag:
+            return FakeResponse(None, status_code=304)
+        return FakeResponse({"total": 1, "itemSummaries": [{"itemId": str(len(self.sent))}]},
+                            etag=self.etag)
+
+
+def _make_cache(clock=None):
+    return ResponseCache(":memory:", ttls={"/item_summary/search": 600},
+                         stale_seconds=3600, clock=clock or FakeClock())
+
+
+def test_repeat_search_is_served_from_cache():
+    client = StubCachedClient(_make_cache())
+    first = client.search_items("Jokic  Prizm")
+    second = client.search_items("jokic prizm")
+    assert first == second
+    assert len(client.sent) == 1
+    stats = client.cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate_pct"] == 50.0
+
+
+def test_different_params_get_different_entries():
+    client = StubCachedClient(_make_cache())
+    client.search_items("jokic", limit=10)
+    client.search_items("jokic", limit=20)
+    assert len(client.sent) == 2
+
+
+def test_stale_entry_served_while_revalidating():
+    clock = FakeClock()
+    client = StubCachedClient(_make_cache(clock))
+    original = client.search_items("jokic")
+
+    clock.now += 601
+    client.sent_event.clear()
+    stale = client.search_items("jokic")
+    assert stale == original
+    assert client.sent_event.wait(2)
+
+    # Wait for the background refresh to land, then the next read is fresh again
+    deadline = time.time() + 2
+    while client.cache.stats()["revalidations"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert client.search_items("jokic")[0]["item_id"] == "2"
+    assert client.cache_stats()["stale_hits"] == 1
+
+
+def test_expired_beyond_stale_window_refetches_with_etag():
+    clock = FakeClock()
+    client = StubCachedClient(_make_cache(clock), etag='"abc"')
+    client.search_items("jokic")
+
+    clock.now += 600 + 3600 + 1
+    items = client.search_items("jokic")
+    assert items[0]["item_id"] == "1"  # 304 keeps the cached body
+    assert client.sent[-1] == {"If-None-Match": '"abc"'}
+    assert client.cache_stats()["not_modified"] == 1
+
+
+def test_concurrent_identical_searches_are_coalesced():
+    client = StubCachedClient(_make_cache(), delay=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.search_items("jokic")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 5
+    assert len(client.sent) == 1
+    assert client.cache_stats()["coalesced"] == 4
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("nope")
+
+    try:
+        flight.do("k", boom)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert not flight.in_flight("k")
+
+
+def test_purge_removes_entries_past_stale_window():
+    clock = FakeClock()
+    cache = _make_cache(clock)
+    cache.store("k", "/item_summary/search", {"q": "x"}, "EBAY_US", {"a": 1})
+    clock.now += 600 + 3600 + 1
+    assert cache.purge() == 1
+    assert cache.lookup("k") is None
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""Unit tests for rate limiting, quota ledger and concurrent eBay search."""
+
+import sys
+import os
+import sqlite3
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.schema import initialize_database
+from services.ebay_search import ConcurrentSearchExecutor
+from services.rate_limiter import DailyQuotaLedger, QuotaExceededError, TokenBucket
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    initialize_database(conn)
+    return conn
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StubClient:
+    """Stands in for EbayApiClient: one quota unit per search, optional failures."""
+
+    def __init__(self, ledger=None, fail_on=()):
+        self.quota_ledger = ledger
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search_items(self, query, category_id=None, limit=25, sort="price"):
+        if self.quota_ledger is not None:
+            self.quota_ledger.consume()
+        with self._lock:
+            self.calls += 1
+        if query in self.fail_on:
+            raise RuntimeError(f"boom: {query}")
+        return [{"item_id": f"{query}-1", "title": query, "price": 1.0}]
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    bucket.acquire()
+    assert clock.now == 0.5  # one token at 2/sec
+
+
+def test_token_bucket_timeout():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    assert bucket.acquire(timeout=0.25) is False
+
+
+def test_quota_ledger_persists_and_enforces_limit():
+    conn = _make_db()
+    ledger = DailyQuotaLedger(conn, daily_limit=3, today=lambda: "2026-01-01")
+    ledger.consume(2)
+    ledger.flush()
+
+    reloaded = DailyQuotaLedger(conn, daily_limit=3, today=lambda: "2026-01-01")
+    assert reloaded.used == 2
+    reloaded.consume()
+    try:
+        reloaded.consume()
+        assert False, "expected QuotaExceededError"
+    except QuotaExceededError:
+        pass
+
+
+def test_quota_ledger_rolls_over_each_day():
+    conn = _make_db()
+    day = ["2026-01-01"]
+    ledger = DailyQuotaLedger(conn, daily_limit=1, today=lambda: day[0])
+    ledger.consume()
+    day[0] = "2026-01-02"
+    assert ledger.remaining == 1
+    ledger.consume()
+    ledger.flush()
+    rows = conn.execute("SELECT day, calls FROM api_quota_ledger ORDER BY day").fetchall()
+    assert [tuple(r) for r in rows] == [("2026-01-01", 1), ("2026-01-02", 1)]
+
+
+def test_search_many_yields_every_query():
+    client = StubClient(fail_on={"q3"})
+    executor = ConcurrentSearchExecutor(client, max_workers=4)
+    queries = [f"q{i}" for i in range(20)]
+
+    results = list(executor.search_many(queries))
+
+    assert sorted(r["query"] for r in results) == sorted(queries)
+    failed = [r for r in results if r["error"]]
+    assert len(failed) == 1 and failed[0]["query"] == "q3"
+    assert client.calls == 20
+
+
+def test_search_many_stops_sending_when_quota_exhausted():
+    conn = _make_db()
+    ledger = DailyQuotaLedger(conn, daily_limit=5, today=lambda: "2026-01-01")
+    client = StubClient(ledger=ledger)
+    executor = ConcurrentSearchExecutor(client, max_workers=1)
+
+    results = list(executor.search_many([f"q{i}" for i in range(10)]))
+
+    assert len(results) == 10
+    assert sum(1 for r in results if r["error"] is None) == 5
+    assert conn.execute("SELECT calls FROM api_quota_ledger").fetchone()[0] == 5
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
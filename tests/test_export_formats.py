@@ -0,0 +1,161 @@
+"""Unit tests for the pluggable export formats."""
+
+import sys
+import os
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.schema import initialize_database
+from services.csv_export import export_comps, export_inventory, export_sales
+from services.export_formats import (
+    FORMATS, _ArrowFormat, _schema_fields, available_formats, format_for_path, get_format,
+)
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _seed(conn, comps=25):
+    conn.executemany(
+        """INSERT INTO comps (search_query, title, sold_price, sold_date, source)
+           VALUES ('bulk', ?, ?, '2025-01-20', 'manual')""",
+        [(f"Comp, \"{i}\"", i + 0.5) for i in range(comps)],
+    )
+    # Unsold cards first in export order: their sale columns are all NULL
+    conn.execute("INSERT INTO cards (card_id, description, year, created_at) "
+                 "VALUES ('CARD-000001', 'Sold Card', 2020, '2025-01-01')")
+    conn.execute("INSERT INTO cards (card_id, description, created_at) "
+                 "VALUES ('CARD-000002', 'Unsold Card', '2025-02-01')")
+    conn.execute("INSERT INTO purchases (card_id, purchase_date, purchase_price) "
+                 "VALUES ('CARD-000001', '2025-01-15', 10.0)")
+    conn.execute("INSERT INTO sales (card_id, sale_date, sale_price, net_proceeds) "
+                 "VALUES ('CARD-000001', '2025-02-01', 50.0, 42.97)")
+    conn.commit()
+
+
+def test_format_for_path():
+    assert format_for_path("out.csv") == "csv"
+    assert format_for_path("OUT.CSV.GZ") == "csv.gz"
+    assert format_for_path("out.jsonl.gz") == "jsonl.gz"
+    assert format_for_path("out.parquet") == "parquet"
+    assert format_for_path("out.txt") == "csv"
+    assert {"csv", "csv.gz", "jsonl", "jsonl.gz"} <= set(available_formats())
+    with pytest.raises(ValueError):
+        get_format("xlsx")
+
+
+def test_gzip_csv_matches_plain_csv():
+    conn = _make_db()
+    _seed(conn)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = export_comps(conn, os.path.join(tmp, "comps.csv"), chunk_size=10)
+        packed = export_comps(conn, os.path.join(tmp, "comps.csv.gz"), chunk_size=10)
+        with open(plain, newline="", encoding="utf-8") as f:
+            expected = f.read()
+        with gzip.open(packed, "rt", newline="", encoding="utf-8") as f:
+            assert f.read() == expected
+        rows = list(csv.reader(io.StringIO(expected)))
+        assert len(rows) == 26
+        assert 'Comp, "0"' in {row[1] for row in rows}
+
+
+def test_jsonl_rows_are_objects():
+    conn = _make_db()
+    _seed(conn)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_sales(conn, os.path.join(tmp, "sales"), fmt="jsonl")
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+    assert len(rows) == 1
+    assert rows[0]["card_id"] == "CARD-000001"
+    assert rows[0]["net_profit"] == 32.97
+
+
+def test_unavailable_format_is_rejected_before_writing():
+    conn = _make_db()
+    _seed(conn)
+    name = next(iter(FORMATS))
+    factory, _available = FORMATS[name]
+    FORMATS[name] = (factory, False)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            with pytest.raises(ValueError):
+                export_comps(conn, os.path.join(tmp, "comps.out"), fmt=name)
+            assert os.listdir(tmp) == []
+    finally:
+        FORMATS[name] = (factory, True)
+
+
+def test_arrow_schema_from_declared_and_inferred_types():
+    # Pure type mapping: runs whether or not pyarrow is installed
+    columns = ["year", "sale_price", "title", "computed_int", "computed_mixed", "computed_null"]
+    types = ["INTEGER", "REAL", "TEXT", None, None, None]
+    data = [(2020, None), (None, None), ("a", None), (1, True), (1, 2.5), (None, None)]
+    assert _schema_fields(columns, types, data) == [
+        ("year", "int64"), ("sale_price", "float64"), ("title", "string"),
+        ("computed_int", "int64"), ("computed_mixed", "float64"), ("computed_null", "string"),
+    ]
+    with pytest.raises(TypeError):
+        _ArrowFormat("out.arrow")
+
+
+def test_zstd_csv():
+    zstandard = pytest.importorskip("zstandard")
+    conn = _make_db()
+    _seed(conn)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_comps(conn, os.path.join(tmp, "comps.csv.zst"))
+        with open(path, "rb") as f:
+            text = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+    assert text.splitlines()[0].startswith("search_query,title,sold_price")
+    assert len(text.splitlines()) == 26
+
+
+def test_parquet_has_typed_columns_and_row_groups():
+    pq = pytest.importorskip("pyarrow.parquet")
+    conn = _make_db()
+    _seed(conn, comps=25)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_comps(conn, os.path.join(tmp, "comps.parquet"), chunk_size=10)
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == 25
+        assert parquet.metadata.num_row_groups == 3
+        schema = parquet.schema_arrow
+        assert str(schema.field("sold_price").type) == "double"
+        assert str(schema.field("title").type) == "string"
+
+        # Columns NULL throughout the first chunk still get their declared type
+        path = export_inventory(conn, os.path.join(tmp, "inventory.parquet"), chunk_size=1)
+        table = pq.read_table(path)
+        assert str(table.schema.field("sale_price").type) == "double"
+        assert str(table.schema.field("year").type) == "int64"
+        assert table.column("sale_price").to_pylist() == [None, 50.0]
+
+
+def test_arrow_ipc():
+    pa = pytest.importorskip("pyarrow")
+    conn = _make_db()
+    _seed(conn)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_sales(conn, os.path.join(tmp, "sales.arrow"))
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+    assert table.num_rows == 1
+    assert str(table.schema.field("roi_pct").type) == "double"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""Unit tests for background export jobs."""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.connection import ConnectionManager
+from database.schema import initialize_database
+from services.export_jobs import ExportJobRunner
+
+
+def _make_db_file(comps=0):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    initialize_database(conn)
+    conn.executemany(
+        "INSERT INTO comps (search_query, title, sold_price) VALUES ('bulk', ?, ?)",
+        [(f"Comp {i}", float(i)) for i in range(comps)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _cleanup(db, path):
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _wait_for(runner, jobs, timeout=10.0):
+    """Poll like the GUI's after() loop until every job has finished."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        runner.poll()
+        if all(job.finished for job in jobs):
+            return
+        time.sleep(0.01)
+    raise AssertionError("export jobs did not finish")
+
+
+def test_queued_exports_run_in_background():
+    path = _make_db_file(comps=12_000)
+    db = ConnectionManager(path)
+    updates = []
+    runner = ExportJobRunner(db, on_update=lambda job: updates.append(
+        (job.id, job.status, threading.current_thread() is threading.main_thread())))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            comps = runner.submit("comps", os.path.join(tmp, "comps.csv"))
+            sales = runner.submit("sales", os.path.join(tmp, "sales.csv"))
+            _wait_for(runner, [comps, sales])
+
+            assert comps.status == "done"
+            assert comps.rows_written == comps.total_rows == 12_000
+            assert comps.progress_pct == 100.0
+            assert sales.status == "empty"
+            assert os.listdir(tmp) == ["comps.csv"]
+            # Every callback ran on the polling (main) thread
+            assert all(on_main for _id, _status, on_main in updates)
+            assert (comps.id, "done", True) in updates
+            assert runner.active_jobs() == []
+    finally:
+        runner.stop()
+        _cleanup(db, path)
+
+
+def test_cancel_before_start_and_unknown_kind():
+    path = _make_db_file(comps=10)
+    db = ConnectionManager(path)
+    runner = ExportJobRunner(db)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Hold the worker on a full read pool so the second job is still queued
+            readers = [db.read() for _ in range(db.read_pool_size)]
+            for reader in readers:
+                reader.__enter__()
+            first = runner.submit("comps", os.path.join(tmp, "a.csv"))
+            second = runner.submit("comps", os.path.join(tmp, "b.csv"))
+            runner.cancel(second.id)
+            for reader in readers:
+                reader.__exit__(None, None, None)
+            _wait_for(runner, [first, second])
+
+            assert first.status == "done"
+            assert second.status == "cancelled"
+            assert os.listdir(tmp) == ["a.csv"]
+        with pytest.raises(ValueError):
+            runner.submit("cards", "x.csv")
+    finally:
+        runner.stop()
+        _cleanup(db, path)
+
+
+def test_failed_export_reports_error():
+    path = _make_db_file(comps=5)
+    db = ConnectionManager(path)
+    runner = ExportJobRunner(db)
+    try:
+        job = runner.submit("comps", os.path.join(path + "-missing-dir", "comps.csv"))
+        _wait_for(runner, [job])
+        assert job.status == "failed"
+        assert job.error
+    finally:
+        runner.stop()
+        _cleanup(db, path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
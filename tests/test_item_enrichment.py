@@ -0,0 +1,95 @@
+"""Unit tests for batched item-detail enrichment."""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.schema import initialize_database
+from services.ebay_api import EbayApiClient
+from services.item_enrichment import ItemEnricher, parse_item_specifics
+from services.rate_limiter import TokenBucket
+from tests.mock_ebay_server import MockEbayServer
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    initialize_database(conn)
+    return conn
+
+
+def test_parse_item_specifics():
+    item = {
+        "itemId": "v1|1|0",
+        "title": "2018 Prizm Luka Doncic Silver 12/25 PSA 10",
+        "localizedAspects": [
+            {"name": "Professional Grader", "value": "Professional Sports Authenticator (PSA)"},
+            {"name": "Grade", "value": "10"},
+            {"name": "Season", "value": "2018-19"},
+            {"name": "Player/Athlete", "value": "Luka Doncic"},
+        ],
+        "shippingOptions": [{"shippingCost": {"value": "0.00", "currency": "USD"}}],
+    }
+    specifics = parse_item_specifics(item)
+    assert specifics["grader"] == "PSA"
+    assert specifics["grade"] == "10"
+    assert specifics["serial_number"] == "12/25"  # taken from the title
+    assert specifics["year"] == 2018
+    assert specifics["player_name"] == "Luka Doncic"
+    assert specifics["shipping_cost"] == 0.0
+
+
+def test_get_items_rejects_oversized_batch():
+    client = EbayApiClient("id", "secret")
+    try:
+        client.get_items([str(i) for i in range(21)])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_enrich_batches_and_caches_by_item_id():
+    conn = _make_db()
+    ids = [f"v1|{i}|0" for i in range(45)]
+    with MockEbayServer() as server:
+        client = EbayApiClient("id", "secret", environment=server.url,
+                               rate_limiter=TokenBucket(rate=100, capacity=10))
+        enricher = ItemEnricher(client, conn)
+
+        details = enricher.enrich(ids + ids[:5])
+        assert len(details) == 45
+        assert server.stats["get_items"] == 3  # 20 + 20 + 5
+
+        enricher.enrich(ids)
+        assert server.stats["get_items"] == 3
+
+    stored = conn.execute("SELECT COUNT(*) FROM item_details").fetchone()[0]
+    assert stored == 45
+
+
+def test_expired_details_are_refetched():
+    conn = _make_db()
+    now = [1000.0]
+    with MockEbayServer() as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        enricher = ItemEnricher(client, conn, ttl=60, clock=lambda: now[0])
+        enricher.enrich(["v1|1|0"])
+        now[0] += 61
+        enricher.enrich(["v1|1|0"])
+        assert server.stats["get_items"] == 2
+
+
+def test_enrich_listings_attaches_specifics():
+    conn = _make_db()
+    with MockEbayServer(total_items=30) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        listings = client.search_items("jokic", limit=30)
+        ItemEnricher(client, conn).enrich_listings(listings)
+    assert all(listing["specifics"]["player_name"] == "Nikola Jokic" for listing in listings)
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
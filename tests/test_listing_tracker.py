@@ -0,0 +1,101 @@
+"""Unit tests for the active-listing snapshot tracker."""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.schema import initialize_database
+from services.ebay_api import EbayApiClient
+from services.listing_tracker import ListingTracker, diff_snapshots, inferred_sale_confidence
+from tests.mock_ebay_server import MockEbayServer
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def test_diff_snapshots():
+    listed, delisted, changed = diff_snapshots(
+        {"a": 10.0, "b": 20.0, "c": 30.0},
+        {"b": 20.0, "c": 25.0, "d": 5.0},
+    )
+    assert listed == {"d"}
+    assert delisted == {"a"}
+    assert changed == {"c"}
+
+
+def test_inferred_sale_confidence():
+    early = "2026-01-01T00:00:00Z"
+    end = "2026-01-05T00:00:00.000Z"
+    assert inferred_sale_confidence(["FIXED_PRICE"], end, early) == 0.75
+    assert inferred_sale_confidence(["FIXED_PRICE", "BEST_OFFER"], end, early) == 0.85
+    assert inferred_sale_confidence(["AUCTION"], end, early) == 0.35
+    assert inferred_sale_confidence(["AUCTION"], end, "2026-01-06T00:00:00Z") is None
+
+
+def test_poll_records_only_diffs_and_infers_sales():
+    conn = _make_db()
+    with MockEbayServer(total_items=40) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        tracker = ListingTracker(conn, client, clock=lambda: "2026-01-01T00:00:00Z")
+        watch_id = tracker.watch("jokic prizm")
+
+        first = tracker.poll(watch_id)
+        assert first == {"listed": 40, "price_changed": 0, "delisted": 0, "inferred_sold": 0}
+
+        # Unchanged poll writes no events
+        assert tracker.poll(watch_id)["listed"] == 0
+        assert conn.execute("SELECT COUNT(*) FROM listing_events").fetchone()[0] == 40
+
+        items = client.search_items("jokic prizm", limit=40)
+        server.removed_items.update({items[0]["item_id"], items[1]["item_id"]})
+        server.price_overrides[items[2]["item_id"]] = 1.23
+
+        third = tracker.poll(watch_id)
+        assert third == {"listed": 0, "price_changed": 1, "delisted": 2, "inferred_sold": 2}
+
+    assert conn.execute("SELECT COUNT(*) FROM listing_snapshots").fetchone()[0] == 38
+    inferred = tracker.get_inferred_sales(watch_id)
+    assert len(inferred) == 2
+    comps = conn.execute("SELECT source FROM comps").fetchall()
+    assert [c[0] for c in comps] == ["inferred", "inferred"]
+
+
+def test_listing_past_end_time_is_not_inferred_sold():
+    conn = _make_db()
+    now = ["2026-01-01T00:00:00Z"]
+    with MockEbayServer(total_items=5) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        tracker = ListingTracker(conn, client, clock=lambda: now[0])
+        watch_id = tracker.watch("jokic")
+        tracker.poll(watch_id)
+
+        server.total_items = 4
+        now[0] = "2100-01-01T00:00:00Z"
+        summary = tracker.poll(watch_id)
+    assert summary["delisted"] == 1
+    assert summary["inferred_sold"] == 0
+
+
+def test_poll_all_covers_every_watch():
+    conn = _make_db()
+    with MockEbayServer(total_items=10) as server:
+        client = EbayApiClient("id", "secret", environment=server.url)
+        tracker = ListingTracker(conn, client)
+        tracker.watch("jokic")
+        tracker.watch("luka", price_max=100)
+        totals = tracker.poll_all()
+    assert totals["watches"] == 2
+    assert totals["errors"] == 0
+    assert totals["listed"] > 10
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""Unit tests for lot intake and cost-basis allocation."""
+
+import sys
+import os
+import sqlite3
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.repository import CompRepository
+from database.schema import initialize_database
+from services.lot_intake import LotIntake, allocate_cents
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def test_allocate_cents_sums_exactly():
+    assert allocate_cents(100.0, [1, 1, 1]) == [33.34, 33.33, 33.33]
+    assert allocate_cents(10.0, [3, 1]) == [7.5, 2.5]
+    # Leftover cents go to the largest remainders, not simply the first cards
+    assert allocate_cents(0.07, [2, 6, 2]) == [0.02, 0.04, 0.01]
+    # All-zero weights fall back to an equal split
+    assert allocate_cents(1.0, [0, 0]) == [0.5, 0.5]
+
+    parts = allocate_cents(400.0, [0.37 * (i % 7 + 1) for i in range(1000)])
+    assert round(sum(parts) * 100) == 40000
+    assert all(p >= 0 for p in parts)
+
+
+def test_allocate_cents_rejects_bad_weights():
+    with pytest.raises(ValueError):
+        allocate_cents(10.0, [])
+    with pytest.raises(ValueError):
+        allocate_cents(10.0, [1, -1])
+
+
+def test_market_weights_use_comps_with_fallback():
+    conn = _make_db()
+    CompRepository(conn).add_many([
+        {"search_query": "Jokic Prizm", "title": "a", "sold_price": 30.0},
+        {"search_query": "jokic prizm ", "title": "b", "sold_price": 50.0},
+        {"search_query": "Curry Select", "title": "c", "sold_price": 10.0},
+    ])
+    intake = LotIntake(conn)
+    cards = [{"description": "Jokic Prizm"}, {"description": "Curry Select"},
+             {"description": "Common"}]
+    # Jokic median 40, Curry 10, Common takes the median of valued cards (25)
+    assert intake.weights(cards) == [40.0, 10.0, 25.0]
+
+    plan = intake.plan(cards, purchase_price=75.0, sales_tax_paid=6.0, shipping_paid=0.01)
+    assert [p["purchase_price"] for p in plan] == [40.0, 10.0, 25.0]
+    assert [p["sales_tax_paid"] for p in plan] == [3.2, 0.8, 2.0]
+    assert sum(p["shipping_paid"] for p in plan) == 0.01
+
+
+def test_equal_and_manual_methods():
+    intake = LotIntake(_make_db())
+    cards = [{"description": f"Card {i}"} for i in range(3)]
+    assert intake.weights(cards) == [1.0, 1.0, 1.0]  # no comps: equal split
+    assert intake.weights(cards, "equal") == [1.0, 1.0, 1.0]
+    assert intake.weights(cards, "manual", [5, 3, 2]) == [5.0, 3.0, 2.0]
+    with pytest.raises(ValueError):
+        intake.weights(cards, "manual", [1, 2])
+    with pytest.raises(ValueError):
+        intake.weights(cards, "random")
+
+
+def test_intake_writes_cards_and_purchases():
+    conn = _make_db()
+    intake = LotIntake(conn)
+    cards = [{"description": f"Show Card {i}", "sport": "Baseball"} for i in range(50)]
+    card_ids = intake.intake(cards, 400.0, "2025-06-01", sales_tax_paid=33.0,
+                             shipping_paid=12.5, source="Card Show", method="equal")
+
+    assert len(card_ids) == 50
+    totals = conn.execute(
+        """
+        SELECT COUNT(*), SUM(purchase_price), SUM(sales_tax_paid), SUM(shipping_paid),
+               SUM(total_cost_basis)
+        FROM purchases WHERE source = 'Card Show'
+        """
+    ).fetchone()
+    assert totals[0] == 50
+    assert round(totals[1], 2) == 400.0
+    assert round(totals[2], 2) == 33.0
+    assert round(totals[3], 2) == 12.5
+    assert round(totals[4], 2) == 445.5
+    ledger = conn.execute("SELECT cards_purchased, total_invested FROM portfolio_totals").fetchone()
+    assert ledger[0] == 50
+    assert round(ledger[1], 2) == 445.5
+    assert not conn.in_transaction
+
+
+def test_failed_intake_writes_nothing():
+    conn = _make_db()
+    cards = [{"description": "Good"}, {"description": None}]
+    with pytest.raises(Exception):
+        LotIntake(conn).intake(cards, 10.0, "2025-06-01", method="equal")
+    assert conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM purchases").fetchone()[0] == 0
+
+
+def test_large_lot_allocation_is_fast():
+    weights = [float(i % 97 + 1) for i in range(100_000)]
+    start = time.perf_counter()
+    parts = allocate_cents(123_456.78, weights)
+    assert time.perf_counter() - start < 1.0
+    assert round(sum(parts) * 100) == 12_345_678
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
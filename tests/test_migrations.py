@@ -0,0 +1,120 @@
+"""Unit tests for schema migrations and hot-path query plans."""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.migrations import MIGRATIONS, get_version, migrate
+from database.schema import initialize_database
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _plan(conn, sql, params=()):
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(row["detail"] for row in rows)
+
+
+def test_initialize_applies_all_migrations():
+    conn = _make_db()
+    assert get_version(conn) == max(m[0] for m in MIGRATIONS)
+    assert migrate(conn) == []  # idempotent
+
+
+def test_failed_migration_rolls_back():
+    conn = _make_db()
+    version = get_version(conn)
+    broken = MIGRATIONS + [(version + 1, "broken", [
+        "CREATE TABLE scratch (id INTEGER)",
+        "INSERT INTO missing_table VALUES (1)",
+    ])]
+    try:
+        migrate(conn, broken)
+        assert False, "expected OperationalError"
+    except sqlite3.OperationalError:
+        pass
+    assert get_version(conn) == version
+    assert conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'scratch'"
+    ).fetchone()[0] == 0
+
+
+def test_callable_steps_run_in_order():
+    conn = _make_db()
+    version = get_version(conn)
+    seen = []
+    migrate(conn, MIGRATIONS + [(version + 1, "data", [lambda c: seen.append(get_version(c))])])
+    assert seen == [version]
+    assert get_version(conn) == version + 1
+
+
+def test_card_lookups_use_indexes():
+    conn = _make_db()
+    assert "idx_purchases_card_id" in _plan(conn, "SELECT * FROM purchases WHERE card_id = ?", ("x",))
+    assert "idx_sales_card_id" in _plan(conn, "SELECT * FROM sales WHERE card_id = ?", ("x",))
+
+
+def test_sales_by_date_uses_index():
+    conn = _make_db()
+    plan = _plan(conn, "SELECT * FROM sales ORDER BY sale_date DESC")
+    assert "idx_sales_sale_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_comps_by_query_and_age_use_index():
+    conn = _make_db()
+    plan = _plan(
+        conn,
+        "SELECT * FROM comps WHERE search_query = ? AND fetched_at >= datetime('now', '-90 days')",
+        ("jokic",),
+    )
+    assert "idx_comps_query_fetched" in plan
+
+
+def test_cards_by_status_sorted_without_temp_sort():
+    conn = _make_db()
+    plan = _plan(conn, "SELECT * FROM cards WHERE status = ? ORDER BY created_at DESC", ("Sold",))
+    assert "idx_cards_status_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_inventory_join_searches_purchases_and_sales_by_index():
+    conn = _make_db()
+    plan = _plan(conn, """
+        SELECT c.card_id, p.total_cost_basis, s.net_proceeds
+        FROM cards c
+        LEFT JOIN purchases p ON c.card_id = p.card_id
+        LEFT JOIN sales s ON c.card_id = s.card_id
+    """)
+    assert "SEARCH p USING INDEX idx_purchases_card_id" in plan
+    assert "SEARCH s USING INDEX idx_sales_card_id" in plan
+
+
+def test_keyset_pages_seek_through_indexes():
+    conn = _make_db()
+    plan = _plan(
+        conn,
+        "SELECT * FROM cards WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 50",
+        ("2026-01-01", 10),
+    )
+    assert "idx_cards_created" in plan and "TEMP B-TREE" not in plan
+    plan = _plan(
+        conn,
+        "SELECT * FROM purchases WHERE (purchase_date, id) < (?, ?) "
+        "ORDER BY purchase_date DESC, id DESC LIMIT 50",
+        ("2026-01-01", 10),
+    )
+    assert "idx_purchases_date" in plan and "TEMP B-TREE" not in plan
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+"""Unit tests for the multi-dimensional realized P&L cube."""
+
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from services.pnl_cube import PnLCube
+from services.roi_tracker import ROITracker
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _sell(conn, sport, player, source, platform, sale_date, cost, net, fees=0.0):
+    card_id = CardRepository(conn).add({
+        "description": f"{player} card", "sport": sport, "player_name": player,
+        "set_name": "Prizm", "year": 2020,
+    })
+    PurchaseRepository(conn).add({
+        "card_id": card_id, "purchase_date": "2024-01-01", "purchase_price": cost, "source": source,
+    })
+    SaleRepository(conn).add({
+        "card_id": card_id, "sale_date": sale_date, "sale_price": net + fees,
+        "total_fees": fees, "net_proceeds": net, "platform": platform,
+    })
+    return card_id
+
+
+def _seed(conn):
+    _sell(conn, "Basketball", "LeBron James", "eBay", "eBay", "2024-03-05", 10.0, 30.0, 5.0)
+    _sell(conn, "Basketball", "LeBron James", "LCS", "eBay", "2024-04-10", 20.0, 25.0, 5.0)
+    _sell(conn, "Baseball", "Shohei Ohtani", "eBay", "COMC", "2024-04-20", 50.0, 40.0, 10.0)
+
+
+def test_group_by_dimensions():
+    conn = _make_db()
+    _seed(conn)
+    cube = PnLCube(conn)
+
+    total = cube.query()[0]
+    assert total["sales"] == 3
+    assert total["cost_basis"] == 80.0
+    assert total["profit"] == 15.0
+    assert total["roi_pct"] == 18.75
+    assert total["fee_share_pct"] == 17.39  # 20 fees on 115 revenue
+
+    by_sport = {r["sport"]: r for r in cube.query(["sport"])}
+    assert by_sport["Basketball"]["profit"] == 25.0
+    assert by_sport["Baseball"]["profit"] == -10.0
+    assert by_sport["Baseball"]["roi_pct"] == -20.0
+
+    rows = cube.query(["player", "month"])
+    assert [(r["player"], r["month"], r["profit"]) for r in rows] == [
+        ("LeBron James", "2024-03", 20.0),
+        ("LeBron James", "2024-04", 5.0),
+        ("Shohei Ohtani", "2024-04", -10.0),
+    ]
+    assert {r["source"] for r in cube.query(["source", "year", "set"])} == {"eBay", "LCS"}
+
+
+def test_filters():
+    conn = _make_db()
+    _seed(conn)
+    cube = PnLCube(conn)
+
+    rows = cube.query(["platform"], where={"month": "2024-04"})
+    assert {r["platform"]: r["sales"] for r in rows} == {"eBay": 1, "COMC": 1}
+    rows = cube.query(where={"source": ["eBay", "LCS"], "sport": "Basketball"})
+    assert rows[0]["sales"] == 2
+    assert cube.query(where={"sport": "Hockey"}) == []
+
+    with pytest.raises(ValueError):
+        cube.query(["color"])
+    with pytest.raises(ValueError):
+        cube.query(where={"color": "red"})
+
+
+def test_new_sales_patch_cached_results():
+    conn = _make_db()
+    _seed(conn)
+    cube = PnLCube(conn)
+    cube.query(["sport"])
+    cube.query(where={"sport": "Baseball"})
+    assert cube.stats()["cached_queries"] == 2
+
+    _sell(conn, "Basketball", "Luka Doncic", "eBay", "eBay", "2024-05-01", 5.0, 15.0)
+    assert cube.refresh() == 1
+    # Cached results survive the new sale and are updated in place
+    assert cube.stats()["cached_queries"] == 2
+    by_sport = {r["sport"]: r for r in cube.query(["sport"])}
+    assert by_sport["Basketball"]["sales"] == 3
+    assert by_sport["Basketball"]["profit"] == 35.0
+    assert cube.query(where={"sport": "Baseball"})[0]["profit"] == -10.0
+
+    _sell(conn, "Hockey", "Connor McDavid", "eBay", "eBay", "2024-05-02", 5.0, 8.0)
+    assert cube.query(where={"sport": "Hockey"})[0]["profit"] == 3.0
+    assert cube.refresh() == 0
+
+
+def test_edited_or_deleted_sales_rebuild():
+    conn = _make_db()
+    _seed(conn)
+    cube = PnLCube(conn)
+    assert cube.query()[0]["profit"] == 15.0
+
+    conn.execute("UPDATE sales SET net_proceeds = 60.0 WHERE platform = 'COMC'")
+    assert cube.query()[0]["profit"] == 35.0
+
+    conn.execute("DELETE FROM sales WHERE platform = 'COMC'")
+    total = cube.query()[0]
+    assert total["sales"] == 2
+    assert total["profit"] == 25.0
+
+    conn.execute("UPDATE cards SET sport = 'Hoops' WHERE sport = 'Basketball'")
+    cube.invalidate()
+    assert [r["sport"] for r in cube.query(["sport"])] == ["Hoops"]
+
+
+def test_date_and_platform_edits_rebuild():
+    conn = _make_db()
+    _seed(conn)
+    cube = PnLCube(conn)
+    assert [r["month"] for r in cube.query(["month"])] == ["2024-03", "2024-04"]
+
+    # Same sale ids and totals; only the month and platform dimensions move
+    conn.execute("UPDATE sales SET sale_date = '2024-09-15' WHERE sale_date = '2024-04-20'")
+    by_month = {r["month"]: r["sales"] for r in cube.query(["month"])}
+    assert by_month == {"2024-03": 1, "2024-04": 1, "2024-09": 1}
+
+    conn.execute("UPDATE sales SET platform = 'COMC' WHERE sale_date = '2024-03-05'")
+    by_platform = {r["platform"]: r["sales"] for r in cube.query(["platform"])}
+    assert by_platform == {"COMC": 2, "eBay": 1}
+    assert cube.stats()["facts"] == 3
+
+
+def test_matches_card_pnl_and_tracker():
+    conn = _make_db()
+    _seed(conn)
+    tracker = ROITracker(conn)
+    expected = conn.execute("SELECT SUM(profit) FROM card_pnl").fetchone()[0]
+    assert tracker.slice_pnl()[0]["profit"] == pytest.approx(expected)
+    assert len(tracker.slice_pnl(["sport", "platform"])) == 2
+    assert tracker.cube.stats()["cells"] == 3
+
+
+def test_empty_database():
+    cube = PnLCube(_make_db())
+    assert cube.query() == []
+    assert cube.query(["sport"]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
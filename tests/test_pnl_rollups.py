@@ -0,0 +1,143 @@
+"""Unit tests for the trigger-maintained realized P&L rollups."""
+
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database import pnl_rollups
+from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from services.roi_tracker import ROITracker
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _seed(conn):
+    """Three cards bought for $10, sold across two months, two platforms and two sports."""
+    card_ids = CardRepository(conn).add_many([
+        {"description": "Jokic", "sport": "Basketball"},
+        {"description": "Ohtani", "sport": "Baseball"},
+        {"description": "Curry", "sport": "Basketball"},
+    ])
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2025-01-01", "purchase_price": 10.0}
+        for card_id in card_ids
+    ])
+    SaleRepository(conn).add_many([
+        {"card_id": card_ids[0], "sale_date": "2025-02-03", "sale_price": 50.0,
+         "total_fees": 8.0, "net_proceeds": 42.0, "platform": "eBay"},
+        {"card_id": card_ids[1], "sale_date": "2025-02-09", "sale_price": 20.0,
+         "total_fees": 3.0, "net_proceeds": 17.0, "platform": "COMC"},
+        {"card_id": card_ids[2], "sale_date": "2025-03-01", "sale_price": 8.0,
+         "total_fees": 1.0, "net_proceeds": 7.0, "platform": "eBay"},
+    ])
+    return card_ids
+
+
+def test_sales_roll_up_by_granularity():
+    conn = _make_db()
+    _seed(conn)
+
+    months = pnl_rollups.series(conn, "month")
+    assert [(m["period"], m["sales_count"], m["profit"]) for m in months] == [
+        ("2025-02", 2, 39.0), ("2025-03", 1, -3.0),
+    ]
+    assert months[0]["revenue"] == 70.0 and months[0]["fees"] == 11.0
+    assert months[0]["cost_basis"] == 20.0
+    assert [m["cumulative_profit"] for m in months] == [39.0, 36.0]
+
+    # 2025-02-03 is a Monday and 2025-02-09 the Sunday closing the same week
+    weeks = pnl_rollups.series(conn, "week")
+    assert [(w["period"], w["sales_count"]) for w in weeks] == [("2025-02-03", 2), ("2025-02-24", 1)]
+    assert len(pnl_rollups.series(conn, "day", start="2025-02-04", end="2025-03-01")) == 2
+
+
+def test_series_split_by_dimension():
+    conn = _make_db()
+    _seed(conn)
+    by_sport = pnl_rollups.series(conn, "month", by="sport")
+    assert [(r["period"], r["sport"], r["profit"], r["cumulative_profit"]) for r in by_sport] == [
+        ("2025-02", "Baseball", 7.0, 7.0),
+        ("2025-02", "Basketball", 32.0, 32.0),
+        ("2025-03", "Basketball", -3.0, 29.0),
+    ]
+    with pytest.raises(ValueError):
+        pnl_rollups.series(conn, "year")
+    with pytest.raises(ValueError):
+        pnl_rollups.series(conn, by="buyer_state")
+
+
+def test_updates_and_deletes_move_sales_between_periods():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    conn.execute("UPDATE sales SET sale_date = '2025-03-15', net_proceeds = 12.0 WHERE card_id = ?",
+                 (card_ids[1],))
+    conn.execute("DELETE FROM sales WHERE card_id = ?", (card_ids[2],))
+    conn.commit()
+
+    months = ROITracker(conn).get_pnl_series("month")
+    assert [(m["period"], m["sales_count"], m["profit"]) for m in months] == [
+        ("2025-02", 1, 32.0), ("2025-03", 1, 2.0),
+    ]
+    assert pnl_rollups.verify(conn) == []
+
+
+def test_rebought_card_uses_matched_lot_cost():
+    conn = _make_db()
+    card_id = CardRepository(conn).add_many([{"description": "Wemby", "sport": "Basketball"}])[0]
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2025-01-01", "purchase_price": 10.0},
+        {"card_id": card_id, "purchase_date": "2025-03-01", "purchase_price": 10.0},
+    ])
+    SaleRepository(conn).add_many([
+        {"card_id": card_id, "sale_date": "2025-04-02", "sale_price": 50.0,
+         "total_fees": 8.0, "net_proceeds": 42.0, "platform": "eBay"},
+    ])
+    conn.commit()
+
+    # Only the first (FIFO) lot was sold; the second $10 is still held
+    card_pnl = conn.execute("SELECT profit FROM card_pnl WHERE card_id = ?", (card_id,)).fetchone()[0]
+    months = pnl_rollups.series(conn, "month")
+    assert card_pnl == 32.0
+    assert [(m["cost_basis"], m["profit"]) for m in months] == [(10.0, card_pnl)]
+
+    conn.execute("UPDATE sales SET platform = 'COMC' WHERE card_id = ?", (card_id,))
+    assert [r["platform"] for r in pnl_rollups.series(conn, "month", by="platform")] == ["COMC"]
+    conn.execute("DELETE FROM sales WHERE card_id = ?", (card_id,))
+    assert pnl_rollups.series(conn, "month") == []
+    assert pnl_rollups.verify(conn) == []
+
+
+def test_backfill_repairs_drift(tmp_path, capsys):
+    path = str(tmp_path / "cards.db")
+    conn = sqlite3.connect(path)
+    initialize_database(conn)
+    card_ids = _seed(conn)
+    assert pnl_rollups.main(["--db", path]) == 0
+
+    # The matched lot's cost is frozen, so a later purchase edit leaves the rollups alone
+    conn.execute("UPDATE purchases SET purchase_price = 15.0 WHERE card_id = ?", (card_ids[0],))
+    conn.commit()
+    assert pnl_rollups.main(["--db", path]) == 0
+
+    conn.execute("UPDATE pnl_rollups SET cost_basis = cost_basis + 5 WHERE granularity = 'month'")
+    conn.commit()
+    assert pnl_rollups.main(["--db", path]) == 1
+    assert "cost_basis" in capsys.readouterr().out
+    assert pnl_rollups.main(["--db", path, "--backfill"]) == 0
+    assert pnl_rollups.main(["--db", path]) == 0
+    conn.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+"""Unit tests for the trigger-maintained portfolio ledger."""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database import portfolio_ledger
+from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from services.roi_tracker import ROITracker
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _seed(conn):
+    card_ids = CardRepository(conn).add_many([{"description": f"Card {i}"} for i in range(3)])
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2026-01-01", "purchase_price": 10.0,
+         "sales_tax_paid": 0.63}
+        for card_id in card_ids
+    ])
+    SaleRepository(conn).add({"card_id": card_ids[0], "sale_date": "2026-02-01",
+                              "sale_price": 50.0, "net_proceeds": 42.0})
+    CardRepository(conn).update_status(card_ids[0], "Sold")
+    return card_ids
+
+
+def test_triggers_track_inserts_and_status_changes():
+    conn = _make_db()
+    _seed(conn)
+    ledger = portfolio_ledger.read(conn)
+    assert ledger["cards_purchased"] == 3
+    assert round(ledger["total_invested"], 2) == 31.89
+    assert ledger["cards_sold"] == 1
+    assert ledger["total_revenue"] == 42.0
+    assert ledger["status_counts"] == {"Inventory": 2, "Sold": 1}
+    assert portfolio_ledger.verify(conn) == []
+
+
+def test_triggers_track_updates_and_deletes():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    conn.execute("UPDATE purchases SET purchase_price = 20.0 WHERE card_id = ?", (card_ids[1],))
+    conn.execute("UPDATE sales SET net_proceeds = 40.0")
+    conn.execute("DELETE FROM purchases WHERE card_id = ?", (card_ids[2],))
+    conn.execute("DELETE FROM cards WHERE card_id = ?", (card_ids[2],))
+    conn.commit()
+
+    ledger = portfolio_ledger.read(conn)
+    assert ledger["cards_purchased"] == 2
+    assert round(ledger["total_invested"], 2) == 31.26
+    assert ledger["total_revenue"] == 40.0
+    assert ledger["status_counts"] == {"Inventory": 1, "Sold": 1}
+    assert portfolio_ledger.verify(conn) == []
+
+
+def test_summary_reads_the_ledger():
+    conn = _make_db()
+    _seed(conn)
+    summary = ROITracker(conn).get_portfolio_summary()
+    assert summary["total_invested"] == 31.89
+    assert summary["total_profit"] == 10.11
+    assert summary["cards_in_inventory"] == 2
+    assert summary["status_counts"]["Sold"] == 1
+
+
+def test_verify_reports_drift_and_rebuild_repairs_it():
+    conn = _make_db()
+    _seed(conn)
+    conn.execute("UPDATE portfolio_totals SET total_revenue = 0, cards_sold = 5")
+    conn.execute("UPDATE card_status_counts SET card_count = 9 WHERE status = 'Sold'")
+    conn.commit()
+
+    problems = portfolio_ledger.verify(conn)
+    assert len(problems) == 3
+    assert any(p.startswith("total_revenue") for p in problems)
+
+    portfolio_ledger.rebuild(conn)
+    conn.commit()
+    assert portfolio_ledger.verify(conn) == []
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    path = str(tmp_path / "cards.db")
+    conn = sqlite3.connect(path)
+    initialize_database(conn)
+    _seed(conn)
+    assert portfolio_ledger.main(["--db", path]) == 0
+
+    conn.execute("UPDATE portfolio_totals SET cards_purchased = 0")
+    conn.commit()
+    assert portfolio_ledger.main(["--db", path]) == 1
+    assert "MISMATCH cards_purchased" in capsys.readouterr().out
+    assert portfolio_ledger.main(["--db", path, "--rebuild"]) == 0
+    assert portfolio_ledger.main(["--db", path]) == 0
+    conn.close()
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,188 @@
+"""Unit tests for the background market-data refresh scheduler."""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.schema import initialize_database
+from services.ebay_api import EbayApiClient
+from services.refresh_scheduler import RefreshScheduler, compute_priority
+from tests.mock_ebay_server import MockEbayServer
+
+
+def _make_db_file():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    initialize_database(conn)
+    return conn, path
+
+
+def _cleanup(conn, path):
+    conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _seed(conn):
+    for card_id, desc, cost in [("CARD-000001", "Jokic Prizm", 200.0),
+                                ("CARD-000002", "Luka Select", 5.0)]:
+        conn.execute("INSERT INTO cards (card_id, description) VALUES (?, ?)", (card_id, desc))
+        conn.execute(
+            "INSERT INTO purchases (card_id, purchase_date, purchase_price) VALUES (?, '2025-01-01', ?)",
+            (card_id, cost),
+        )
+    for price in (40.0, 50.0, 60.0):
+        conn.execute(
+            "INSERT INTO comps (search_query, title, sold_price) VALUES ('Jokic Prizm', 'comp', ?)",
+            (price,),
+        )
+    conn.commit()
+
+
+class FailingClient:
+    quota_ledger = None
+
+    def search_items(self, *args, **kwargs):
+        raise RuntimeError("network down")
+
+
+def test_compute_priority_orders_by_value_staleness_and_volatility():
+    assert compute_priority(200, None, None) > compute_priority(5, None, None)
+    assert compute_priority(50, 48, None) > compute_priority(50, 1, None)
+    assert compute_priority(50, 24, 0.5) > compute_priority(50, 24, 0.0)
+
+
+def test_comp_stats_jobs_populate_market_values():
+    conn, path = _make_db_file()
+    try:
+        _seed(conn)
+        scheduler = RefreshScheduler(path, client_factory=None)
+        assert scheduler.enqueue_stale(conn, include_active=False) == 2
+
+        top = conn.execute("SELECT card_id FROM jobs ORDER BY priority DESC LIMIT 1").fetchone()
+        assert top[0] == "CARD-000001"
+
+        assert scheduler.run_until_idle() == 2
+        row = conn.execute(
+            "SELECT * FROM market_values WHERE card_id = 'CARD-000001'"
+        ).fetchone()
+        assert row["comp_count"] == 3
+        assert row["market_value"] == 50.0
+        assert row["volatility"] > 0
+
+        # Freshly refreshed cards are not queued again
+        assert scheduler.enqueue_stale(conn, include_active=False) == 0
+        assert scheduler.stats(conn)["done"] == 2
+    finally:
+        _cleanup(conn, path)
+
+
+def test_active_listing_jobs_use_the_client():
+    conn, path = _make_db_file()
+    try:
+        _seed(conn)
+        with MockEbayServer(total_items=10) as server:
+            scheduler = RefreshScheduler(
+                path, client_factory=lambda c: EbayApiClient("id", "secret", environment=server.url)
+            )
+            scheduler.enqueue_stale(conn)
+            scheduler.run_until_idle()
+        row = conn.execute(
+            "SELECT * FROM market_values WHERE card_id = 'CARD-000002'"
+        ).fetchone()
+        assert row["active_count"] == 10
+        assert row["market_value"] == row["active_median"]  # no sold comps for this card
+    finally:
+        _cleanup(conn, path)
+
+
+def test_failed_jobs_back_off_and_recover_requeues_running():
+    conn, path = _make_db_file()
+    try:
+        _seed(conn)
+        scheduler = RefreshScheduler(path, client_factory=lambda c: FailingClient())
+        scheduler.enqueue_stale(conn)
+        scheduler.run_until_idle()
+
+        failed = conn.execute(
+            "SELECT status, attempts, last_error, run_after > datetime('now') AS deferred "
+            "FROM jobs WHERE kind = 'active_listings'"
+        ).fetchall()
+        assert all(r["status"] == "queued" and r["attempts"] == 1 for r in failed)
+        assert all(r["deferred"] and r["last_error"] == "network down" for r in failed)
+
+        conn.execute("UPDATE jobs SET status = 'running'")
+        conn.commit()
+        scheduler.recover(conn)
+        assert scheduler.stats(conn)["running"] == 0
+    finally:
+        _cleanup(conn, path)
+
+
+def test_background_thread_processes_queue():
+    conn, path = _make_db_file()
+    try:
+        _seed(conn)
+        scheduler = RefreshScheduler(path, client_factory=None, poll_interval=0.05)
+        scheduler.start()
+        try:
+            deadline = time.time() + 5
+            while scheduler.stats()["done"] < 2 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            scheduler.stop()
+        assert scheduler.stats()["done"] == 2
+        assert not scheduler.stats()["is_running"]
+    finally:
+        _cleanup(conn, path)
+
+
+def test_client_rebuilt_when_settings_change():
+    conn, path = _make_db_file()
+    try:
+        seen = []
+
+        def factory(c):
+            client_id = c.execute(
+                "SELECT value FROM settings WHERE key = 'ebay_client_id'"
+            ).fetchone()
+            seen.append(client_id[0] if client_id else None)
+            return None
+
+        scheduler = RefreshScheduler(path, client_factory=factory, poll_interval=0.05)
+        scheduler.start()
+        try:
+            deadline = time.time() + 5
+            while not seen and time.time() < deadline:
+                time.sleep(0.05)
+            # Unrelated settings leave the client alone
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('fvf_rate', '0.12')")
+            conn.commit()
+            scheduler.settings_changed()
+            time.sleep(0.3)
+            assert seen == [None]
+
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('ebay_client_id', 'new-id')")
+            conn.commit()
+            scheduler.settings_changed()
+            deadline = time.time() + 5
+            while len(seen) < 2 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            scheduler.stop()
+        assert seen == [None, "new-id"]
+    finally:
+        _cleanup(conn, path)
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,254 @@
+"""Unit tests for unit-of-work transactions, bulk writes and card_id allocation."""
+
+import sys
+import os
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from config.settings import SettingsManager
+from database.migrations import MIGRATIONS, migrate
+from database.repository import CardRepository, CompRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from database.sequences import allocate, allocate_card_ids
+from database.unit_of_work import in_unit_of_work, unit_of_work
+from models.card import Card
+from models.transaction import Purchase
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _count_commits(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return lambda: sum(1 for s in statements if s.strip().upper() == "COMMIT")
+
+
+def _card(n=1):
+    return {"description": f"Test Card {n}", "player_name": "Test Player"}
+
+
+def test_standalone_add_commits_immediately():
+    conn = _make_db()
+    card_id = CardRepository(conn).add(_card())
+    assert card_id == "CARD-000001"
+    assert not conn.in_transaction
+
+
+def test_sale_and_status_commit_once():
+    conn = _make_db()
+    cards = CardRepository(conn)
+    card_id = cards.add(_card())
+    commits = _count_commits(conn)
+
+    with unit_of_work(conn):
+        SaleRepository(conn).add({"card_id": card_id, "sale_date": "2026-01-01", "sale_price": 50.0})
+        cards.update_status(card_id, "Sold")
+        assert in_unit_of_work(conn)
+
+    assert commits() == 1
+    assert not in_unit_of_work(conn)
+    assert cards.get_by_id(card_id).status == "Sold"
+
+
+def test_unit_of_work_rolls_back_everything_on_error():
+    conn = _make_db()
+    cards = CardRepository(conn)
+    with pytest.raises(RuntimeError):
+        with unit_of_work(conn):
+            card_id = cards.add(_card())
+            PurchaseRepository(conn).add({
+                "card_id": card_id, "purchase_date": "2026-01-01", "purchase_price": 10.0,
+            })
+            raise RuntimeError("boom")
+
+    assert cards.get_all() == []
+    assert PurchaseRepository(conn).get_all() == []
+    assert not in_unit_of_work(conn)
+
+
+def test_nested_unit_rolls_back_to_savepoint():
+    conn = _make_db()
+    cards = CardRepository(conn)
+    with unit_of_work(conn):
+        cards.add(_card(1))
+        with pytest.raises(ValueError):
+            with unit_of_work(conn):
+                cards.add(_card(2))
+                raise ValueError("inner")
+        cards.add(_card(3))
+
+    descriptions = sorted(c.description for c in cards.get_all())
+    assert descriptions == ["Test Card 1", "Test Card 3"]
+
+
+def test_settings_set_many_commits_once():
+    conn = _make_db()
+    settings = SettingsManager(conn)
+    commits = _count_commits(conn)
+    settings.set_many({"fvf_rate": "0.12", "sales_tax_rate": "0.07", "intl_fee_rate": "0.02"})
+    assert commits() == 1
+    assert settings.get("sales_tax_rate") == "0.07"
+
+
+def test_add_many_imports_10k_rows_in_one_transaction():
+    conn = _make_db()
+    commits = _count_commits(conn)
+    with unit_of_work(conn):
+        card_ids = CardRepository(conn).add_many([_card(i) for i in range(10_000)])
+        PurchaseRepository(conn).add_many([
+            {"card_id": card_id, "purchase_date": "2026-01-01", "purchase_price": 5.0}
+            for card_id in card_ids
+        ])
+
+    assert commits() == 1
+    assert card_ids[0] == "CARD-000001"
+    assert card_ids[-1] == "CARD-010000"
+    assert conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 10_000
+    assert conn.execute("SELECT COUNT(*) FROM purchases").fetchone()[0] == 10_000
+
+
+def test_comp_add_many():
+    conn = _make_db()
+    comps = CompRepository(conn)
+    comps.add_many([
+        {"search_query": "jordan psa 10", "title": f"Comp {i}", "sold_price": 100.0 + i}
+        for i in range(3)
+    ])
+    assert len(comps.get_all()) == 3
+
+
+def test_allocate_returns_contiguous_ranges():
+    conn = _make_db()
+    assert allocate(conn, "test", 3) == range(1, 4)
+    assert allocate(conn, "test", 2) == range(4, 6)
+    assert allocate(conn, "test", 0) == range(0)
+
+
+def test_card_sequence_seeded_from_existing_cards():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    initialize_database(conn)
+    conn.execute("DROP TABLE id_sequences")
+    conn.execute("PRAGMA user_version = 1")
+    conn.execute("INSERT INTO cards (card_id, description) VALUES ('CARD-000041', 'Legacy')")
+    conn.commit()
+
+    assert migrate(conn) == [m[0] for m in MIGRATIONS if m[0] >= 2]
+    assert CardRepository(conn).add(_card()) == "CARD-000042"
+
+
+def test_allocation_is_unique_across_connections(tmp_path):
+    path = str(tmp_path / "cards.db")
+    conn = sqlite3.connect(path)
+    initialize_database(conn)
+    conn.close()
+
+    allocated = []
+    lock = threading.Lock()
+
+    def worker():
+        local = sqlite3.connect(path, timeout=10)
+        for _ in range(25):
+            ids = allocate_card_ids(local, 4)
+            with lock:
+                allocated.extend(ids)
+        local.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(allocated) == len(set(allocated)) == 400
+    assert max(allocated) == "CARD-000400"
+
+
+def test_repositories_return_slotted_models():
+    conn = _make_db()
+    card_id = CardRepository(conn).add({**_card(), "year": 2003, "is_graded": True})
+    PurchaseRepository(conn).add({
+        "card_id": card_id, "purchase_date": "2026-01-01", "purchase_price": 10.0,
+        "sales_tax_paid": 0.63, "shipping_paid": 4.0,
+    })
+
+    card = CardRepository(conn).get_by_id(card_id)
+    assert isinstance(card, Card)
+    assert not hasattr(card, "__dict__")
+    assert (card.card_id, card.year, card.is_graded, card.status) == (card_id, 2003, 1, "Inventory")
+    assert card.created_at is not None
+
+    purchase = PurchaseRepository(conn).get_by_card(card_id)
+    assert isinstance(purchase, Purchase)
+    stored = conn.execute("SELECT total_cost_basis FROM purchases").fetchone()[0]
+    assert purchase.total_cost_basis == stored == 14.63
+    assert CardRepository(conn).get_by_id("CARD-999999") is None
+
+
+def test_iter_all_streams_rows():
+    conn = _make_db()
+    cards = CardRepository(conn)
+    cards.add_many([_card(i) for i in range(5)])
+    cards.update_status("CARD-000002", "Sold")
+
+    stream = cards.iter_all()
+    assert not isinstance(stream, list)
+    assert next(stream).card_id.startswith("CARD-")
+    assert sum(1 for _ in stream) == 4
+    assert [c.card_id for c in cards.iter_all(status="Sold")] == ["CARD-000002"]
+
+
+def test_keyset_pages_cover_ties_without_gaps():
+    conn = _make_db()
+    cards = CardRepository(conn)
+    cards.add_many([_card(i) for i in range(25)])  # Same created_at second for all
+    cards.update_status("CARD-000003", "Sold")
+
+    seen, after = [], None
+    while True:
+        page, after = cards.get_page(after, limit=10)
+        seen.extend(c.card_id for c in page)
+        if after is None:
+            break
+    assert len(seen) == len(set(seen)) == 25
+    assert seen[0] == "CARD-000025"
+
+    page, after = cards.get_page(limit=10, status="Sold")
+    assert [c.card_id for c in page] == ["CARD-000003"] and after is None
+
+
+def test_exact_multiple_of_page_size_ends_with_empty_page():
+    conn = _make_db()
+    SaleRepository(conn).add_many([
+        {"card_id": card_id, "sale_date": f"2026-01-{i + 1:02d}", "sale_price": 10.0}
+        for i, card_id in enumerate(CardRepository(conn).add_many([_card(i) for i in range(4)]))
+    ])
+    sales = SaleRepository(conn)
+    first, after = sales.get_page(limit=4)
+    assert [s.sale_date for s in first][0] == "2026-01-04"
+    assert sales.get_page(after, limit=4) == ([], None)
+    assert len(list(sales.iter_all(page_size=3))) == 4
+
+
+def test_comp_pages_include_null_fetched_at():
+    conn = _make_db()
+    conn.executemany(
+        "INSERT INTO comps (search_query, title, sold_price, fetched_at) VALUES ('q', ?, 1.0, ?)",
+        [(f"Comp {i}", None if i < 3 else f"2026-01-0{i}") for i in range(6)],
+    )
+    comps = CompRepository(conn)
+    assert sorted(c.title for c in comps.iter_all(page_size=2)) == [f"Comp {i}" for i in range(6)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
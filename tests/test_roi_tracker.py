@@ -37,11 +37,11 @@ def _add_purchase(conn, card_id, price=10.0, tax=0.63, shipping=0.0, grading=0.0
     conn.commit()
 
 
-def _add_sale(conn, card_id, sale_price=50.0, net_proceeds=42.0):
+def _add_sale(conn, card_id, sale_price=50.0, net_proceeds=42.0, sale_date="2025-02-01"):
     conn.execute(
         """INSERT INTO sales (card_id, sale_date, sale_price, net_proceeds, total_fees)
-           VALUES (?, '2025-02-01', ?, ?, ?)""",
-        (card_id, sale_price, net_proceeds, sale_price - net_proceeds),
+           VALUES (?, ?, ?, ?, ?)""",
+        (card_id, sale_date, sale_price, net_proceeds, sale_price - net_proceeds),
     )
     conn.commit()
 
@@ -110,12 +110,87 @@ def test_inventory_with_details():
 
     assert len(rows) == 2
     # Most recent first
-    sold = [r for r in rows if r["status"] == "Sold"]
-    unsold = [r for r in rows if r["status"] == "Inventory"]
+    sold = [r for r in rows if r.status == "Sold"]
+    unsold = [r for r in rows if r.status == "Inventory"]
     assert len(sold) == 1
     assert len(unsold) == 1
-    assert sold[0]["net_proceeds"] == 42.0
-    assert unsold[0]["sale_price"] is None
+    assert sold[0].net_proceeds == 42.0
+    assert unsold[0].sale_price is None
+
+
+def test_inventory_pages_and_recent_sold():
+    conn = _make_db()
+    for i in range(1, 6):
+        card_id = f"CARD-{i:06d}"
+        _add_card(conn, card_id, status="Sold" if i % 2 else "Inventory")
+        _add_purchase(conn, card_id)
+        if i % 2:
+            _add_sale(conn, card_id)
+
+    tracker = ROITracker(conn)
+    page, after = tracker.get_inventory_page(limit=2)
+    assert [r.card_id for r in page] == ["CARD-000005", "CARD-000004"]
+    page, after = tracker.get_inventory_page(after, limit=2)
+    assert [r.card_id for r in page] == ["CARD-000003", "CARD-000002"]
+
+    sold, after = tracker.get_inventory_page(status="Sold")
+    assert [r.card_id for r in sold] == ["CARD-000005", "CARD-000003", "CARD-000001"]
+    assert after is None
+    assert [r.card_id for r in tracker.get_recent_sold(2)] == ["CARD-000005", "CARD-000003"]
+
+
+def test_profit_and_roi_computed_in_sql():
+    conn = _make_db()
+    _add_card(conn, "CARD-000001", status="Sold")
+    _add_purchase(conn, "CARD-000001", price=10.0, tax=0.0)
+    _add_purchase(conn, "CARD-000001", price=10.0, tax=0.0)  # Re-bought, still held
+    _add_sale(conn, "CARD-000001", sale_price=50.0, net_proceeds=42.0)
+    _add_card(conn, "CARD-000002")
+    _add_purchase(conn, "CARD-000002", price=25.0, tax=0.0)
+
+    rows = {r.card_id: r for r in ROITracker(conn).get_inventory_with_details()}
+    assert len(rows) == 2  # Multiple purchases do not fan out into extra rows
+    assert rows["CARD-000001"].total_cost_basis == 20.0
+    # Profit comes from the one lot the sale disposed of, not every purchase
+    assert rows["CARD-000001"].profit == 32.0
+    assert rows["CARD-000001"].roi_pct == 320.0
+    assert rows["CARD-000002"].profit is None and rows["CARD-000002"].roi_pct is None
+
+
+def test_cumulative_pnl_and_status_counts():
+    conn = _make_db()
+    for i, (sale_date, net) in enumerate([("2025-02-01", 42.0), ("2025-02-01", 5.0),
+                                          ("2025-03-01", 20.0)], start=1):
+        card_id = f"CARD-{i:06d}"
+        _add_card(conn, card_id, status="Sold")
+        _add_purchase(conn, card_id, price=10.0, tax=0.0)
+        _add_sale(conn, card_id, net_proceeds=net, sale_date=sale_date)
+    _add_card(conn, "CARD-000004")
+
+    tracker = ROITracker(conn)
+    assert tracker.get_cumulative_pnl() == [
+        {"sale_date": "2025-02-01", "cards_sold": 2, "profit": 27.0, "cumulative_profit": 27.0},
+        {"sale_date": "2025-03-01", "cards_sold": 1, "profit": 10.0, "cumulative_profit": 37.0},
+    ]
+    assert tracker.get_status_counts() == {"Sold": 3, "Inventory": 1}
+
+
+def test_cumulative_pnl_counts_each_sale_of_a_rebought_card():
+    conn = _make_db()
+    _add_card(conn, "CARD-000001", status="Sold")
+    conn.executemany(
+        "INSERT INTO purchases (card_id, purchase_date, purchase_price) VALUES ('CARD-000001', ?, ?)",
+        [("2025-01-15", 10.0), ("2025-03-01", 30.0)],
+    )
+    _add_sale(conn, "CARD-000001", net_proceeds=40.0, sale_date="2025-02-01")
+    _add_sale(conn, "CARD-000001", net_proceeds=50.0, sale_date="2025-06-01")
+
+    tracker = ROITracker(conn)
+    assert tracker.get_cumulative_pnl() == [
+        {"sale_date": "2025-02-01", "cards_sold": 1, "profit": 30.0, "cumulative_profit": 30.0},
+        {"sale_date": "2025-06-01", "cards_sold": 1, "profit": 20.0, "cumulative_profit": 50.0},
+    ]
+    assert [m["profit"] for m in tracker.get_pnl_series("month")] == [30.0, 20.0]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""Unit tests for tax-lot matching of sales to purchase lots."""
+
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database import tax_lots
+from database.repository import CardRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _rebought_card(conn):
+    """One card bought twice ($10 then $30), with a $15 grading fee on the first lot."""
+    card_id = CardRepository(conn).add({"description": "Jokic Prizm"})
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2024-01-10", "purchase_price": 10.0},
+        {"card_id": card_id, "purchase_date": "2024-02-01", "purchase_price": 0.0,
+         "grading_cost": 15.0},
+        {"card_id": card_id, "purchase_date": "2025-03-01", "purchase_price": 30.0},
+    ])
+    return card_id
+
+
+def _sell(conn, card_id, sale_date, net, **extra):
+    SaleRepository(conn).add({"card_id": card_id, "sale_date": sale_date, "sale_price": net,
+                              "net_proceeds": net, **extra})
+
+
+def _matches(conn):
+    return conn.execute(
+        "SELECT method, acquired_date, cost_basis, gain FROM lot_matches ORDER BY sale_id"
+    ).fetchall()
+
+
+def test_grading_fee_adjusts_its_lot_and_fifo_sells_oldest():
+    conn = _make_db()
+    card_id = _rebought_card(conn)
+    assert [(l["acquired_date"], l["cost_basis"]) for l in tax_lots.open_lots(conn, card_id)] == [
+        ("2024-01-10", 25.0), ("2025-03-01", 30.0),
+    ]
+
+    _sell(conn, card_id, "2025-04-01", 60.0)
+    assert [tuple(m) for m in _matches(conn)] == [("FIFO", "2024-01-10", 25.0, 35.0)]
+    assert [l["acquired_date"] for l in tax_lots.open_lots(conn, card_id)] == ["2025-03-01"]
+
+
+def test_lifo_and_specific_id():
+    conn = _make_db()
+    card_id = _rebought_card(conn)
+    tax_lots.set_method(conn, "lifo")
+    _sell(conn, card_id, "2025-04-01", 60.0)
+    assert [tuple(m) for m in _matches(conn)] == [("LIFO", "2025-03-01", 30.0, 30.0)]
+
+    conn.execute("DELETE FROM sales")
+    first_lot = tax_lots.open_lots(conn, card_id)[0]["lot_id"]
+    _sell(conn, card_id, "2025-04-01", 60.0, lot_id=first_lot)
+    assert [tuple(m) for m in _matches(conn)] == [("SPECIFIC", "2024-01-10", 25.0, 35.0)]
+
+    with pytest.raises(ValueError):
+        tax_lots.set_method(conn, "HIFO")
+
+
+def test_lots_bought_after_the_sale_are_never_matched():
+    conn = _make_db()
+    tax_lots.set_method(conn, "LIFO")
+    card_id = CardRepository(conn).add({"description": "Wemby Prizm"})
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2025-01-01", "purchase_price": 10.0},
+        {"card_id": card_id, "purchase_date": "2025-05-01", "purchase_price": 100.0},
+    ])
+    _sell(conn, card_id, "2025-02-01", 40.0)
+    assert [tuple(m) for m in _matches(conn)] == [("LIFO", "2025-01-01", 10.0, 30.0)]
+    assert conn.execute("SELECT holding_days FROM lot_matches").fetchone()[0] == 31
+
+    # A match backdated by hand is reported, and a rebuild repairs it
+    conn.execute("UPDATE lot_matches SET acquired_date = '2025-05-01'")
+    assert any("acquired later" in p for p in tax_lots.verify(conn))
+    tax_lots.rebuild(conn)
+    assert tax_lots.verify(conn) == []
+
+
+def test_sale_updates_and_deletes_keep_matches_in_step():
+    conn = _make_db()
+    card_id = _rebought_card(conn)
+    _sell(conn, card_id, "2025-04-01", 60.0)
+    conn.execute("UPDATE sales SET net_proceeds = 50.0")
+    assert _matches(conn)[0]["gain"] == 25.0
+    conn.execute("DELETE FROM sales")
+    assert _matches(conn) == []
+    assert len(tax_lots.open_lots(conn, card_id)) == 2
+
+
+def test_realized_gains_split_by_holding_period():
+    conn = _make_db()
+    card_id = _rebought_card(conn)
+    _sell(conn, card_id, "2025-04-01", 60.0)   # Held 447 days: long-term
+    _sell(conn, card_id, "2025-06-01", 20.0)   # Held 92 days: short-term loss
+
+    report = tax_lots.realized_gains(conn, "2025-01-01", "2025-12-31")
+    assert [d["term"] for d in report["disposals"]] == ["long_term", "short_term"]
+    assert report["long_term_gain"] == 35.0
+    assert report["short_term_gain"] == -10.0
+    assert report["total_gain"] == 25.0
+    assert report["proceeds"] == 80.0 and report["cost_basis"] == 55.0
+    assert tax_lots.realized_gains(conn, "2024-01-01", "2024-12-31")["disposals"] == []
+
+
+def test_verify_and_rebuild(tmp_path, capsys):
+    path = str(tmp_path / "cards.db")
+    conn = sqlite3.connect(path)
+    initialize_database(conn)
+    card_id = _rebought_card(conn)
+    _sell(conn, card_id, "2025-04-01", 60.0)
+    assert tax_lots.main(["--db", path]) == 0
+
+    # A purchase edited after the sale leaves the frozen cost basis stale
+    conn.execute("UPDATE purchases SET purchase_price = 12.0 WHERE purchase_date = '2024-01-10'")
+    conn.commit()
+    assert tax_lots.main(["--db", path]) == 1
+    assert "cost_basis: matched 25.00, now 27.00" in capsys.readouterr().out
+    assert tax_lots.main(["--db", path, "--rebuild"]) == 0
+    assert tax_lots.verify(conn) == []
+    conn.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""Unit tests for mark-to-market inventory valuation."""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.repository import CardRepository, CompRepository, PurchaseRepository, SaleRepository
+from database.schema import initialize_database
+from services.calculator import calculate_profit
+from services.valuation import ValuationService
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    initialize_database(conn)
+    return conn
+
+
+def _seed(conn):
+    card_ids = CardRepository(conn).add_many([
+        {"description": "Jokic Prizm PSA 10"},
+        {"description": "Ohtani Chrome"},
+        {"description": "Curry Select", "status": "At Grading"},
+        {"description": "Unknown Card"},
+    ])
+    PurchaseRepository(conn).add_many([
+        {"card_id": card_id, "purchase_date": "2025-01-01", "purchase_price": 20.0}
+        for card_id in card_ids
+    ])
+    comps = CompRepository(conn)
+    # Linked comps for the first card; an unlinked comp with the same query is ignored for it
+    comps.add_many([
+        {"search_query": "jokic prizm psa 10", "card_id": card_ids[0], "title": "a", "sold_price": p}
+        for p in (40.0, 60.0, 50.0, 1000.0)
+    ])
+    # Normalized query match for the second card
+    comps.add_many([
+        {"search_query": "  OHTANI chrome ", "title": "b", "sold_price": p} for p in (10.0, 14.0)
+    ])
+    conn.execute(
+        "INSERT INTO market_values (card_id, comp_count, market_value) VALUES (?, 3, 80.0)",
+        (card_ids[2],),
+    )
+    conn.commit()
+    return card_ids
+
+
+def test_values_unsold_cards_by_best_available_source():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    result = ValuationService(conn).value_inventory()
+    cards = {c.card_id: c for c in result["cards"]}
+
+    assert (cards[card_ids[0]].market_value, cards[card_ids[0]].value_source) == (55.0, "card comps")
+    assert cards[card_ids[0]].comp_count == 4
+    assert (cards[card_ids[1]].market_value, cards[card_ids[1]].value_source) == (12.0, "query comps")
+    assert (cards[card_ids[2]].market_value, cards[card_ids[2]].value_source) == (80.0, "market refresh")
+    assert cards[card_ids[3]].market_value is None and cards[card_ids[3]].unrealized_pnl is None
+
+    expected = calculate_profit(55.0, 0.0, 20.0, 0.0)
+    assert cards[card_ids[0]].est_net_proceeds == expected["net_proceeds"]
+    assert cards[card_ids[0]].unrealized_pnl == expected["net_profit"]
+    assert result["valued_count"] == 3 and result["unvalued_count"] == 1
+    assert result["total_cost_basis"] == 60.0
+    assert result["unvalued_cost_basis"] == 20.0
+    assert result["total_unrealized_pnl"] == round(sum(c.unrealized_pnl for c in cards.values()
+                                                       if c.unrealized_pnl is not None), 2)
+
+
+def test_sold_cards_are_excluded():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    CardRepository(conn).update_status(card_ids[0], "Sold")
+    result = ValuationService(conn).value_inventory()
+    assert card_ids[0] not in {c.card_id for c in result["cards"]}
+
+
+def test_rebought_card_is_measured_against_its_open_lot():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    SaleRepository(conn).add({"card_id": card_ids[0], "sale_date": "2025-02-01",
+                              "sale_price": 60.0, "net_proceeds": 50.0})
+    PurchaseRepository(conn).add({"card_id": card_ids[0], "purchase_date": "2025-03-01",
+                                  "purchase_price": 30.0})
+    conn.commit()
+    card = {c.card_id: c for c in ValuationService(conn).value_inventory()["cards"]}[card_ids[0]]
+    assert card.total_cost_basis == 30.0
+    assert card.unrealized_pnl == calculate_profit(55.0, 0.0, 30.0, 0.0)["net_profit"]
+
+
+def test_cached_until_new_comps_arrive():
+    conn = _make_db()
+    card_ids = _seed(conn)
+    service = ValuationService(conn)
+    first = service.value_inventory()
+    assert service.value_inventory() is first
+
+    CompRepository(conn).add({"search_query": "unknown card", "title": "c", "sold_price": 30.0})
+    second = service.value_inventory()
+    assert second is not first
+    assert {c.card_id: c.market_value for c in second["cards"]}[card_ids[3]] == 30.0
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])